@@ -1,10 +1,11 @@
 from datetime import date
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
 
 from backend.barcode_scanning.barcode_scanning_service import BarcodeScanningService
 from backend.barcode_scanning.dependencies import get_barcode_scanning_service
+from backend.barcode_scanning.schemas import BatchScanResponse
 from backend.core.role_sets import user_or_admin
 from backend.meals.enums.meal_type import MealType
 from backend.models import ComposedMealItem
@@ -31,3 +32,24 @@ async def add_scanned_product(
 ):
     user, _ = await user_gateway.get_current_user()
     return await scanning_service.process_scan(user, day, meal_type, barcode, image)
+
+
+@barcode_scanning_router.patch(
+    "/scanned-products",
+    response_model=BatchScanResponse,
+    summary="Add many scanned products",
+    description="Adds products identified by barcodes given by user or decoded from images to the proper daily meal "
+    "summary at once. Every distinct product is added once, barcodes that are invalid, unknown or could not be read "
+    "from an image are listed in the response.",
+)
+async def add_scanned_products(
+    request: Request,
+    day: date = Form(...),
+    meal_type: MealType = Form(...),
+    barcodes: List[str] = Form([]),
+    images: List[UploadFile] = File([]),
+    user_gateway: UserGateway = Depends(get_user_gateway),
+    scanning_service: BarcodeScanningService = Depends(get_barcode_scanning_service),
+):
+    user, _ = await user_gateway.get_current_user()
+    return await scanning_service.process_batch_scan(user, day, meal_type, barcodes, images)
@@ -1,139 +1,110 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import date
-from typing import Optional, Type
+from typing import List, Optional, Type
 
-import cv2
-import numpy as np
-from fastapi import UploadFile
+from fastapi import HTTPException, UploadFile, status
 
+from backend.barcode_scanning.ean13 import is_valid_ean13
+from backend.barcode_scanning.image_decoding import decode_barcode_image
+from backend.barcode_scanning.schemas import BatchScanResponse, RejectedImage
 from backend.core.logger import logger
+from backend.core.metrics import LatencyStats
 from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
 from backend.core.value_error_exception import ValueErrorException
 from backend.daily_summary.schemas import ComposedMealUpdateRequest
 from backend.meals.enums.meal_type import MealType
 from backend.models import ComposedMealItem, User
+from backend.open_food_facts.schemas import ProductDetails
+from backend.settings import config
 
-A_CODE = {
-    "0001101": "0",
-    "0011001": "1",
-    "0010011": "2",
-    "0111101": "3",
-    "0100011": "4",
-    "0110001": "5",
-    "0101111": "6",
-    "0111011": "7",
-    "0110111": "8",
-    "0001011": "9",
-}
-
-B_CODE = {
-    "0100111": "0",
-    "0110011": "1",
-    "0011011": "2",
-    "0100001": "3",
-    "0011101": "4",
-    "0111001": "5",
-    "0000101": "6",
-    "0010001": "7",
-    "0001001": "8",
-    "0010111": "9",
-}
-
-C_CODE = {
-    "1110010": "0",
-    "1100110": "1",
-    "1101100": "2",
-    "1000010": "3",
-    "1011100": "4",
-    "1001110": "5",
-    "1010000": "6",
-    "1000100": "7",
-    "1001000": "8",
-    "1110100": "9",
-}
-
-FIRST_DIGIT_PATTERNS = {
-    "AAAAAA": "0",
-    "AABABB": "1",
-    "AABBAB": "2",
-    "AABBBA": "3",
-    "ABAABB": "4",
-    "ABBAAB": "5",
-    "ABBBAA": "6",
-    "ABABAB": "7",
-    "ABABBA": "8",
-    "ABBABA": "9",
-}
-
-
-def _decode_first_digit(left_types):
-    pattern = "".join(left_types)
-    return FIRST_DIGIT_PATTERNS.get(pattern)
-
-
-def _validate_check_sum(barcode: str) -> bool:
-    if len(barcode) != 13 or not barcode.isdigit():
-        return False
-
-    digits = [int(d) for d in barcode]
-    odd_digits = digits[-3::-2]
-    even_digits = digits[-2::-2]
-
-    checksum = sum(odd_digits) + 3 * sum(even_digits)
-    return (checksum + digits[-1]) % 10 == 0
-
-
-def _decode_ean13_from_image(img: np.ndarray) -> str:
-    _, thresh = cv2.threshold(img, 128, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
-
-    row = thresh[thresh.shape[0] // 2, :]
-
-    binary = np.where(row < 128, 1, 0)
-
-    start = np.where(binary[: len(binary) // 2] == 1)[0][0]
-    stop = np.where(binary[len(binary) // 2 :] == 1)[0][-1] + len(binary) // 2
-    cols = binary[start:stop]
-
-    module_width = len(cols) / 95
-    modules = []
-    for i in range(95):
-        segment = cols[int(i * module_width) : int((i + 1) * module_width)]
-        modules.append(1 if segment.mean() > 0.5 else 0)
-    modules = np.array(modules)
-
-    left_digits = []
-    left_types = []
-
-    for i in range(3, 45, 7):
-        pattern = "".join(map(str, modules[i : i + 7]))
-        if pattern in A_CODE:
-            left_digits.append(A_CODE[pattern])
-            left_types.append("A")
-        elif pattern in B_CODE:
-            left_digits.append(B_CODE[pattern])
-            left_types.append("B")
-        else:
-            logger.debug("Decode image: invalid left side pattern")
-            raise ValueErrorException(
-                "We couldn't read that barcode. Please type the code manually or try scanning again."
-            )
+UPLOAD_CHUNK_BYTES = 1024 * 1024
 
-    first_digit = _decode_first_digit(left_types)
-    if first_digit is None:
-        logger.debug("Decode image: cannot decode first EAN digit")
-        raise ValueErrorException("We couldn't read that barcode. Please type the code manually or try scanning again.")
-
-    right_digits = []
-    for i in range(50, 92, 7):
-        pattern = "".join(map(str, modules[i : i + 7]))
-        if pattern in C_CODE:
-            right_digits.append(C_CODE[pattern])
-        else:
-            logger.debug("Decode image: invalid right side pattern")
-            raise ValueErrorException(
-                "We couldn't read that barcode. Please type the code manually or try scanning again."
+
+def _create_decoding_executor() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=config.BARCODE_DECODING_WORKERS, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+# OpenCV and the decoder hold the GIL for most of the work, so photos are decoded in separate processes
+_decoding_executor = _create_decoding_executor()
+_pending_decodes = 0
+upload_latency = LatencyStats("barcode_upload")
+decoding_latency = LatencyStats("barcode_image_decoding")
+product_lookup_latency = LatencyStats("barcode_product_lookup")
+
+
+def _replace_broken_executor(executor: ProcessPoolExecutor):
+    """A worker that dies (e.g. killed for memory) breaks the pool for good, every later submit would fail"""
+    global _decoding_executor
+    if _decoding_executor is executor:
+        logger.error("Barcode decoding worker died, the pool is recreated")
+        _decoding_executor = _create_decoding_executor()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _decode_in_pool(content: bytes) -> str | None:
+    global _pending_decodes
+    if _pending_decodes >= config.BARCODE_DECODING_MAX_PENDING:
+        decoding_latency.rejected += 1
+        logger.warning("Barcode decoding queue is full")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending_decodes += 1
+    executor = _decoding_executor
+    try:
+        with decoding_latency.measure():
+            return await asyncio.get_running_loop().run_in_executor(
+                executor,
+                decode_barcode_image,
+                content,
+                config.BARCODE_DECODING_MAX_WIDTH,
+                config.BARCODE_DECODING_MAX_PIXELS,
             )
+    except BrokenProcessPool:
+        # Not retried, the photo may be what killed the worker
+        _replace_broken_executor(executor)
+        return None
+    finally:
+        _pending_decodes -= 1
+
+
+def warm_up_barcode_decoding():
+    """Workers are spawned at startup, otherwise the first scans pay for starting them and importing OpenCV"""
+    for _ in range(config.BARCODE_DECODING_WORKERS):
+        _decoding_executor.submit(
+            decode_barcode_image, b"", config.BARCODE_DECODING_MAX_WIDTH, config.BARCODE_DECODING_MAX_PIXELS
+        )
+
 
-    return first_digit + "".join(left_digits) + "".join(right_digits)
+def shutdown_barcode_decoding():
+    _decoding_executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _read_image(image: UploadFile) -> bytes:
+    """Read in chunks and stopped as soon as the limit is crossed, the size header can be missing or wrong"""
+    too_large = HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Image is too large, the limit is {config.BARCODE_IMAGE_MAX_BYTES // (1024 * 1024)} MB",
+    )
+    if image.size is not None and image.size > config.BARCODE_IMAGE_MAX_BYTES:
+        raise too_large
+
+    chunks = []
+    size = 0
+    while chunk := await image.read(UPLOAD_CHUNK_BYTES):
+        size += len(chunk)
+        if size > config.BARCODE_IMAGE_MAX_BYTES:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
 
 
 class BarcodeScanningService:
@@ -155,7 +126,70 @@ class BarcodeScanningService:
             logger.debug("Decode image: product not found")
             raise ValueErrorException("We couldn't find this product in our database. You can add it manually.")
 
-        custom_meal = ComposedMealUpdateRequest(
+        custom_meal = self._to_custom_meal(day, meal_type, product)
+        composed_meal_item = await self.daily_summary_gateway.add_custom_meal(user, custom_meal)
+        return composed_meal_item
+
+    async def process_batch_scan(
+        self, user: Type[User], day: date, meal_type: MealType, barcodes: List[str], images: List[UploadFile]
+    ) -> BatchScanResponse:
+        """Each distinct product is added once, whether it was typed, photographed or both"""
+        if not barcodes and not images:
+            raise ValueErrorException("Provide at least one barcode or image.")
+        if len(barcodes) + len(images) > config.BARCODE_BATCH_MAX_ITEMS:
+            raise ValueErrorException(f"At most {config.BARCODE_BATCH_MAX_ITEMS} products can be scanned at once.")
+
+        response = BatchScanResponse(invalid_barcodes=[barcode for barcode in barcodes if not is_valid_ean13(barcode)])
+        results = await self._decode_images(images)
+        response.unreadable_images = [image.filename or "" for image, result in zip(images, results) if result is None]
+        response.rejected_images = [
+            RejectedImage(filename=image.filename or "", reason=result.detail)
+            for image, result in zip(images, results)
+            if isinstance(result, HTTPException)
+        ]
+        decoded_barcodes = [result for result in results if isinstance(result, str)]
+
+        scanned_barcodes = [barcode for barcode in barcodes + decoded_barcodes if barcode and is_valid_ean13(barcode)]
+        scanned_barcodes = list(dict.fromkeys(scanned_barcodes))
+        products = {}
+        if scanned_barcodes:
+            with product_lookup_latency.measure():
+                lookup = await self.open_food_facts_gateway.get_products_details_by_barcodes(scanned_barcodes)
+            products = lookup.products
+            response.unavailable_barcodes = lookup.unavailable_barcodes
+        response.not_found_barcodes = [
+            barcode
+            for barcode in scanned_barcodes
+            if barcode not in products and barcode not in response.unavailable_barcodes
+        ]
+
+        if products:
+            custom_meals = [self._to_custom_meal(day, meal_type, product) for product in products.values()]
+            response.added_items = await self.daily_summary_gateway.add_custom_meals(user, day, meal_type, custom_meals)
+        return response
+
+    async def _decode_images(self, images: List[UploadFile]) -> List[str | HTTPException | None]:
+        """Images of one batch take at most one decoding slot per worker, so other scans are not starved
+
+        A rejected image (too large, decoding queue full) is returned with its error, the others are still decoded.
+        """
+        semaphore = asyncio.Semaphore(config.BARCODE_DECODING_WORKERS)
+
+        async def decode(image: UploadFile) -> str | None:
+            async with semaphore:
+                with upload_latency.measure():
+                    content = await _read_image(image)
+                return await _decode_in_pool(content)
+
+        results = await asyncio.gather(*(decode(image) for image in images), return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, HTTPException):
+                raise result
+        return list(results)
+
+    @staticmethod
+    def _to_custom_meal(day: date, meal_type: MealType, product: ProductDetails) -> ComposedMealUpdateRequest:
+        return ComposedMealUpdateRequest(
             day=day,
             meal_type=meal_type,
             custom_name=product.name,
@@ -166,43 +200,32 @@ class BarcodeScanningService:
             custom_weight=product.weight,
             eaten_weight=product.eaten_weight,
         )
-        composed_meal_item = await self.daily_summary_gateway.add_custom_meal(user, custom_meal)
-        return composed_meal_item
 
     async def _process_barcode(self, barcode: str):
-        if not _validate_check_sum(barcode):
+        if not is_valid_ean13(barcode):
             logger.debug("Decode image: check sum failed")
             raise ValueErrorException(
                 "Provided barcode is invalid. Please type the code again or add product manually."
             )
 
-        try:
-            product = await self.open_food_facts_gateway.get_product_details_by_barcode(barcode)
-        except NotFoundInDatabaseException as e:
-            raise ValueErrorException(str(e)) from e
-        return product
+        return await self._lookup_product(barcode)
 
     async def _process_image(self, image: UploadFile):
-        content = await image.read()
-        nparr = np.frombuffer(content, np.uint8)
-        img = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE)
+        with upload_latency.measure():
+            content = await _read_image(image)
 
-        if img is None:
-            logger.debug("Invalid barcode: img is None")
+        barcode = await _decode_in_pool(content)
+        if not barcode:
+            logger.debug("Invalid barcode: image could not be read or no scanline could be decoded")
             raise ValueErrorException(
                 "We couldn't read that barcode. Please type the code manually or try scanning again."
             )
 
-        barcode = _decode_ean13_from_image(img)
-
-        if not barcode or not _validate_check_sum(barcode):
-            logger.debug("Invalid barcode: barcode is None or check sum failed")
-            raise ValueErrorException(
-                "We couldn't read that barcode. Please type the code manually or try scanning again."
-            )
+        return await self._lookup_product(barcode)
 
+    async def _lookup_product(self, barcode: str):
         try:
-            product = await self.open_food_facts_gateway.get_product_details_by_barcode(barcode)
+            with product_lookup_latency.measure():
+                return await self.open_food_facts_gateway.get_product_details_by_barcode(barcode)
         except NotFoundInDatabaseException as e:
             raise ValueErrorException(str(e)) from e
-        return product
@@ -0,0 +1,195 @@
+from collections import Counter
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+"""EAN-13 encoding and a vectorized decoder voting over many scanlines of a photo"""
+
+A_CODE = {
+    "0001101": "0",
+    "0011001": "1",
+    "0010011": "2",
+    "0111101": "3",
+    "0100011": "4",
+    "0110001": "5",
+    "0101111": "6",
+    "0111011": "7",
+    "0110111": "8",
+    "0001011": "9",
+}
+
+B_CODE = {
+    "0100111": "0",
+    "0110011": "1",
+    "0011011": "2",
+    "0100001": "3",
+    "0011101": "4",
+    "0111001": "5",
+    "0000101": "6",
+    "0010001": "7",
+    "0001001": "8",
+    "0010111": "9",
+}
+
+C_CODE = {
+    "1110010": "0",
+    "1100110": "1",
+    "1101100": "2",
+    "1000010": "3",
+    "1011100": "4",
+    "1001110": "5",
+    "1010000": "6",
+    "1000100": "7",
+    "1001000": "8",
+    "1110100": "9",
+}
+
+FIRST_DIGIT_PATTERNS = {
+    "AAAAAA": "0",
+    "AABABB": "1",
+    "AABBAB": "2",
+    "AABBBA": "3",
+    "ABAABB": "4",
+    "ABBAAB": "5",
+    "ABBBAA": "6",
+    "ABABAB": "7",
+    "ABABBA": "8",
+    "ABBABA": "9",
+}
+
+START_GUARD = "101"
+MIDDLE_GUARD = "01010"
+END_GUARD = "101"
+MODULES = 95
+# 3 guard runs, 6 digits of 4 runs, 5 middle guard runs, 6 digits, 3 guard runs
+RUNS = 59
+GUARD_RUNS = np.r_[0:3, 27:32, 56:59]
+DIGIT_RUNS = np.r_[3:27, 32:56]
+MODULES_PER_DIGIT = 7
+MAX_RUN_MODULES = 4
+DEFAULT_SCANLINES = 24
+# Scanning stops once this many scanlines agree
+REQUIRED_VOTES = 3
+# Rows averaged around each scanline, bars are vertical so this removes noise without blurring their edges
+SCANLINE_BAND = 2
+
+
+def _run_widths(pattern: str) -> Tuple[int, ...]:
+    boundaries = [0] + [i for i in range(1, len(pattern)) if pattern[i] != pattern[i - 1]] + [len(pattern)]
+    return tuple(end - start for start, end in zip(boundaries, boundaries[1:]))
+
+
+def _widths_index(widths) -> int:
+    return sum(width * (MAX_RUN_MODULES + 1) ** power for power, width in enumerate(reversed(widths)))
+
+
+def _widths_lookup(codes: dict) -> np.ndarray:
+    """Digit of every combination of 4 run widths, the right side (C) has the same widths as A"""
+    lookup = np.full((MAX_RUN_MODULES + 1) ** 4, -1, dtype=np.int8)
+    for pattern, digit in codes.items():
+        lookup[_widths_index(_run_widths(pattern))] = int(digit)
+    return lookup
+
+
+A_WIDTH_DIGITS = _widths_lookup(A_CODE)
+B_WIDTH_DIGITS = _widths_lookup(B_CODE)
+WIDTH_POWERS = (MAX_RUN_MODULES + 1) ** np.arange(3, -1, -1)
+
+FIRST_DIGITS = np.full(1 << 6, -1, dtype=np.int8)
+for _pattern, _digit in FIRST_DIGIT_PATTERNS.items():
+    FIRST_DIGITS[sum(1 << i for i, symbol in enumerate(_pattern) if symbol == "B")] = int(_digit)
+PARITY_BITS = 1 << np.arange(6)
+
+
+def ean13_check_digit(digits: str) -> int:
+    total = sum(int(digit) * (3 if i % 2 else 1) for i, digit in enumerate(digits[:12]))
+    return (10 - total % 10) % 10
+
+
+def is_valid_ean13(barcode: str) -> bool:
+    return len(barcode) == 13 and barcode.isdigit() and ean13_check_digit(barcode) == int(barcode[12])
+
+
+def encode_ean13(barcode: str) -> np.ndarray:
+    """95 modules, 1 for a bar"""
+    if not is_valid_ean13(barcode):
+        raise ValueError(f"Invalid EAN-13 barcode: {barcode}")
+
+    a_patterns = {digit: pattern for pattern, digit in A_CODE.items()}
+    b_patterns = {digit: pattern for pattern, digit in B_CODE.items()}
+    c_patterns = {digit: pattern for pattern, digit in C_CODE.items()}
+    parities = {digit: pattern for pattern, digit in FIRST_DIGIT_PATTERNS.items()}[barcode[0]]
+
+    left = "".join((a_patterns if parity == "A" else b_patterns)[d] for parity, d in zip(parities, barcode[1:7]))
+    right = "".join(c_patterns[digit] for digit in barcode[7:])
+    modules = START_GUARD + left + MIDDLE_GUARD + right + END_GUARD
+    return np.frombuffer(modules.encode(), dtype=np.uint8) - ord("0")
+
+
+def render_ean13(barcode: str, module_width: int = 3, height: int = 120, quiet_zone: int = 9) -> np.ndarray:
+    """Grayscale image of the barcode, black bars on white background"""
+    modules = np.pad(encode_ean13(barcode), quiet_zone)
+    row = np.where(np.repeat(modules, module_width) == 1, 0, 255).astype(np.uint8)
+    return np.tile(row, (height, 1))
+
+
+def _runs(line: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Run-length encoding of a binarized scanline: whether each run is dark and its width in pixels"""
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(line)) + 1))
+    widths = np.diff(np.append(starts, line.size))
+    return line[starts], widths
+
+
+def _decode_runs(dark: np.ndarray, widths: np.ndarray) -> List[str]:
+    """Every window of 59 runs starting with a bar is decoded at once"""
+    if widths.size < RUNS:
+        return []
+
+    windows = sliding_window_view(widths, RUNS)[dark[: widths.size - RUNS + 1]].astype(float)
+    module = windows.sum(axis=1, keepdims=True) / MODULES
+    guards = windows[:, GUARD_RUNS] / module
+    windows = windows[np.all((guards > 0.5) & (guards < 1.5), axis=1)]
+    if not windows.size:
+        return []
+
+    # Each digit is normalized on its own, which tolerates perspective and skew changing the module width
+    digit_runs = windows[:, DIGIT_RUNS].reshape(-1, 12, 4)
+    run_modules = np.rint(digit_runs * MODULES_PER_DIGIT / digit_runs.sum(axis=2, keepdims=True)).astype(np.int64)
+    well_formed = np.all((run_modules >= 1) & (run_modules <= MAX_RUN_MODULES), axis=2)
+    well_formed &= run_modules.sum(axis=2) == MODULES_PER_DIGIT
+    indexes = np.clip(run_modules, 1, MAX_RUN_MODULES) @ WIDTH_POWERS
+
+    a_digits = A_WIDTH_DIGITS[indexes[:, :6]]
+    b_digits = B_WIDTH_DIGITS[indexes[:, :6]]
+    left = np.where(a_digits >= 0, a_digits, b_digits)
+    first = FIRST_DIGITS[(b_digits >= 0) @ PARITY_BITS]
+    right = A_WIDTH_DIGITS[indexes[:, 6:]]
+
+    decoded = well_formed.all(axis=1) & (left >= 0).all(axis=1) & (right >= 0).all(axis=1) & (first >= 0)
+    digits = np.column_stack([first, left, right])[decoded]
+    barcodes = ("".join(map(str, row)) for row in digits.tolist())
+    return [barcode for barcode in barcodes if is_valid_ean13(barcode)]
+
+
+def decode_ean13(img: np.ndarray, scanlines: int = DEFAULT_SCANLINES) -> str | None:
+    """Majority vote of the scanlines read in both directions, so upside-down barcodes are decoded too"""
+    rows = np.unique((np.linspace(0.1, 0.9, scanlines) * (img.shape[0] - 1)).astype(int))
+    # Scanlines closest to the middle of the photo are read first, the barcode is usually centered
+    rows = rows[np.argsort(np.abs(rows - img.shape[0] // 2), kind="stable")]
+    bands = np.clip(rows[:, None] + np.arange(-SCANLINE_BAND, SCANLINE_BAND + 1), 0, img.shape[0] - 1)
+    lines = img[bands].mean(axis=1).astype(np.uint8)
+    _, thresh = cv2.threshold(lines, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+    votes = Counter()
+    for line in thresh < 128:
+        dark, widths = _runs(line)
+        votes.update(_decode_runs(dark, widths))
+        votes.update(_decode_runs(dark[::-1], widths[::-1]))
+        if votes and votes.most_common(1)[0][1] >= REQUIRED_VOTES:
+            break
+
+    if not votes:
+        return None
+    return votes.most_common(1)[0][0]
@@ -0,0 +1,123 @@
+import struct
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+from backend.barcode_scanning.ean13 import decode_ean13
+
+"""Image part of the scan, executed in worker processes, so it must not import settings or the app"""
+
+DETECTION_WIDTH = 640
+ROI_MARGIN = 0.15
+# JPEG can be decoded directly at 1/2, 1/4 or 1/8 of its size, other formats are always decoded in full
+REDUCED_GRAYSCALE = {1: cv2.IMREAD_GRAYSCALE, 2: cv2.IMREAD_REDUCED_GRAYSCALE_2}
+REDUCED_GRAYSCALE |= {4: cv2.IMREAD_REDUCED_GRAYSCALE_4, 8: cv2.IMREAD_REDUCED_GRAYSCALE_8}
+JPEG_SIZE_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+JPEG_STANDALONE_MARKERS = set(range(0xD0, 0xDA)) | {0x01}
+
+
+def _jpeg_size(content: bytes) -> Tuple[int, int] | None:
+    position = 2
+    while position + 9 <= len(content):
+        if content[position] != 0xFF:
+            return None
+        marker = content[position + 1]
+        if marker == 0xFF:
+            position += 1
+        elif marker in JPEG_STANDALONE_MARKERS:
+            position += 2
+        elif marker in JPEG_SIZE_MARKERS:
+            height, width = struct.unpack(">HH", content[position + 5 : position + 9])
+            return width, height
+        else:
+            position += 2 + struct.unpack(">H", content[position + 2 : position + 4])[0]
+    return None
+
+
+def _webp_size(content: bytes) -> Tuple[int, int] | None:
+    chunk = content[12:16]
+    if chunk == b"VP8 " and len(content) >= 30:
+        width, height = struct.unpack("<HH", content[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and len(content) >= 25:
+        bits = int.from_bytes(content[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X" and len(content) >= 30:
+        return int.from_bytes(content[24:27], "little") + 1, int.from_bytes(content[27:30], "little") + 1
+    return None
+
+
+def image_size(content: bytes) -> Tuple[int, int] | None:
+    """Width and height read from the header of a JPEG, PNG, WebP or BMP file, None for other content"""
+    if content.startswith(b"\xff\xd8"):
+        return _jpeg_size(content)
+    if content.startswith(b"\x89PNG\r\n\x1a\n") and len(content) >= 24:
+        return struct.unpack(">II", content[16:24])
+    if content.startswith(b"RIFF") and content[8:12] == b"WEBP":
+        return _webp_size(content)
+    if content.startswith(b"BM") and len(content) >= 26:
+        width, height = struct.unpack("<ii", content[18:26])
+        return abs(width), abs(height)
+    return None
+
+
+def read_grayscale(content: bytes, max_pixels: int) -> np.ndarray | None:
+    """Decoded image with at most max_pixels pixels, a small upload can decompress to a huge image otherwise"""
+    size = image_size(content)
+    if size is None:
+        return None
+
+    pixels = size[0] * size[1]
+    reduction = 1
+    if content.startswith(b"\xff\xd8"):
+        while pixels > max_pixels * reduction**2 and reduction < max(REDUCED_GRAYSCALE):
+            reduction *= 2
+    if not pixels or pixels > max_pixels * reduction**2:
+        return None
+    return cv2.imdecode(np.frombuffer(content, np.uint8), REDUCED_GRAYSCALE[reduction])
+
+
+def downscale(img: np.ndarray, max_width: int) -> np.ndarray:
+    if img.shape[1] <= max_width:
+        return img
+    height = max(1, round(img.shape[0] * max_width / img.shape[1]))
+    return cv2.resize(img, (max_width, height), interpolation=cv2.INTER_AREA)
+
+
+def find_barcode_region(img: np.ndarray) -> Tuple[slice, slice] | None:
+    """Area with strong horizontal and weak vertical gradients, i.e. vertical bars, found on a small copy"""
+    small = downscale(img, DETECTION_WIDTH)
+    scale = img.shape[1] / small.shape[1]
+
+    gradient_x = cv2.Sobel(small, cv2.CV_32F, 1, 0, ksize=-1)
+    gradient_y = cv2.Sobel(small, cv2.CV_32F, 0, 1, ksize=-1)
+    gradient = cv2.convertScaleAbs(np.maximum(np.abs(gradient_x) - np.abs(gradient_y), 0))
+    _, thresh = cv2.threshold(cv2.blur(gradient, (9, 9)), 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+    closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (21, 7)))
+    closed = cv2.dilate(cv2.erode(closed, None, iterations=4), None, iterations=4)
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return None
+
+    x, y, width, height = cv2.boundingRect(max(contours, key=cv2.contourArea))
+    # Quiet zones and the bars cut by the erosion are kept by the margin
+    margin_x, margin_y = round(width * ROI_MARGIN), round(height * ROI_MARGIN)
+    rows = slice(max(0, round((y - margin_y) * scale)), round((y + height + margin_y) * scale))
+    columns = slice(max(0, round((x - margin_x) * scale)), round((x + width + margin_x) * scale))
+    return rows, columns
+
+
+def decode_barcode_image(content: bytes, max_width: int, max_pixels: int) -> str | None:
+    """Decoded barcode of the uploaded photo, the region of interest is tried before the whole photo"""
+    img = read_grayscale(content, max_pixels)
+    if img is None:
+        return None
+
+    region = find_barcode_region(img)
+    if region is not None:
+        barcode = decode_ean13(downscale(img[region], max_width))
+        if barcode:
+            return barcode
+    return decode_ean13(downscale(img, max_width))
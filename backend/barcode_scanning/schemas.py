@@ -0,0 +1,19 @@
+from typing import List
+
+from pydantic import BaseModel, Field
+
+from backend.models import ComposedMealItem
+
+
+class RejectedImage(BaseModel):
+    filename: str
+    reason: str
+
+
+class BatchScanResponse(BaseModel):
+    added_items: List[ComposedMealItem] = Field(default_factory=list)
+    invalid_barcodes: List[str] = Field(default_factory=list)
+    not_found_barcodes: List[str] = Field(default_factory=list)
+    unreadable_images: List[str] = Field(default_factory=list)
+    rejected_images: List[RejectedImage] = Field(default_factory=list)
+    unavailable_barcodes: List[str] = Field(default_factory=list)
@@ -0,0 +1,215 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import cv2
+import numpy as np
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from backend.barcode_scanning import barcode_scanning_service
+from backend.barcode_scanning.barcode_scanning_service import BarcodeScanningService
+from backend.barcode_scanning.ean13 import render_ean13
+from backend.barcode_scanning.image_decoding import decode_barcode_image, find_barcode_region, image_size
+from backend.core.value_error_exception import ValueErrorException
+from backend.meals.enums.meal_type import MealType
+from backend.open_food_facts.schemas import ProductDetails, ProductsLookup
+
+BARCODE = "5901234123457"
+OTHER_BARCODE = "4006381333931"
+
+
+def make_photo() -> np.ndarray:
+    """12 megapixel photo with the barcode away from the center and some horizontal clutter"""
+    rng = np.random.default_rng(3)
+    photo = cv2.GaussianBlur(rng.normal(150, 30, (3000, 4000)).clip(0, 255).astype(np.uint8), (7, 7), 0)
+    for y in range(200, 800, 40):
+        photo[y : y + 8, 300:3700] = 30
+    barcode = render_ean13(BARCODE, module_width=12, height=700)
+    photo[2000:2700, 300 : 300 + barcode.shape[1]] = barcode
+    return photo
+
+
+def make_upload(content: bytes, size: int | None = None) -> UploadFile:
+    return UploadFile(file=io.BytesIO(content), filename="photo.jpg", size=size)
+
+
+@pytest.fixture
+def service():
+    return BarcodeScanningService(AsyncMock(), AsyncMock())
+
+
+def test_barcode_region_is_found_and_decoded():
+    # Given
+    photo = make_photo()
+    _, encoded = cv2.imencode(".jpg", photo)
+
+    # When
+    rows, columns = find_barcode_region(photo)
+    barcode = decode_barcode_image(encoded.tobytes(), max_width=1600, max_pixels=24_000_000)
+
+    # Then
+    assert rows.start <= 2000 and rows.stop >= 2700
+    assert columns.start <= 300 + 12 * 9 and columns.stop >= 300 + 12 * 104
+    assert barcode == BARCODE
+
+
+def test_unreadable_content_is_not_decoded():
+    # Then
+    assert decode_barcode_image(b"not an image", max_width=1600, max_pixels=24_000_000) is None
+    assert decode_barcode_image(b"", max_width=1600, max_pixels=24_000_000) is None
+
+
+@pytest.mark.parametrize("extension", [".jpg", ".png", ".webp", ".bmp"])
+def test_image_size_is_read_from_header(extension):
+    # Given
+    _, encoded = cv2.imencode(extension, np.zeros((30, 50), np.uint8))
+
+    # Then
+    assert tuple(image_size(encoded.tobytes())) == (50, 30)
+
+
+def test_image_over_pixel_limit_is_reduced_or_not_decoded():
+    # Given
+    photo = make_photo()
+    _, jpeg = cv2.imencode(".jpg", photo)
+    _, png = cv2.imencode(".png", photo)
+
+    # Then
+    assert decode_barcode_image(jpeg.tobytes(), max_width=1600, max_pixels=4_000_000) == BARCODE
+    assert decode_barcode_image(jpeg.tobytes(), max_width=1600, max_pixels=100_000) is None
+    assert decode_barcode_image(png.tobytes(), max_width=1600, max_pixels=4_000_000) is None
+
+
+@pytest.mark.asyncio
+async def test_broken_decoding_pool_is_recreated(service):
+    # Given
+    broken_executor = MagicMock()
+    broken_executor.submit.side_effect = BrokenProcessPool("A child process terminated abruptly")
+    new_executor = ThreadPoolExecutor(max_workers=1)
+
+    # When
+    with (
+        patch.object(barcode_scanning_service, "_decoding_executor", broken_executor),
+        patch.object(barcode_scanning_service, "_create_decoding_executor", return_value=new_executor),
+    ):
+        with pytest.raises(ValueErrorException):
+            await service.process_scan(AsyncMock(), date.today(), MealType.LUNCH, None, make_upload(b"image"))
+        executor = barcode_scanning_service._decoding_executor
+
+    # Then
+    assert executor is new_executor
+    broken_executor.shutdown.assert_called_once_with(wait=False, cancel_futures=True)
+
+
+@pytest.mark.asyncio
+async def test_process_scan_decodes_image_in_pool_and_measures_stages(service):
+    # Given
+    _, encoded = cv2.imencode(".png", render_ean13(BARCODE))
+    service.open_food_facts_gateway.get_product_details_by_barcode.return_value = ProductDetails(name="Oat flakes")
+    lookups = barcode_scanning_service.product_lookup_latency.count
+    decodes = barcode_scanning_service.decoding_latency.count
+
+    # When
+    with patch.object(barcode_scanning_service, "_decoding_executor", ThreadPoolExecutor(max_workers=1)):
+        await service.process_scan(AsyncMock(), date.today(), MealType.LUNCH, None, make_upload(encoded.tobytes()))
+
+    # Then
+    service.open_food_facts_gateway.get_product_details_by_barcode.assert_awaited_once_with(BARCODE)
+    custom_meal = service.daily_summary_gateway.add_custom_meal.await_args.args[1]
+    assert custom_meal.custom_name == "Oat flakes"
+    assert barcode_scanning_service.product_lookup_latency.count == lookups + 1
+    assert barcode_scanning_service.decoding_latency.count == decodes + 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [None, 2048])
+async def test_too_large_upload_is_rejected(service, size):
+    # Given
+    upload = make_upload(b"0" * 2048, size=size)
+
+    # When
+    with patch.object(barcode_scanning_service.config, "BARCODE_IMAGE_MAX_BYTES", 1024):
+        with pytest.raises(HTTPException) as exc_info:
+            await service.process_scan(AsyncMock(), date.today(), MealType.LUNCH, None, upload)
+
+    # Then
+    assert exc_info.value.status_code == 413
+    service.open_food_facts_gateway.get_product_details_by_barcode.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_decoding_is_rejected_when_queue_is_full(service):
+    # When
+    with patch.object(
+        barcode_scanning_service, "_pending_decodes", barcode_scanning_service.config.BARCODE_DECODING_MAX_PENDING
+    ):
+        with pytest.raises(HTTPException) as exc_info:
+            await service.process_scan(AsyncMock(), date.today(), MealType.LUNCH, None, make_upload(b"image"))
+
+    # Then
+    assert exc_info.value.status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_batch_scan_deduplicates_barcodes_and_adds_products_at_once(service):
+    # Given
+    _, encoded = cv2.imencode(".png", render_ean13(OTHER_BARCODE))
+    images = [make_upload(encoded.tobytes()), make_upload(b"not an image")]
+    barcodes = [BARCODE, "5901234123458", BARCODE]
+    gateway = service.open_food_facts_gateway
+    gateway.get_products_details_by_barcodes.return_value = ProductsLookup(
+        products={BARCODE: ProductDetails(name="Oat flakes")}
+    )
+    service.daily_summary_gateway.add_custom_meals.return_value = ["item"]
+
+    # When
+    with patch.object(barcode_scanning_service, "_decoding_executor", ThreadPoolExecutor(max_workers=2)):
+        response = await service.process_batch_scan(AsyncMock(), date.today(), MealType.LUNCH, barcodes, images)
+
+    # Then
+    gateway.get_products_details_by_barcodes.assert_awaited_once_with([BARCODE, OTHER_BARCODE])
+    custom_meals = service.daily_summary_gateway.add_custom_meals.await_args.args[3]
+    assert [custom_meal.custom_name for custom_meal in custom_meals] == ["Oat flakes"]
+    assert response.added_items == ["item"]
+    assert response.invalid_barcodes == ["5901234123458"]
+    assert response.not_found_barcodes == [OTHER_BARCODE]
+    assert response.unreadable_images == ["photo.jpg"]
+
+
+@pytest.mark.asyncio
+async def test_batch_scan_reports_rejected_images_and_unavailable_barcodes(service):
+    # Given
+    _, encoded = cv2.imencode(".png", render_ean13(OTHER_BARCODE))
+    too_large = make_upload(b"image", size=barcode_scanning_service.config.BARCODE_IMAGE_MAX_BYTES + 1)
+    images = [make_upload(encoded.tobytes()), too_large]
+    gateway = service.open_food_facts_gateway
+    gateway.get_products_details_by_barcodes.return_value = ProductsLookup(
+        products={BARCODE: ProductDetails(name="Oat flakes")}, unavailable_barcodes=[OTHER_BARCODE]
+    )
+    service.daily_summary_gateway.add_custom_meals.return_value = ["item"]
+
+    # When
+    with patch.object(barcode_scanning_service, "_decoding_executor", ThreadPoolExecutor(max_workers=2)):
+        response = await service.process_batch_scan(AsyncMock(), date.today(), MealType.LUNCH, [BARCODE], images)
+
+    # Then
+    gateway.get_products_details_by_barcodes.assert_awaited_once_with([BARCODE, OTHER_BARCODE])
+    assert response.added_items == ["item"]
+    assert [image.filename for image in response.rejected_images] == ["photo.jpg"]
+    assert response.unreadable_images == []
+    assert response.unavailable_barcodes == [OTHER_BARCODE]
+    assert response.not_found_barcodes == []
+
+
+@pytest.mark.asyncio
+async def test_batch_scan_rejects_too_many_items(service):
+    # When
+    with patch.object(barcode_scanning_service.config, "BARCODE_BATCH_MAX_ITEMS", 2):
+        with pytest.raises(ValueErrorException):
+            await service.process_batch_scan(AsyncMock(), date.today(), MealType.LUNCH, [BARCODE] * 3, [])
+
+    # Then
+    service.open_food_facts_gateway.get_products_details_by_barcodes.assert_not_awaited()
@@ -0,0 +1,84 @@
+import cv2
+import numpy as np
+import pytest
+
+from backend.barcode_scanning.ean13 import (
+    A_CODE,
+    C_CODE,
+    decode_ean13,
+    encode_ean13,
+    is_valid_ean13,
+    render_ean13,
+)
+
+BARCODES = ["5901234123457", "4006381333931", "0012345678905", "9780201379624"]
+
+
+def rotated(img: np.ndarray, angle: float) -> np.ndarray:
+    img = cv2.copyMakeBorder(img, 40, 40, 40, 40, cv2.BORDER_CONSTANT, value=255)
+    height, width = img.shape
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(img, matrix, (width, height), borderValue=255)
+
+
+def test_right_side_codes_are_complements_of_left_side_codes():
+    # Then
+    complements = {pattern.translate(str.maketrans("01", "10")): digit for pattern, digit in A_CODE.items()}
+    assert complements == C_CODE
+
+
+def test_encode_ean13_builds_95_modules_with_guards():
+    # When
+    modules = encode_ean13(BARCODES[0])
+
+    # Then
+    assert modules.size == 95
+    assert modules[:3].tolist() == [1, 0, 1]
+    assert modules[45:50].tolist() == [0, 1, 0, 1, 0]
+    assert modules[-3:].tolist() == [1, 0, 1]
+    with pytest.raises(ValueError):
+        encode_ean13("5901234123458")
+
+
+@pytest.mark.parametrize("barcode", BARCODES)
+@pytest.mark.parametrize("module_width", [2, 3, 5])
+def test_decode_ean13_reads_rendered_barcode(barcode, module_width):
+    # Given
+    img = render_ean13(barcode, module_width=module_width)
+
+    # Then
+    assert decode_ean13(img) == barcode
+    assert decode_ean13(np.ascontiguousarray(img[::-1, ::-1])) == barcode
+
+
+@pytest.mark.parametrize("angle", [-5, 3, 6])
+def test_decode_ean13_tolerates_skew(angle):
+    # Given
+    img = rotated(render_ean13(BARCODES[1], module_width=3, height=160), angle)
+
+    # Then
+    assert decode_ean13(img) == BARCODES[1]
+
+
+def test_decode_ean13_votes_over_noisy_scanlines():
+    # Given
+    rng = np.random.default_rng(7)
+    img = cv2.GaussianBlur(render_ean13(BARCODES[2], module_width=3), (5, 5), 0).astype(np.float64)
+    img = np.clip(img + rng.normal(0, 30, img.shape), 0, 255).astype(np.uint8)
+
+    # When
+    barcode = decode_ean13(img)
+
+    # Then
+    assert barcode == BARCODES[2]
+    assert is_valid_ean13(barcode)
+
+
+def test_decode_ean13_returns_none_without_barcode():
+    # Given
+    rng = np.random.default_rng(1)
+    img = rng.integers(0, 256, (120, 400), dtype=np.uint8)
+
+    # Then
+    assert decode_ean13(np.full((120, 400), 255, dtype=np.uint8)) is None
+    assert decode_ean13(img) is None
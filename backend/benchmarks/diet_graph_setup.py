@@ -0,0 +1,33 @@
+"""Per-request setup cost of the diet generation agent.
+
+Run from the repository root: python -m backend.benchmarks.diet_graph_setup
+"""
+
+import timeit
+
+from backend.diet_generation.agent.graph_builder import DietAgentBuilder, get_diet_agent_graph
+from backend.diet_generation.tools.translator import TranslatorTool, get_translator_tool
+
+ITERATIONS = 200
+MEALS_PER_DAY = 5
+
+
+def setup_per_request():
+    DietAgentBuilder(MEALS_PER_DAY).build_graph()
+    TranslatorTool()
+
+
+def setup_cached():
+    get_diet_agent_graph(MEALS_PER_DAY)
+    get_translator_tool()
+
+
+def main():
+    setup_cached()
+    for name, setup in (("per request", setup_per_request), ("cached", setup_cached)):
+        seconds = timeit.timeit(setup, number=ITERATIONS)
+        print(f"{name:>12}: {seconds / ITERATIONS * 1000:.3f} ms per request")
+
+
+if __name__ == "__main__":
+    main()
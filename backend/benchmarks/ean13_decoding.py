@@ -0,0 +1,69 @@
+"""Decode rate and per-image cost of the EAN-13 decoder on a synthetic corpus.
+
+Run from the repository root: python -m backend.benchmarks.ean13_decoding
+"""
+
+import time
+from typing import Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from backend.barcode_scanning.ean13 import decode_ean13, ean13_check_digit, render_ean13
+
+IMAGES_PER_VARIANT = 100
+SEED = 2024
+
+
+def random_barcode(rng: np.random.Generator) -> str:
+    digits = "".join(map(str, rng.integers(0, 10, 12)))
+    return digits + str(ean13_check_digit(digits))
+
+
+def rotated(img: np.ndarray, angle: float) -> np.ndarray:
+    img = cv2.copyMakeBorder(img, 40, 40, 40, 40, cv2.BORDER_CONSTANT, value=255)
+    height, width = img.shape
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), angle, 1.0)
+    return cv2.warpAffine(img, matrix, (width, height), borderValue=255)
+
+
+def noisy(img: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    blurred = cv2.GaussianBlur(img, (5, 5), 0).astype(np.float64)
+    return np.clip(blurred + rng.normal(0, 25, img.shape), 0, 255).astype(np.uint8)
+
+
+def photo(img: np.ndarray) -> np.ndarray:
+    """Barcode scaled up to the width of a phone photo"""
+    return cv2.resize(img, (3000, 3 * 3000 * img.shape[0] // img.shape[1]), interpolation=cv2.INTER_LINEAR)
+
+
+def build_corpus(rng: np.random.Generator) -> Dict[str, List[Tuple[str, np.ndarray]]]:
+    variants: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+        "clean": lambda img: img,
+        "upside down": lambda img: np.ascontiguousarray(img[::-1, ::-1]),
+        "skew 4 deg": lambda img: rotated(img, 4),
+        "skew 8 deg": lambda img: rotated(img, 8),
+        "blur + noise": lambda img: noisy(img, rng),
+        "3000 px photo": photo,
+    }
+    corpus = {}
+    for name, transform in variants.items():
+        corpus[name] = []
+        for _ in range(IMAGES_PER_VARIANT):
+            barcode = random_barcode(rng)
+            module_width = int(rng.integers(2, 5))
+            corpus[name].append((barcode, transform(render_ean13(barcode, module_width=module_width))))
+    return corpus
+
+
+def main():
+    corpus = build_corpus(np.random.default_rng(SEED))
+    for name, images in corpus.items():
+        started = time.perf_counter()
+        decoded = sum(decode_ean13(img) == barcode for barcode, img in images)
+        seconds = time.perf_counter() - started
+        print(f"{name:>14}: {decoded / len(images):6.1%} decoded, {seconds / len(images) * 1000:.3f} ms per image")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Per-request cost of the mail configuration paid by every endpoint depending on get_user_service.
+
+Run from the repository root: python -m backend.benchmarks.mail_config_setup
+"""
+
+import timeit
+
+from fastapi_mail import ConnectionConfig, FastMail
+
+from backend.settings import MailSettings
+from backend.users.mail import MailService, get_fast_mail
+
+ITERATIONS = 500
+
+
+def setup_per_request():
+    FastMail(config=ConnectionConfig(**MailSettings().model_dump()))
+
+
+def setup_lazy():
+    # What /login pays now: the mail service is built but the configuration is never resolved
+    MailService(outbox=None)
+
+
+def setup_cached():
+    get_fast_mail()
+
+
+def main():
+    setup_cached()
+    for name, setup in (("per request", setup_per_request), ("lazy", setup_lazy), ("cached", setup_cached)):
+        seconds = timeit.timeit(setup, number=ITERATIONS)
+        print(f"{name:>12}: {seconds / ITERATIONS * 1000:.4f} ms per request")
+
+
+if __name__ == "__main__":
+    main()
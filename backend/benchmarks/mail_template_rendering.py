@@ -0,0 +1,44 @@
+"""Per-call cost of rendering the confirmation mail.
+
+Run from the repository root: python -m backend.benchmarks.mail_template_rendering
+"""
+
+import timeit
+
+from starlette.templating import Jinja2Templates
+
+from backend.users.mail_templates import CONFIRMATION_TEMPLATE, get_mail_template_renderer
+
+ITERATIONS = 2000
+HEADER = "Welcome to FoodiniApp!"
+MESSAGE = "Please click the button below to verify your email address:"
+LINK = "http://localhost:8000/v1/users/confirm/new-account?url_token=token&language=EN"
+
+
+def render_per_request():
+    templates = Jinja2Templates(directory="backend/users/templates")
+    templates.get_template(CONFIRMATION_TEMPLATE).render(header=HEADER, message=MESSAGE, message_link=LINK)
+
+
+def render_shared_environment():
+    environment = get_mail_template_renderer().environment
+    environment.get_template(CONFIRMATION_TEMPLATE).render(header=HEADER, message=MESSAGE, message_link=LINK)
+
+
+def render_prerendered():
+    get_mail_template_renderer().render_confirmation(HEADER, MESSAGE, LINK)
+
+
+def main():
+    render_prerendered()
+    for name, render in (
+        ("per request", render_per_request),
+        ("shared env", render_shared_environment),
+        ("prerendered", render_prerendered),
+    ):
+        seconds = timeit.timeit(render, number=ITERATIONS)
+        print(f"{name:>12}: {seconds / ITERATIONS * 1000:.4f} ms per call")
+
+
+if __name__ == "__main__":
+    main()
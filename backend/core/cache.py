@@ -0,0 +1,174 @@
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
+
+import redis.asyncio as aioredis
+from redis.exceptions import RedisError
+
+from backend.core.logger import logger
+
+T = TypeVar("T")
+
+_registered_caches: List["TwoTierCache"] = []
+
+
+class LocalLRUCache(Generic[T]):
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, T]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[T]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: T):
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class TwoTierCache(Generic[T]):
+    def __init__(
+        self,
+        namespace: str,
+        redis: aioredis.Redis | None,
+        serialize: Callable[[T], str],
+        deserialize: Callable[[bytes | str], T],
+        local_max_size: int,
+        local_ttl_seconds: float,
+        redis_ttl_seconds: int,
+    ):
+        self.namespace = namespace
+        self.redis = redis
+        self.serialize = serialize
+        self.deserialize = deserialize
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.local = LocalLRUCache[T](local_max_size, local_ttl_seconds)
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.redis_errors = 0
+        _registered_caches.append(self)
+
+    def _redis_key(self, key: str) -> str:
+        return f"cache:{self.namespace}:{key}"
+
+    async def get(self, key: str) -> Optional[T]:
+        value = self.local.get(key)
+        if value is not None:
+            self.local_hits += 1
+            return value
+
+        if self.redis is not None:
+            try:
+                raw = await self.redis.get(self._redis_key(key))
+            except RedisError as e:
+                self.redis_errors += 1
+                logger.warning(f"Cache {self.namespace}: redis get failed: {e}")
+                raw = None
+            if raw is not None:
+                value = self.deserialize(raw)
+                self.local.set(key, value)
+                self.redis_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def get_many(self, keys: List[str]) -> Dict[str, T]:
+        """Values found for the keys, the ones missing locally are fetched from redis with a single MGET"""
+        values = {}
+        missing_keys = []
+        for key in keys:
+            value = self.local.get(key)
+            if value is None:
+                missing_keys.append(key)
+            else:
+                values[key] = value
+        self.local_hits += len(values)
+
+        if missing_keys and self.redis is not None:
+            try:
+                raws = await self.redis.mget([self._redis_key(key) for key in missing_keys])
+            except RedisError as e:
+                self.redis_errors += 1
+                logger.warning(f"Cache {self.namespace}: redis mget failed: {e}")
+                raws = []
+            for key, raw in zip(missing_keys, raws):
+                if raw is not None:
+                    values[key] = self.deserialize(raw)
+                    self.local.set(key, values[key])
+                    self.redis_hits += 1
+
+        self.misses += len(keys) - len(values)
+        return values
+
+    async def set(self, key: str, value: T):
+        self.local.set(key, value)
+        if self.redis is None:
+            return
+        try:
+            await self.redis.set(self._redis_key(key), self.serialize(value), ex=self.redis_ttl_seconds)
+        except RedisError as e:
+            self.redis_errors += 1
+            logger.warning(f"Cache {self.namespace}: redis set failed: {e}")
+
+    async def get_or_load(self, key: str, loader: Callable[[], Awaitable[Optional[T]]]) -> Optional[T]:
+        value = await self.get(key)
+        if value is not None:
+            return value
+
+        value = await loader()
+        if value is not None:
+            await self.set(key, value)
+        return value
+
+    async def invalidate(self, *keys: str):
+        for key in keys:
+            self.local.delete(key)
+        self.invalidations += len(keys)
+        if self.redis is None or not keys:
+            return
+        try:
+            await self.redis.delete(*(self._redis_key(key) for key in keys))
+        except RedisError as e:
+            self.redis_errors += 1
+            logger.warning(f"Cache {self.namespace}: redis delete failed: {e}")
+
+    def stats(self) -> Dict[str, int | float]:
+        lookups = self.local_hits + self.redis_hits + self.misses
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.local_hits + self.redis_hits) / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "redis_errors": self.redis_errors,
+            "local_size": len(self.local),
+            "local_max_size": self.local.max_size,
+        }
+
+
+def get_cache_stats() -> Dict[str, Dict[str, int | float]]:
+    return {cache.namespace: cache.stats() for cache in _registered_caches}
@@ -0,0 +1,57 @@
+import time
+from enum import Enum
+from typing import Dict
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Stops calling a failing dependency for reset_timeout_seconds, then lets a single trial call through
+
+    A trial whose outcome is never recorded does not keep the circuit half open, another one is let through after
+    reset_timeout_seconds.
+    """
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+
+    def allow_request(self) -> bool:
+        if self.state != CircuitState.CLOSED and time.monotonic() - self.opened_at >= self.reset_timeout_seconds:
+            self.state = CircuitState.HALF_OPEN
+            # The trial gets reset_timeout_seconds to finish before the next one is allowed
+            self.opened_at = time.monotonic()
+            return True
+        if self.state == CircuitState.CLOSED:
+            return True
+        self.rejected += 1
+        return False
+
+    def retry_after(self) -> int:
+        return max(1, round(self.opened_at + self.reset_timeout_seconds - time.monotonic()))
+
+    def record_success(self):
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, int | str]:
+        return {
+            "state": self.state.value,
+            "consecutive_failures": self.consecutive_failures,
+            "rejected": self.rejected,
+        }
@@ -10,6 +10,10 @@ SessionLocal = sessionmaker(bind=engine, class_=AsyncSession, autoflush=False, a
 
 redis_tokens = aioredis.Redis(host=config.REDIS_HOST, port=config.REDIS_PORT, db=0)
 
+redis_cache = aioredis.Redis(host=config.REDIS_HOST, port=config.REDIS_PORT, db=config.REDIS_CACHE_DB)
+
+redis_queue = aioredis.Redis(host=config.REDIS_HOST, port=config.REDIS_PORT, db=config.REDIS_QUEUE_DB)
+
 
 async def get_db():
     async with SessionLocal() as db:
@@ -18,3 +22,7 @@ async def get_db():
 
 async def get_redis() -> aioredis:
     return redis_tokens
+
+
+async def get_redis_queue() -> aioredis:
+    return redis_queue
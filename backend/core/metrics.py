@@ -0,0 +1,54 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Sequence
+
+_registered_latency_stats: List["LatencyStats"] = []
+
+
+def _percentile(sorted_samples: Sequence[float], percent: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * percent / 100))]
+
+
+class LatencyStats:
+    def __init__(self, name: str, window_size: int = 1024):
+        self.name = name
+        self.count = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rejected = 0
+        self._recent = deque(maxlen=window_size)
+        _registered_latency_stats.append(self)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self._recent.append(seconds)
+
+    @contextmanager
+    def measure(self):
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at)
+
+    def stats(self) -> Dict[str, int | float]:
+        """Percentiles are computed over the most recent samples only"""
+        recent = sorted(self._recent)
+        p50, p95 = _percentile(recent, 50), _percentile(recent, 95)
+        return {
+            "count": self.count,
+            "rejected": self.rejected,
+            "avg_ms": round(self.total_seconds / self.count * 1000, 2) if self.count else 0.0,
+            "p50_ms": round(p50 * 1000, 2),
+            "p95_ms": round(p95 * 1000, 2),
+            "max_ms": round(self.max_seconds * 1000, 2),
+        }
+
+
+def get_latency_stats() -> Dict[str, Dict[str, int | float]]:
+    return {latency.name: latency.stats() for latency in _registered_latency_stats}
@@ -0,0 +1,78 @@
+from typing import List
+
+import redis.asyncio as aioredis
+
+"""Redis list queue whose taken ids stay in a processing list under a lease until they are done
+
+Ids are moved and leased, or unleased and queued again, by one Lua script, so another process never sees an id
+in the processing list without its lease and an id is never out of both lists. Lease keys are built in the scripts
+from the prefix, which is fine on a single Redis instance.
+"""
+
+CLAIM_SCRIPT = """
+local claimed = {}
+for _ = 1, tonumber(ARGV[3]) do
+    local item_id = redis.call('LMOVE', KEYS[1], KEYS[2], 'RIGHT', 'LEFT')
+    if not item_id then
+        break
+    end
+    redis.call('SET', ARGV[1] .. item_id, 1, 'EX', ARGV[2])
+    claimed[#claimed + 1] = item_id
+end
+return claimed
+"""
+
+REQUEUE_SCRIPT = """
+local requeued = {}
+for i = 3, #ARGV do
+    local item_id = ARGV[i]
+    local lease_key = ARGV[1] .. item_id
+    if (ARGV[2] == '0' or redis.call('EXISTS', lease_key) == 0) and redis.call('LREM', KEYS[1], 1, item_id) > 0 then
+        redis.call('DEL', lease_key)
+        redis.call('RPUSH', KEYS[2], item_id)
+        requeued[#requeued + 1] = item_id
+    end
+end
+return requeued
+"""
+
+
+async def claim(
+    redis: aioredis.Redis,
+    queue_key: str,
+    processing_key: str,
+    lease_key_prefix: str,
+    lease_seconds: int,
+    count: int,
+    timeout: int,
+) -> List[str]:
+    """Up to count ids from the head of the queue, empty when the queue stayed empty or other workers took them
+
+    Scripts cannot block, so the wait is a BLMOVE of the queue onto itself, which leaves the queue unchanged.
+    """
+    if not await redis.blmove(queue_key, queue_key, timeout, "RIGHT", "RIGHT"):
+        return []
+    claimed = await redis.register_script(CLAIM_SCRIPT)(
+        keys=[queue_key, processing_key], args=[lease_key_prefix, lease_seconds, count]
+    )
+    return [item_id.decode() for item_id in claimed]
+
+
+async def requeue(
+    redis: aioredis.Redis,
+    processing_key: str,
+    queue_key: str,
+    lease_key_prefix: str,
+    item_ids: List[str],
+    only_abandoned: bool = False,
+) -> List[str]:
+    """Moves ids still in the processing list back to the head of the queue, the last id becomes the next one taken
+
+    With only_abandoned, ids whose lease is still renewed are left to their worker.
+    """
+    if not item_ids:
+        return []
+    requeued = await redis.register_script(REQUEUE_SCRIPT)(
+        keys=[processing_key, queue_key], args=[lease_key_prefix, int(only_abandoned), *item_ids]
+    )
+    return [item_id.decode() for item_id in requeued]
@@ -0,0 +1,32 @@
+from fastapi.params import Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.core.database import get_db
+
+
+class UnitOfWork:
+    """Writes of one mutation share the request session and are committed once, when the outermost block exits
+
+    Repositories only flush, so services calling each other inside their blocks still end in a single commit.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._depth = 0
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._depth += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self._depth -= 1
+        if self._depth:
+            return
+        if exc_type is None:
+            await self.db.commit()
+        else:
+            await self.db.rollback()
+
+
+async def get_unit_of_work(db: AsyncSession = Depends(get_db)) -> UnitOfWork:
+    return UnitOfWork(db)
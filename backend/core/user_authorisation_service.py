@@ -15,6 +15,7 @@ from itsdangerous import (
     URLSafeTimedSerializer,
 )
 
+from backend.core.cache import LocalLRUCache
 from backend.core.logger import logger
 from backend.core.security import oauth2_scheme
 from backend.core.value_error_exception import ValueErrorException
@@ -23,6 +24,9 @@ from backend.users.enums.token import Token
 from backend.users.mappers import decoded_token_to_payload
 from backend.users.schemas import RefreshTokensResponse, TokenPayload
 
+# JTIs known to be revoked, lets this process reject them without asking Redis
+revoked_tokens = LocalLRUCache[bool](config.REVOKED_TOKENS_LOCAL_MAX_SIZE, config.REFRESH_TOKEN_EXPIRE_HOURS * 3600)
+
 
 class AuthorizationService:
     def __init__(self, redis: aioredis):
@@ -80,6 +84,8 @@ class AuthorizationService:
                 Token.REVOKED.value,
             )
             await pipe.execute()
+        revoked_tokens.set(token_jti, True)
+        revoked_tokens.set(linked_token_jti, True)
 
     async def refresh_tokens(
         self,
@@ -132,8 +138,17 @@ class AuthorizationService:
                 detail=f"Invalid token type. Expected {expected_type}.",
             )
 
+        token_jtis = [jti for jti in (token_payload.jti, token_payload.linked_jti) if jti]
+        if any(revoked_tokens.get(jti) for jti in token_jtis):
+            raise self._revoked_token_exception(token_payload.type)
+
         redis_key = token_payload.jti if expected_type == Token.REFRESH.value else token_payload.linked_jti
-        stored_token = await self.redis.get(redis_key)
+        # Stored token and blacklist entries are read in one atomic round trip
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.get(redis_key)
+            for jti in token_jtis:
+                pipe.exists(f"blacklist:{jti}")
+            stored_token, *revoked_results = await pipe.execute()
 
         if not stored_token:
             logger.debug("Invalid token")
@@ -143,23 +158,22 @@ class AuthorizationService:
                 detail="Invalid token",
             )
 
-        async with self.redis.pipeline() as pipe:
-            pipe.exists(f"blacklist:{token_payload.jti}")
-            if token_payload.linked_jti:
-                pipe.exists(f"blacklist:{token_payload.linked_jti}")
-            revoked_results = await pipe.execute()
-
         if any(revoked_results):
-            logger.debug("Revoked token")
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED
-                if Token.ACCESS.value == token_payload.type
-                else status.HTTP_403_FORBIDDEN,
-                detail="Revoked token",
-            )
+            for jti, revoked in zip(token_jtis, revoked_results):
+                if revoked:
+                    revoked_tokens.set(jti, True)
+            raise self._revoked_token_exception(token_payload.type)
 
         return token_payload
 
+    @staticmethod
+    def _revoked_token_exception(token_type: Token) -> HTTPException:
+        logger.debug("Revoked token")
+        return HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED if Token.ACCESS.value == token_type else status.HTTP_403_FORBIDDEN,
+            detail="Revoked token",
+        )
+
     async def get_payload_from_token(
         self,
         token_type: str = None,
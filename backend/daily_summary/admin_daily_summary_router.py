@@ -51,7 +51,7 @@ async def add_daily_meals(
     "/macros/{day}",
     response_model=DailyMacrosSummaryCreate,
     summary="Get daily macros summary",
-    description="Retrieves the macronutrient summary for the specified day for the current user.",
+    description="Retrieves the macronutrients eaten on the specified day by the current user.",
 )
 async def get_daily_macros_summary(
     request: Request,
@@ -63,23 +63,6 @@ async def get_daily_macros_summary(
     return await diet_service.get_daily_macros_summary(user.id, day)
 
 
-@admin_daily_summary_router.post(
-    "/macros",
-    status_code=status.HTTP_201_CREATED,
-    response_model=DailyMacrosSummaryCreate,
-    summary="Add daily macros summary",
-    description="Creates a new daily macronutrient summary record for the current user.",
-)
-async def add_daily_macros_summary(
-    request: Request,
-    daily_summary: DailyMacrosSummaryCreate,
-    daily_summary_service: DailySummaryService = Depends(get_daily_summary_service),
-    user_gateway: UserGateway = Depends(get_user_gateway),
-):
-    user, _ = await user_gateway.get_current_user()
-    return await daily_summary_service.add_daily_macros_summary(user.id, daily_summary)
-
-
 @admin_daily_summary_router.get(
     "/meal/{meal_id}",
     response_model=MealCreate,
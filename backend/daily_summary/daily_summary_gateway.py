@@ -1,12 +1,12 @@
 from datetime import date
-from typing import List, Type
+from typing import Dict, List, Type
 from uuid import UUID
 
 from fastapi import Depends
 
 from backend.daily_summary.daily_summary_service import DailySummaryService
 from backend.daily_summary.dependencies import get_daily_summary_service
-from backend.daily_summary.schemas import DailyMacrosSummaryCreate, DailyMealsCreate
+from backend.daily_summary.schemas import DailyMealsCreate, Macros
 from backend.models import User
 
 
@@ -23,12 +23,12 @@ class DailySummaryGateway:
     async def add_daily_meals(self, daily_meals_data: DailyMealsCreate, user_id: UUID):
         await self.daily_summary_service.add_daily_meals(daily_meals_data, user_id)
 
-    async def add_daily_macros_summary(self, user_id: UUID, data: DailyMacrosSummaryCreate):
-        await self.daily_summary_service.add_daily_macros_summary(user_id, data)
-
     async def get_daily_macros_summary(self, user_id: UUID, day: date):
         return await self.daily_summary_service.get_daily_macros_summary(user_id, day)
 
+    async def get_eaten_macros(self, user_id: UUID, from_day: date, to_day: date) -> Dict[date, Macros]:
+        return await self.daily_summary_service.get_eaten_macros(user_id, from_day, to_day)
+
 
 def get_daily_summary_gateway(
     daily_summary_service: DailySummaryService = Depends(get_daily_summary_service),
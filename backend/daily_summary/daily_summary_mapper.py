@@ -1,9 +1,17 @@
+from typing import Any, Dict, Sequence
+
+from sqlalchemy import Row
+
 from backend.daily_summary.schemas import (
     DailyMealTypesSummaryWithItems,
     DailyMealTypeSummary,
+    DailySummaryDTO,
+    Meal,
+    MealInfoWithIconPath,
     MealTypeDailySummaryBase,
     MealTypeDailySummaryWithItems,
 )
+from backend.meals.enums.meal_type import MealType
 from backend.models import DailySummary
 
 
@@ -54,3 +62,59 @@ class DailySummaryMapper:
             target_fat=daily_summary.target_fat,
             map_meal_type_daily_summaries=meal_type_daily_summaries,
         )
+
+    @staticmethod
+    def map_meal_info_row(row: Row[Any]) -> MealInfoWithIconPath:
+        has_recipe = row.is_generated and row.recipe_name is not None
+        return MealInfoWithIconPath(
+            meal_id=row.meal_id,
+            status=row.status,
+            name=row.recipe_name if has_recipe else row.meal_name,
+            description=row.recipe_description if has_recipe else None,
+            explanation=row.recipe_explanation if has_recipe else None,
+            icon_path=row.icon_path,
+            calories=int(row.calories),
+            protein=float(row.protein),
+            carbs=float(row.carbs),
+            fat=float(row.fat),
+            unit_weight=int(row.weight),
+            planned_calories=row.planned_calories,
+            planned_protein=row.planned_protein,
+            planned_carbs=row.planned_carbs,
+            planned_fat=row.planned_fat,
+            planned_weight=row.planned_weight,
+        )
+
+    @staticmethod
+    def map_daily_summary_rows(rows: Sequence[Row[Any]], is_out_dated: bool) -> DailySummaryDTO:
+        summary = rows[0]
+        meals: Dict[MealType, Meal] = {}
+        generated_meals: Dict[MealType, MealInfoWithIconPath] = {}
+
+        for row in rows:
+            if row.meal_type is None:
+                continue
+            meal = meals.setdefault(row.meal_type, Meal(meal_items=[], status=row.status))
+            if row.meal_id is None:
+                continue
+
+            meal_info = DailySummaryMapper.map_meal_info_row(row)
+            if row.is_active:
+                meal.meal_items.append(meal_info)
+            if row.is_generated and row.meal_type not in generated_meals:
+                generated_meals[row.meal_type] = meal_info
+
+        return DailySummaryDTO(
+            day=summary.day,
+            meals=meals,
+            target_calories=summary.target_calories,
+            target_protein=summary.target_protein,
+            target_carbs=summary.target_carbs,
+            target_fat=summary.target_fat,
+            eaten_calories=summary.eaten_calories,
+            eaten_protein=summary.eaten_protein,
+            eaten_carbs=summary.eaten_carbs,
+            eaten_fat=summary.eaten_fat,
+            is_out_dated=is_out_dated,
+            generated_meals=generated_meals,
+        )
@@ -4,9 +4,11 @@ from uuid import UUID
 
 from backend.core.logger import logger
 from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
+from backend.core.unit_of_work import UnitOfWork
 from backend.daily_summary.composed_meal_items_service import ComposedMealItemsService
 from backend.daily_summary.daily_summary_mapper import DailySummaryMapper
 from backend.daily_summary.enums.meal_status import MealStatus
+from backend.daily_summary.repositories.daily_summary_read_repository import DailySummaryReadRepository
 from backend.daily_summary.repositories.daily_summary_repository import DailySummaryRepository
 from backend.daily_summary.repositories.last_generated_meals_repository import LastGeneratedMealsRepository
 from backend.daily_summary.repositories.meal_type_daily_summary_repository import MealTypeDailySummaryRepository
@@ -15,7 +17,6 @@ from backend.daily_summary.schemas import (
     ComposedMealUpdateRequest,
     DailyMacrosSummaryCreate,
     DailyMealsCreate,
-    DailySummaryDTO,
     Macros,
     Meal,
     MealInfoUpdateRequest,
@@ -41,6 +42,8 @@ class DailySummaryService:
         composed_meal_items_service: ComposedMealItemsService,
         meal_gateway: MealGateway,
         user_details_gateway: UserDetailsGateway,
+        daily_summary_read_repository: DailySummaryReadRepository,
+        unit_of_work: UnitOfWork,
     ):
         self.daily_summary_repository = summary_repository
         self.meal_type_daily_summary_repository = meal_type_daily_summary_repository
@@ -49,33 +52,27 @@ class DailySummaryService:
         self.composed_meal_items_service = composed_meal_items_service
         self.meal_gateway = meal_gateway
         self.user_details_gateway = user_details_gateway
+        self.daily_summary_read_repository = daily_summary_read_repository
+        self.unit_of_work = unit_of_work
 
     async def get_daily_summary(self, user: Type[User], day: date):
-        daily_meals = await self.daily_summary_repository.get_daily_summary(user.id, day)
-        if not daily_meals:
+        rows = await self.daily_summary_read_repository.get_daily_summary_rows(user.id, day, user.language)
+        if not rows:
             logger.debug(f"No daily meals for {day} for user {user.id}")
             raise NotFoundInDatabaseException("Plan for given user and day does not exist.")
 
-        meals_dict = await self.fetch_daily_meals(daily_meals, user)
-        generated_meals_dict = await self.fetch_generated_meals(daily_meals, user)
-        macros_summary = await self.get_daily_macros_summary(user.id, day)
-        last_diet_prediction = await self.user_details_gateway.get_date_of_last_update_user_calories_prediction(user)
-        last_user_details = await self.user_details_gateway.get_date_of_last_update_user_details(user)
+        summary = rows[0]
+        if summary.last_prediction_update is None:
+            logger.debug(f"No date of last update calories predictions the user: {user.id}.")
+            raise NotFoundInDatabaseException("No date of last update calories predictions the user.")
+        if summary.last_details_update is None:
+            logger.debug(f"No last update date for user {user.id}")
+            raise NotFoundInDatabaseException("No date in database of last user details update.")
 
-        return DailySummaryDTO(
-            day=daily_meals.day,
-            meals=meals_dict,
-            target_calories=daily_meals.target_calories,
-            target_protein=daily_meals.target_protein,
-            target_carbs=daily_meals.target_carbs,
-            target_fat=daily_meals.target_fat,
-            eaten_calories=macros_summary.calories,
-            eaten_protein=macros_summary.protein,
-            eaten_carbs=macros_summary.carbs,
-            eaten_fat=macros_summary.fat,
-            is_out_dated=await self.is_diet_out_dated(daily_meals, last_diet_prediction, last_user_details),
-            generated_meals=generated_meals_dict,
+        is_out_dated = await self.is_diet_out_dated(
+            summary, summary.last_prediction_update, summary.last_details_update
         )
+        return DailySummaryMapper.map_daily_summary_rows(rows, is_out_dated)
 
     @classmethod
     async def is_diet_out_dated(cls, daily_meals, last_diet_prediction, last_user_details):
@@ -122,47 +119,15 @@ class DailySummaryService:
             meals_dict[link.meal_type] = Meal(meal_items=meal_items_info, status=link.status)
         return meals_dict
 
-    async def fetch_generated_meals(self, daily_meals, user):
-        meals_dict: Dict[MealType, MealInfoWithIconPath] = {}
-        for link in daily_meals.daily_meals:
-            meal_items_info = await self.find_generated_meal(link, user)
-            if meal_items_info:
-                meals_dict[link.meal_type] = meal_items_info
-        return meals_dict
-
-    async def find_generated_meal(self, link, user):
-        for item in link.meal_items:
-            meal = item.meal
-            if meal and meal.is_generated:
-                recipe = await self.meal_gateway.get_meal_recipe_by_meal_and_language_safe(meal.id, user.language)
-
-                return MealInfoWithIconPath(
-                    meal_id=meal.id,
-                    status=link.status,
-                    name=recipe.meal_name,
-                    description=recipe.meal_description,
-                    explanation=recipe.meal_explanation,
-                    icon_path=await self.meal_gateway.get_meal_icon_path_by_id(meal.icon_id),
-                    calories=int(meal.calories),
-                    protein=float(meal.protein),
-                    carbs=float(meal.carbs),
-                    fat=float(meal.fat),
-                    unit_weight=int(meal.weight),
-                    planned_weight=item.planned_weight,
-                    planned_calories=item.planned_calories,
-                    planned_protein=item.planned_protein,
-                    planned_carbs=item.planned_carbs,
-                    planned_fat=item.planned_fat,
-                )
-
     async def add_daily_meals(self, daily_meals_data: DailyMealsCreate, user_id: UUID):
         daily_meals = await self.daily_summary_repository.get_daily_meals_summary_with_recipes(
             user_id, daily_meals_data.day
         )
-        if daily_meals:
-            await self.daily_summary_repository.remove_daily_meals_summary(daily_meals.id)
+        async with self.unit_of_work:
+            if daily_meals:
+                await self.daily_summary_repository.remove_daily_meals_summary(daily_meals.id)
 
-        await self.daily_summary_repository.add_daily_meals_summary(daily_meals_data, user_id)
+            await self.daily_summary_repository.add_daily_meals_summary(daily_meals_data, user_id)
 
         daily_meals = await self.daily_summary_repository.get_daily_meals_summary_with_recipes(
             user_id, daily_meals_data.day
@@ -226,18 +191,22 @@ class DailySummaryService:
             target_fat=daily_meals.target_fat,
         )
 
-    async def add_daily_macros_summary(self, user_id: UUID, data: DailyMacrosSummaryCreate):
-        daily_macros_summary = await self.daily_summary_repository.get_daily_macros_summary(user_id, data.day)
-        if daily_macros_summary:
-            return await self.daily_summary_repository.update_daily_macros_summary(user_id, data, data.day)
-        return await self.daily_summary_repository.add_daily_macros_summary(data, user_id)
-
-    async def get_daily_macros_summary(self, user_id: UUID, day: date):
-        macros_summary = await self.daily_summary_repository.get_daily_macros_summary(user_id, day)
-        if not macros_summary:
+    async def get_daily_macros_summary(self, user_id: UUID, day: date) -> DailyMacrosSummaryCreate:
+        """Eaten macros of the day derived from its eaten meal items, like the daily summary"""
+        eaten_macros = await self.get_eaten_macros(user_id, day, day)
+        if day not in eaten_macros:
             logger.debug(f"No plan for {day} for user {user_id}")
             raise NotFoundInDatabaseException("Plan for given user and day does not exist.")
-        return macros_summary
+        return DailyMacrosSummaryCreate(day=day, **eaten_macros[day].model_dump())
+
+    async def get_eaten_macros(self, user_id: UUID, from_day: date, to_day: date) -> Dict[date, Macros]:
+        rows = await self.daily_summary_read_repository.get_eaten_macros(user_id, from_day, to_day)
+        return {
+            row.day: Macros(
+                calories=int(row.calories), protein=float(row.protein), carbs=float(row.carbs), fat=float(row.fat)
+            )
+            for row in rows
+        }
 
     async def get_last_generated_meals(self, user_id: UUID, from_date: date, to_date: date) -> List[str]:
         return await self.last_generated_meals_repo.get_last_generated_meals(user_id, from_date, to_date)
@@ -272,19 +241,27 @@ class DailySummaryService:
             fat=float(sum(m.planned_fat for m in active_meals)),
         )
 
-        updated_meal_type_daily_summary = await self.meal_type_daily_summary_repository.update_meal_type_status(
-            processing_meal_type_summary.daily_summary_id, new_status
-        )
-        if updated_meal_type_daily_summary:
-            await self._update_macros_after_status_change(user.id, meal_macros, day, new_status, previous_status)
+        meal_type_daily_summary_id = processing_meal_type_summary.daily_summary_id
+        async with self.unit_of_work:
+            updated_meal_type_daily_summary = await self.meal_type_daily_summary_repository.update_meal_type_status(
+                meal_type_daily_summary_id, new_status, previous_status
+            )
+            while not updated_meal_type_daily_summary:
+                # A concurrent request changed the status after the plan was read, the change is applied over it
+                previous_status = await self.meal_type_daily_summary_repository.get_meal_type_status(
+                    meal_type_daily_summary_id
+                )
+                if previous_status is None:
+                    return None
+                updated_meal_type_daily_summary = await self.meal_type_daily_summary_repository.update_meal_type_status(
+                    meal_type_daily_summary_id, new_status, previous_status
+                )
 
             map_meal_type_daily_summaries = daily_meal_type_summary_with_items.map_meal_type_daily_summaries
             processing_meal_type_summary.status = updated_meal_type_daily_summary.status
 
             await self._update_next_meals_status(map_meal_type_daily_summaries)
-
-            return meal_macros
-        return None
+        return meal_macros
 
     async def edit_meal(self, user: Type[User], update_meal_request: ComposedMealUpdateRequest) -> ComposedMealItem:
         return await self.composed_meal_items_service.edit_meal(user, update_meal_request)
@@ -292,6 +269,11 @@ class DailySummaryService:
     async def add_custom_meal(self, user: Type[User], custom_meal: ComposedMealUpdateRequest) -> ComposedMealItem:
         return await self.composed_meal_items_service.add_composed_meal(user, custom_meal)
 
+    async def add_custom_meals(
+        self, user: Type[User], day: date, meal_type: MealType, custom_meals: List[ComposedMealUpdateRequest]
+    ) -> List[ComposedMealItem]:
+        return await self.composed_meal_items_service.add_composed_meals(user, day, meal_type, custom_meals)
+
     async def remove_meal_from_summary(self, user: Type[User], meal_to_remove: RemoveMealRequest):
         day = meal_to_remove.day
         meal_type = meal_to_remove.meal_type
@@ -304,25 +286,14 @@ class DailySummaryService:
             logger.debug(f"No plan for {day} for user {user.id}")
             raise NotFoundInDatabaseException("Plan for given user and day does not exist.")
 
-        composed_meal_item, removed = await self.composed_meal_items_service.remove_composed_meal(user.id, meal_id)
-
-        if not removed:
-            logger.debug(f"Meal with id {meal_id} does not exist for type {meal_type}, user {user.id} and day {day}")
-            raise NotFoundInDatabaseException("Selected meal not assigned to selected meal type.")
+        async with self.unit_of_work:
+            _, removed = await self.composed_meal_items_service.remove_composed_meal(user.id, meal_id)
 
-        if meal_type_daily_summary.meal_type_details.status == MealStatus.EATEN:
-            macros_to_subtract = DailyMacrosSummaryCreate(
-                day=day,
-                calories=(-1) * composed_meal_item.planned_calories,
-                protein=(-1) * composed_meal_item.planned_protein,
-                carbs=(-1) * composed_meal_item.planned_carbs,
-                fat=(-1) * composed_meal_item.planned_fat,
-            )
-
-            updated_macros = await self._update_daily_macros_summary(user.id, macros_to_subtract)
-            if not updated_macros:
-                logger.debug(f"Failed to update macros summary after removing meal {meal_id}")
-                raise NotFoundInDatabaseException("Failed to update macros summary after removing meal.")
+            if not removed:
+                logger.debug(
+                    f"Meal with id {meal_id} does not exist for type {meal_type}, user {user.id} and day {day}"
+                )
+                raise NotFoundInDatabaseException("Selected meal not assigned to selected meal type.")
 
         return RemoveMealResponse(day=day, meal_type=meal_type, meal_id=meal_id, success=True)
 
@@ -369,58 +340,22 @@ class DailySummaryService:
             "carbs": carbs,
         }
 
-    async def _update_daily_macros_summary(self, user_id: UUID, data: DailyMacrosSummaryCreate):
-        user_daily_macros = await self.daily_summary_repository.get_daily_macros_summary(user_id, data.day)
-        if not user_daily_macros:
-            logger.debug(f"No plan for {data.day} for user {user_id}")
-            raise NotFoundInDatabaseException("Plan for given user and day does not exist.")
-
-        data.calories += user_daily_macros.calories
-        data.protein += user_daily_macros.protein
-        data.carbs += user_daily_macros.carbs
-        data.fat += user_daily_macros.fat
-
-        await self.daily_summary_repository.update_daily_macros_summary(user_id, data, data.day)
-        return user_daily_macros
-
-    async def _update_macros_after_status_change(
-        self, user_id: UUID, macros: Macros, day: date, status: MealStatus, previous_status: MealStatus
-    ):
-        multiplier = 0
-
-        if status == MealStatus.EATEN and previous_status != MealStatus.EATEN:
-            multiplier = 1
-        elif status != MealStatus.EATEN and previous_status == MealStatus.EATEN:
-            multiplier = -1
-
-        if multiplier == 0:
-            return
-
-        data = DailyMacrosSummaryCreate(
-            day=day,
-            calories=macros.calories * multiplier,
-            protein=macros.protein * multiplier,
-            carbs=macros.carbs * multiplier,
-            fat=macros.fat * multiplier,
-        )
-
-        await self._update_daily_macros_summary(user_id, data)
-
     async def _update_next_meals_status(self, map_meal_type_daily_summaries: dict[MealType, MealTypeDailySummaryBase]):
         target_pending_meal = await self._find_target_pending_meal(map_meal_type_daily_summaries)
 
+        # Conditional updates, a meal eaten or skipped by a concurrent request is not put back to eat
         if target_pending_meal:
-            target_pending_meal.status = MealStatus.PENDING
             await self.meal_type_daily_summary_repository.update_meal_type_status(
-                target_pending_meal.daily_summary_id, MealStatus.PENDING
+                target_pending_meal.daily_summary_id, MealStatus.PENDING, target_pending_meal.status
             )
+            target_pending_meal.status = MealStatus.PENDING
 
         for link in map_meal_type_daily_summaries.values():
             if link.status == MealStatus.PENDING and link != target_pending_meal:
-                link.status = MealStatus.TO_EAT
                 await self.meal_type_daily_summary_repository.update_meal_type_status(
-                    link.daily_summary_id, MealStatus.TO_EAT
+                    link.daily_summary_id, MealStatus.TO_EAT, MealStatus.PENDING
                 )
+                link.status = MealStatus.TO_EAT
 
     @staticmethod
     async def _find_target_pending_meal(map_meal_type_daily_summaries: dict[MealType, MealTypeDailySummaryBase]):
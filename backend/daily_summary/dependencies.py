@@ -2,9 +2,11 @@ from fastapi.params import Depends
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.core.database import get_db
+from backend.core.unit_of_work import UnitOfWork, get_unit_of_work
 from backend.daily_summary.composed_meal_items_service import ComposedMealItemsService
 from backend.daily_summary.daily_summary_service import DailySummaryService
 from backend.daily_summary.repositories.composed_meal_items_repository import ComposedMealItemsRepository
+from backend.daily_summary.repositories.daily_summary_read_repository import DailySummaryReadRepository
 from backend.daily_summary.repositories.daily_summary_repository import DailySummaryRepository
 from backend.daily_summary.repositories.last_generated_meals_repository import LastGeneratedMealsRepository
 from backend.daily_summary.repositories.meal_type_daily_summary_repository import MealTypeDailySummaryRepository
@@ -26,6 +28,12 @@ async def get_daily_summary_repository(
     return DailySummaryRepository(db)
 
 
+async def get_daily_summary_read_repository(
+    db: AsyncSession = Depends(get_db),
+) -> DailySummaryReadRepository:
+    return DailySummaryReadRepository(db)
+
+
 async def get_meal_type_daily_summary_repository(
     db: AsyncSession = Depends(get_db),
 ) -> MealTypeDailySummaryRepository:
@@ -42,11 +50,13 @@ async def get_composed_meal_items_service(
     daily_summary_repository: DailySummaryRepository = Depends(get_daily_summary_repository),
     composed_meal_items_repository: ComposedMealItemsRepository = Depends(get_composed_meal_items_repository),
     meal_gateway: MealGateway = Depends(get_meal_gateway),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
 ) -> ComposedMealItemsService:
     return ComposedMealItemsService(
         daily_summary_repository,
         composed_meal_items_repository,
         meal_gateway,
+        unit_of_work,
     )
 
 
@@ -60,6 +70,8 @@ async def get_daily_summary_service(
     composed_meal_items_service: ComposedMealItemsService = Depends(get_composed_meal_items_service),
     meal_gateway: MealGateway = Depends(get_meal_gateway),
     user_details_gateway: UserDetailsGateway = Depends(get_user_details_gateway),
+    daily_summary_read_repository: DailySummaryReadRepository = Depends(get_daily_summary_read_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
 ) -> DailySummaryService:
     return DailySummaryService(
         daily_summary_repository,
@@ -69,4 +81,6 @@ async def get_daily_summary_service(
         composed_meal_items_service,
         meal_gateway,
         user_details_gateway,
+        daily_summary_read_repository,
+        unit_of_work,
     )
@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+from datetime import date, timedelta
+from uuid import UUID
+
+from sqlalchemy import func, or_, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.core.database import SessionLocal
+from backend.core.logger import logger
+from backend.daily_summary.repositories.daily_summary_read_repository import eaten_macros_of
+from backend.models import DailyMacrosSummary
+from backend.models.daily_summary_model import DailySummary
+
+"""Rebuilds daily macros summaries of a date range from the eaten composed meal items, their only writer"""
+
+MACROS = ["calories", "protein", "carbs", "fat"]
+
+
+def reconcile_statement(from_day: date, to_day: date, user_id: UUID | None = None):
+    """One INSERT ... SELECT for the whole range, rows which already match the eaten items are left untouched"""
+    eaten = eaten_macros_of(DailySummary.id).lateral("eaten")
+    days = (
+        select(
+            func.gen_random_uuid(),
+            DailySummary.user_id,
+            DailySummary.day,
+            *[getattr(eaten.c, macro) for macro in MACROS],
+        )
+        .select_from(DailySummary)
+        .join(eaten, true())
+        .where(DailySummary.day.between(from_day, to_day))
+    )
+    if user_id is not None:
+        days = days.where(DailySummary.user_id == user_id)
+
+    statement = insert(DailyMacrosSummary).from_select(["id", "user_id", "day", *MACROS], days)
+    return statement.on_conflict_do_update(
+        index_elements=[DailyMacrosSummary.day, DailyMacrosSummary.user_id],
+        set_={**{macro: statement.excluded[macro] for macro in MACROS}, "updated_at": func.now()},
+        where=or_(
+            *[getattr(DailyMacrosSummary, macro).is_distinct_from(statement.excluded[macro]) for macro in MACROS]
+        ),
+    )
+
+
+async def reconcile_daily_macros(db: AsyncSession, from_day: date, to_day: date, user_id: UUID | None = None) -> int:
+    """Returns the number of created or corrected summaries"""
+    result = await db.execute(reconcile_statement(from_day, to_day, user_id))
+    await db.commit()
+    return result.rowcount
+
+
+async def run(from_day: date, to_day: date, user_id: UUID | None = None) -> int:
+    async with SessionLocal() as db:
+        return await reconcile_daily_macros(db, from_day, to_day, user_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily macros summaries from the eaten meals")
+    parser.add_argument("--from-day", type=date.fromisoformat, default=date.today() - timedelta(days=7))
+    parser.add_argument("--to-day", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--user-id", type=UUID)
+    args = parser.parse_args()
+    reconciled = asyncio.run(run(args.from_day, args.to_day, args.user_id))
+    logger.info(f"Daily macros reconciled from {args.from_day} to {args.to_day}, {reconciled} summaries changed")
+
+
+if __name__ == "__main__":
+    main()
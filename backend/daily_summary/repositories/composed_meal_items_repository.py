@@ -1,3 +1,4 @@
+from typing import List
 from uuid import UUID
 
 from sqlalchemy import select, update
@@ -5,6 +6,7 @@ from sqlalchemy.orm import selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.daily_summary.schemas import ComposedMealItemUpdateEntity
+from backend.models import Meal
 from backend.models.composed_meal_item_model import ComposedMealItem
 from backend.models.daily_summary_model import DailySummary
 from backend.models.meal_type_daily_summary import MealTypeDailySummary
@@ -59,10 +61,15 @@ class ComposedMealItemsRepository:
 
     async def add_composed_meal_item(self, composed_meal_item: ComposedMealItem) -> ComposedMealItem:
         self.db.add(composed_meal_item)
-        await self.db.commit()
-        await self.db.refresh(composed_meal_item)
+        await self.db.flush()
         return composed_meal_item
 
+    async def add_custom_meals(self, meals: List[Meal], composed_meal_items: List[ComposedMealItem]):
+        self.db.add_all(meals)
+        await self.db.flush()
+        self.db.add_all(composed_meal_items)
+        await self.db.flush()
+
     async def update_composed_meal_item(
         self, composed_meal_item_id: UUID, update_request: ComposedMealItemUpdateEntity
     ) -> ComposedMealItem | None:
@@ -71,8 +78,7 @@ class ComposedMealItemsRepository:
             update_fields = update_request.model_dump(exclude_unset=True)
             for key, value in update_fields.items():
                 setattr(composed_meal_item, key, value)
-            await self.db.commit()
-            await self.db.refresh(composed_meal_item)
+            await self.db.flush()
             return composed_meal_item
         return None
 
@@ -87,9 +93,4 @@ class ComposedMealItemsRepository:
             .returning(ComposedMealItem.id)
         )
 
-        updated_id = result.scalar_one_or_none()
-        if not updated_id:
-            return False
-
-        await self.db.commit()
-        return True
+        return result.scalar_one_or_none() is not None
@@ -0,0 +1,122 @@
+from datetime import date
+from typing import Any, Sequence
+from uuid import UUID
+
+from sqlalchemy import Row, and_, func, select, true
+from sqlalchemy.orm import aliased
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.daily_summary.enums.meal_status import MealStatus
+from backend.models import MealIcon, MealRecipe, UserDetails, UserDietPredictions
+from backend.models.composed_meal_item_model import ComposedMealItem
+from backend.models.daily_summary_model import DailySummary
+from backend.models.meal_model import Meal
+from backend.models.meal_type_daily_summary import MealTypeDailySummary
+from backend.users.enums.language import Language
+
+
+def eaten_macros_of(daily_summary_id):
+    """Sums of the active items of meal types marked as eaten, the covering index answers it without the table"""
+    cmi = ComposedMealItem
+    mtds = MealTypeDailySummary
+    return (
+        select(
+            func.coalesce(func.sum(cmi.planned_calories), 0).label("calories"),
+            func.coalesce(func.sum(cmi.planned_protein), 0).label("protein"),
+            func.coalesce(func.sum(cmi.planned_carbs), 0).label("carbs"),
+            func.coalesce(func.sum(cmi.planned_fat), 0).label("fat"),
+        )
+        .select_from(mtds)
+        .join(cmi, and_(cmi.meal_type_daily_summary_id == mtds.id, cmi.is_active))
+        .where(mtds.daily_summary_id == daily_summary_id, mtds.status == MealStatus.EATEN)
+    )
+
+
+class DailySummaryReadRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_eaten_macros(self, user_id: UUID, from_day: date, to_day: date) -> Sequence[Row[Any]]:
+        eaten = eaten_macros_of(DailySummary.id).lateral("eaten")
+        query = (
+            select(DailySummary.day, eaten.c.calories, eaten.c.protein, eaten.c.carbs, eaten.c.fat)
+            .select_from(DailySummary)
+            .join(eaten, true())
+            .where(DailySummary.user_id == user_id, DailySummary.day.between(from_day, to_day))
+            .order_by(DailySummary.day)
+        )
+        result = await self.db.execute(query)
+        return result.all()
+
+    async def get_daily_summary_rows(self, user_id: UUID, day: date, language: Language) -> Sequence[Row[Any]]:
+        ds = DailySummary
+        mtds = MealTypeDailySummary
+        cmi = ComposedMealItem
+        eaten = eaten_macros_of(ds.id).lateral("eaten")
+        localized_recipe = aliased(MealRecipe)
+        fallback_recipe = aliased(MealRecipe)
+
+        last_prediction_update = (
+            select(UserDietPredictions.updated_at).where(UserDietPredictions.user_id == user_id).scalar_subquery()
+        )
+        last_details_update = select(UserDetails.updated_at).where(UserDetails.user_id == user_id).scalar_subquery()
+
+        query = (
+            select(
+                ds.day,
+                ds.target_calories,
+                ds.target_protein,
+                ds.target_carbs,
+                ds.target_fat,
+                ds.updated_at,
+                eaten.c.calories.label("eaten_calories"),
+                eaten.c.protein.label("eaten_protein"),
+                eaten.c.carbs.label("eaten_carbs"),
+                eaten.c.fat.label("eaten_fat"),
+                last_prediction_update.label("last_prediction_update"),
+                last_details_update.label("last_details_update"),
+                mtds.meal_type,
+                mtds.status,
+                cmi.is_active,
+                cmi.planned_calories,
+                cmi.planned_protein,
+                cmi.planned_carbs,
+                cmi.planned_fat,
+                cmi.planned_weight,
+                Meal.id.label("meal_id"),
+                Meal.meal_name,
+                Meal.is_generated,
+                Meal.calories,
+                Meal.protein,
+                Meal.carbs,
+                Meal.fat,
+                Meal.weight,
+                MealIcon.icon_path,
+                func.coalesce(localized_recipe.meal_name, fallback_recipe.meal_name).label("recipe_name"),
+                func.coalesce(localized_recipe.meal_description, fallback_recipe.meal_description).label(
+                    "recipe_description"
+                ),
+                func.coalesce(localized_recipe.meal_explanation, fallback_recipe.meal_explanation).label(
+                    "recipe_explanation"
+                ),
+            )
+            .select_from(ds)
+            .join(eaten, true())
+            .outerjoin(mtds, mtds.daily_summary_id == ds.id)
+            .outerjoin(cmi, cmi.meal_type_daily_summary_id == mtds.id)
+            .outerjoin(Meal, Meal.id == cmi.meal_id)
+            .outerjoin(MealIcon, MealIcon.id == Meal.icon_id)
+            .outerjoin(
+                localized_recipe,
+                and_(localized_recipe.meal_id == Meal.id, localized_recipe.language == language),
+            )
+            .outerjoin(
+                fallback_recipe,
+                and_(fallback_recipe.meal_id == Meal.id, fallback_recipe.language == Language.EN),
+            )
+            .where(ds.user_id == user_id, ds.day == day)
+            .order_by(mtds.created_at, cmi.created_at)
+        )
+
+        result = await self.db.execute(query)
+        return result.all()
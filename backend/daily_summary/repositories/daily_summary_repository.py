@@ -1,19 +1,17 @@
 from datetime import date
 from uuid import UUID
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, select
 from sqlalchemy.orm import contains_eager, joinedload, selectinload
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
 from backend.daily_summary.schemas import (
-    DailyMacrosSummaryCreate,
     DailyMealsCreate,
     MealInfo,
 )
 from backend.meals.enums.meal_type import MealType
 from backend.models.composed_meal_item_model import ComposedMealItem
-from backend.models.daily_macros_summary_model import DailyMacrosSummary
 from backend.models.daily_summary_model import DailySummary
 from backend.models.meal_model import Meal
 from backend.models.meal_type_daily_summary import MealTypeDailySummary
@@ -45,16 +43,15 @@ class DailySummaryRepository:
                 composed_meal = ComposedMealItem(
                     meal_type_daily_summary_id=meal_daily_summary_link.id,
                     meal_id=meal.meal_id,
-                    planned_calories=meal.calories,
-                    planned_protein=meal.protein,
-                    planned_fat=meal.fat,
-                    planned_carbs=meal.carbs,
-                    planned_weight=meal.unit_weight,
+                    planned_calories=meal.planned_calories,
+                    planned_protein=meal.planned_protein,
+                    planned_fat=meal.planned_fat,
+                    planned_carbs=meal.planned_carbs,
+                    planned_weight=meal.planned_weight,
                 )
                 self.db.add(composed_meal)
 
-        await self.db.commit()
-        await self.db.refresh(user_daily_meals)
+        await self.db.flush()
         return user_daily_meals
 
     async def get_daily_summary(self, user_id: UUID, day: date) -> DailySummary | None:
@@ -150,38 +147,7 @@ class DailySummaryRepository:
             await self.db.execute(delete_meal_summary_stmt)
 
         await self.db.delete(daily_summary)
-
-        await self.db.commit()
-
-    async def add_daily_macros_summary(
-        self, daily_summary_data: DailyMacrosSummaryCreate, user_id: UUID
-    ) -> DailyMacrosSummary:
-        user_daily_macros_summary = DailyMacrosSummary(user_id=user_id, **daily_summary_data.model_dump())
-
-        self.db.add(user_daily_macros_summary)
-        await self.db.commit()
-        await self.db.refresh(user_daily_macros_summary)
-        return user_daily_macros_summary
-
-    async def get_daily_macros_summary(self, user_id: UUID, day: date) -> DailyMacrosSummary | None:
-        query = select(DailyMacrosSummary).where(DailyMacrosSummary.user_id == user_id, DailyMacrosSummary.day == day)
-        result = await self.db.execute(query)
-        return result.scalar_one_or_none()
-
-    async def update_daily_macros_summary(
-        self, user_id: UUID, daily_summary_data: DailyMacrosSummaryCreate, day: date
-    ) -> DailyMacrosSummary | None:
-        user_daily_macros = await self.get_daily_macros_summary(user_id, day)
-        if user_daily_macros:
-            await self.db.execute(
-                update(DailyMacrosSummary)
-                .where(DailyMacrosSummary.user_id == user_id, DailyMacrosSummary.day == day)
-                .values(**daily_summary_data.model_dump())
-            )
-            await self.db.commit()
-            await self.db.refresh(user_daily_macros)
-            return user_daily_macros
-        return None
+        await self.db.flush()
 
     async def add_custom_meal(
         self, user_id: UUID, day: date, meal_type: MealType, meal_info: MealInfo
@@ -213,7 +179,6 @@ class DailySummaryRepository:
                 is_active=True,
             )
             self.db.add(composed_item)
-            await self.db.commit()
-            await self.db.refresh(user_daily_meals_summary)
+            await self.db.flush()
             return user_daily_meals_summary
         return None
@@ -1,5 +1,6 @@
 from uuid import UUID
 
+from sqlalchemy import select, update
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.daily_summary.enums.meal_status import MealStatus
@@ -13,14 +14,22 @@ class MealTypeDailySummaryRepository:
     async def get_meal_type_daily_summary(self, meal_type_daily_summary_id: UUID) -> MealTypeDailySummary | None:
         return await self.db.get(MealTypeDailySummary, meal_type_daily_summary_id)
 
+    async def get_meal_type_status(self, meal_type_daily_summary_id: UUID) -> MealStatus | None:
+        """Read from the database, the session may hold a status another request has changed since"""
+        return await self.db.scalar(
+            select(MealTypeDailySummary.status).where(MealTypeDailySummary.id == meal_type_daily_summary_id)
+        )
+
     async def update_meal_type_status(
-        self, meal_type_daily_summary_id: UUID, new_status: MealStatus
+        self, meal_type_daily_summary_id: UUID, new_status: MealStatus, previous_status: MealStatus
     ) -> MealTypeDailySummary | None:
-        meal_type_daily_summary = await self.get_meal_type_daily_summary(meal_type_daily_summary_id)
-        if meal_type_daily_summary:
-            meal_type_daily_summary.status = new_status
-
-            await self.db.commit()
-            await self.db.refresh(meal_type_daily_summary)
-            return meal_type_daily_summary
-        return None
+        """Only updated while the status is still previous_status, None when a concurrent request changed it first"""
+        statement = (
+            update(MealTypeDailySummary)
+            .where(MealTypeDailySummary.id == meal_type_daily_summary_id)
+            .where(MealTypeDailySummary.status == previous_status)
+            .values(status=new_status)
+            .returning(MealTypeDailySummary)
+        )
+        result = await self.db.execute(statement, execution_options={"populate_existing": True})
+        return result.scalar_one_or_none()
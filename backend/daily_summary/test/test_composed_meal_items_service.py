@@ -0,0 +1,117 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
+from backend.core.unit_of_work import UnitOfWork
+from backend.daily_summary.composed_meal_items_service import ComposedMealItemsService
+from backend.daily_summary.enums.meal_status import MealStatus
+from backend.daily_summary.schemas import ComposedMealUpdateRequest
+from backend.meals.enums.meal_type import MealType
+
+USER = SimpleNamespace(id=uuid.uuid4())
+DAY = date(2025, 5, 20)
+
+
+def make_summary(status: MealStatus):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        user_id=USER.id,
+        day=DAY,
+        target_calories=2000,
+        target_protein=150,
+        target_carbs=250,
+        target_fat=70,
+        daily_meals=[SimpleNamespace(id=uuid.uuid4(), status=status, meal_type=MealType.LUNCH)],
+    )
+
+
+def make_request(name: str, calories: int, protein: float, weight: int) -> ComposedMealUpdateRequest:
+    return ComposedMealUpdateRequest(
+        day=DAY,
+        meal_type=MealType.LUNCH,
+        custom_name=name,
+        custom_calories=calories,
+        custom_protein=protein,
+        custom_carbs=10,
+        custom_fat=5,
+        custom_weight=weight,
+    )
+
+
+@pytest.fixture
+def repositories():
+    return AsyncMock(), AsyncMock()
+
+
+@pytest.fixture
+def unit_of_work():
+    return UnitOfWork(AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_add_composed_meals_saves_all_items_without_touching_macros(repositories, unit_of_work):
+    # Given
+    summary_repository, composed_meal_items_repository = repositories
+    summary = make_summary(MealStatus.EATEN)
+    summary_repository.get_daily_meal_type_summary.return_value = summary
+    service = ComposedMealItemsService(summary_repository, composed_meal_items_repository, AsyncMock(), unit_of_work)
+    requests = [make_request("Yogurt", 120, 8.5, 150), make_request("Bread", 250, 9.25, 100)]
+
+    # When
+    items = await service.add_composed_meals(USER, DAY, MealType.LUNCH, requests)
+
+    # Then
+    meals, saved_items = composed_meal_items_repository.add_custom_meals.await_args.args
+    assert [meal.meal_name for meal in meals] == ["Yogurt", "Bread"]
+    assert [item.meal_id for item in saved_items] == [meal.id for meal in meals]
+    assert {item.meal_type_daily_summary_id for item in items} == {summary.daily_meals[0].id}
+    # Eaten macros are derived from the items, so only the plan is read
+    assert [name for name, _, _ in summary_repository.method_calls] == ["get_daily_meal_type_summary"]
+    service.meal_gateway.add_meal.assert_not_awaited()
+    unit_of_work.db.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_add_composed_meals_rolls_back_when_saving_fails(repositories, unit_of_work):
+    # Given
+    summary_repository, composed_meal_items_repository = repositories
+    summary_repository.get_daily_meal_type_summary.return_value = make_summary(MealStatus.EATEN)
+    composed_meal_items_repository.add_custom_meals.side_effect = NotFoundInDatabaseException("Meal icon not found")
+    service = ComposedMealItemsService(summary_repository, composed_meal_items_repository, AsyncMock(), unit_of_work)
+
+    # When/Then
+    with pytest.raises(NotFoundInDatabaseException):
+        await service.add_composed_meals(USER, DAY, MealType.LUNCH, [make_request("Yogurt", 120, 8.5, 150)])
+    unit_of_work.db.rollback.assert_awaited_once()
+    unit_of_work.db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_add_composed_meal_commits_meal_and_item_once(repositories):
+    # Given
+    summary_repository, composed_meal_items_repository = repositories
+    summary_repository.get_daily_meal_type_summary.return_value = make_summary(MealStatus.EATEN)
+    db = AsyncMock()
+    unit_of_work = UnitOfWork(db)
+
+    async def add_meal(meal):
+        # Meal service joins the same unit of work, like the request scoped dependency does
+        async with unit_of_work:
+            return SimpleNamespace(
+                id=uuid.uuid4(), calories=meal.calories, protein=meal.protein, carbs=10, fat=5, weight=150
+            )
+
+    meal_gateway = AsyncMock()
+    meal_gateway.add_meal.side_effect = add_meal
+    service = ComposedMealItemsService(summary_repository, composed_meal_items_repository, meal_gateway, unit_of_work)
+
+    # When
+    await service.add_composed_meal(USER, make_request("Yogurt", 120, 8.5, 150))
+
+    # Then
+    composed_meal_items_repository.add_composed_meal_item.assert_awaited_once()
+    db.commit.assert_awaited_once()
@@ -0,0 +1,42 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.daily_summary.enums.meal_status import MealStatus
+from backend.daily_summary.repositories.meal_type_daily_summary_repository import MealTypeDailySummaryRepository
+
+
+def compile_executed(db: AsyncMock):
+    statement = db.execute.await_args.args[0]
+    return statement.compile(dialect=postgresql.dialect())
+
+
+@pytest.fixture
+def db():
+    db = AsyncMock()
+    db.execute.return_value = MagicMock()
+    return db
+
+
+@pytest.mark.asyncio
+async def test_status_is_updated_only_while_it_is_the_previous_one(db):
+    # Given
+    meal_type_daily_summary_id = uuid.uuid4()
+    db.execute.return_value.scalar_one_or_none.return_value = None
+
+    # When
+    updated = await MealTypeDailySummaryRepository(db).update_meal_type_status(
+        meal_type_daily_summary_id, MealStatus.EATEN, MealStatus.TO_EAT
+    )
+
+    # Then
+    compiled = compile_executed(db)
+    sql = " ".join(str(compiled).split())
+    assert updated is None
+    assert sql.startswith("UPDATE meal_type_daily_summary SET status=%(status)s")
+    assert "WHERE meal_type_daily_summary.id = %(id_1)s::UUID AND meal_type_daily_summary.status = %(status_1)s" in sql
+    assert "RETURNING meal_type_daily_summary.id" in sql
+    assert compiled.params["id_1"] == meal_type_daily_summary_id
+    assert (compiled.params["status"], compiled.params["status_1"]) == (MealStatus.EATEN, MealStatus.TO_EAT)
@@ -1,17 +1,27 @@
+import asyncio
 import sys
 import uuid
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Dict, List, Tuple
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
 from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
+from backend.core.unit_of_work import UnitOfWork
 from backend.daily_summary.enums.meal_status import MealStatus
-from backend.daily_summary.schemas import DailyMacrosSummaryCreate, MealInfoUpdateRequest, RemoveMealRequest
+from backend.daily_summary.schemas import (
+    DailyMacrosSummaryCreate,
+    Macros,
+    MealInfoUpdateRequest,
+    RemoveMealRequest,
+)
 from backend.meals.enums.meal_type import MealType
 from backend.meals.schemas import MealCreate
 from backend.meals.test.test_data import MEAL_ICON_ID, MEAL_ID
-from backend.models import User
+from backend.models import ComposedMealItem, User
 
 with patch.dict(sys.modules, {"backend.diet_generation.daily_summary_repository": MagicMock()}):
     from backend.daily_summary.daily_summary_service import DailySummaryService
@@ -90,9 +100,6 @@ def mock_daily_summary_repository():
     repo.get_daily_summary = AsyncMock()
     repo.get_daily_meals_summary = AsyncMock()
     repo.get_daily_meals_summary_with_recipes = AsyncMock()
-    repo.get_daily_macros_summary = AsyncMock()
-    repo.add_daily_macros_summary = AsyncMock()
-    repo.update_daily_macros_summary = AsyncMock()
     repo.update_meal_status = AsyncMock()
     repo.update_custom_meal = AsyncMock()
     return repo
@@ -151,6 +158,18 @@ def mock_user_details_gateway():
     return gateway
 
 
+@pytest.fixture
+def mock_daily_summary_read_repository():
+    repo = AsyncMock()
+    repo.get_daily_summary_rows = AsyncMock()
+    return repo
+
+
+@pytest.fixture
+def mock_db():
+    return AsyncMock()
+
+
 @pytest.fixture
 def daily_summary_service(
     mock_daily_summary_repository,
@@ -160,6 +179,8 @@ def daily_summary_service(
     mock_composed_meal_items_service,
     mock_meal_gateway,
     mock_user_details_gateway,
+    mock_daily_summary_read_repository,
+    mock_db,
 ):
     return DailySummaryService(
         mock_daily_summary_repository,
@@ -169,12 +190,125 @@ def daily_summary_service(
         mock_composed_meal_items_service,
         mock_meal_gateway,
         mock_user_details_gateway,
+        mock_daily_summary_read_repository,
+        UnitOfWork(mock_db),
     )
 
 
 user = User(id=uuid.UUID("6ea7ae4d-fc73-4db0-987d-84e8e2bc2a6a"))
 
 
+def make_daily_summary_row(**overrides):
+    updated_at = datetime.now(timezone.utc)
+    row = dict(
+        day=date.today(),
+        target_calories=2000,
+        target_protein=150,
+        target_carbs=250,
+        target_fat=70,
+        updated_at=updated_at,
+        eaten_calories=500,
+        eaten_protein=30,
+        eaten_carbs=60,
+        eaten_fat=15,
+        last_prediction_update=updated_at - timedelta(days=1),
+        last_details_update=updated_at - timedelta(days=1),
+        meal_type=MealType.BREAKFAST,
+        status=MealStatus.TO_EAT,
+        is_active=True,
+        planned_calories=100,
+        planned_protein=10,
+        planned_carbs=20,
+        planned_fat=5,
+        planned_weight=500,
+        meal_id=MEAL_ID,
+        meal_name="Meal name",
+        is_generated=True,
+        calories=100,
+        protein=10,
+        carbs=20,
+        fat=5,
+        weight=500,
+        icon_path="mock_icon_path.png",
+        recipe_name="Recipe name",
+        recipe_description="Recipe description",
+        recipe_explanation="Recipe explanation",
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+@pytest.mark.asyncio
+async def test_get_daily_summary_success(
+    daily_summary_service, mock_daily_summary_read_repository, mock_meal_gateway, mock_user_details_gateway
+):
+    custom_meal_id = uuid.uuid4()
+    mock_daily_summary_read_repository.get_daily_summary_rows.return_value = [
+        make_daily_summary_row(),
+        make_daily_summary_row(meal_id=custom_meal_id, is_generated=False, meal_name="Custom", recipe_name=None),
+        make_daily_summary_row(meal_type=MealType.LUNCH, is_active=False),
+        make_daily_summary_row(meal_type=MealType.DINNER, meal_id=None),
+    ]
+
+    result = await daily_summary_service.get_daily_summary(user=user, day=date.today())
+
+    mock_daily_summary_read_repository.get_daily_summary_rows.assert_awaited_once_with(
+        user.id, date.today(), user.language
+    )
+    mock_meal_gateway.get_meal_recipe_by_meal_and_language_safe.assert_not_awaited()
+    mock_meal_gateway.get_meal_icon_path_by_id.assert_not_awaited()
+    mock_user_details_gateway.get_date_of_last_update_user_details.assert_not_awaited()
+
+    breakfast = result.meals[MealType.BREAKFAST].meal_items
+    assert [item.name for item in breakfast] == ["Recipe name", "Custom"]
+    assert breakfast[0].icon_path == "mock_icon_path.png"
+    assert breakfast[1].description is None
+    assert result.meals[MealType.LUNCH].meal_items == []
+    assert result.meals[MealType.DINNER].meal_items == []
+    assert set(result.generated_meals) == {MealType.BREAKFAST, MealType.LUNCH}
+    assert result.eaten_calories == 500
+    assert result.is_out_dated is False
+
+
+@pytest.mark.asyncio
+async def test_get_daily_summary_not_found(daily_summary_service, mock_daily_summary_read_repository):
+    mock_daily_summary_read_repository.get_daily_summary_rows.return_value = []
+
+    with pytest.raises(NotFoundInDatabaseException):
+        await daily_summary_service.get_daily_summary(user=user, day=date.today())
+
+
+@pytest.mark.asyncio
+async def test_get_eaten_macros_maps_rows_by_day(daily_summary_service, mock_daily_summary_read_repository):
+    # Given
+    monday = date(2025, 5, 19)
+    mock_daily_summary_read_repository.get_eaten_macros.return_value = [
+        SimpleNamespace(day=monday, calories=1800, protein=Decimal("110.50"), carbs=Decimal("210"), fat=Decimal("60")),
+        SimpleNamespace(day=monday + timedelta(days=1), calories=0, protein=0, carbs=0, fat=0),
+    ]
+
+    # When
+    eaten_macros = await daily_summary_service.get_eaten_macros(user.id, monday, monday + timedelta(days=6))
+
+    # Then
+    mock_daily_summary_read_repository.get_eaten_macros.assert_awaited_once_with(
+        user.id, monday, monday + timedelta(days=6)
+    )
+    assert eaten_macros[monday] == Macros(calories=1800, protein=110.5, carbs=210, fat=60)
+    assert eaten_macros[monday + timedelta(days=1)].calories == 0
+
+
+@pytest.mark.asyncio
+async def test_get_daily_summary_out_dated(daily_summary_service, mock_daily_summary_read_repository):
+    row = make_daily_summary_row()
+    row.last_prediction_update = row.updated_at + timedelta(minutes=1)
+    mock_daily_summary_read_repository.get_daily_summary_rows.return_value = [row]
+
+    result = await daily_summary_service.get_daily_summary(user=user, day=date.today())
+
+    assert result.is_out_dated is True
+
+
 @pytest.mark.asyncio
 async def test_get_daily_meals_success(daily_summary_service, mock_daily_summary_repository, mock_meal_gateway):
     mock_summary = MockDailyMealsSummary()
@@ -200,50 +334,25 @@ async def test_get_daily_meals_not_found(daily_summary_service, mock_daily_summa
 
 
 @pytest.mark.asyncio
-async def test_add_daily_macros_summary_success(daily_summary_service, mock_daily_summary_repository):
-    summary = DailyMacrosSummaryCreate(day=date.today(), calories=2000, protein=100, carbs=200, fat=70)
-    mock_daily_summary_repository.get_daily_macros_summary.return_value = None
-    mock_daily_summary_repository.add_daily_macros_summary.return_value = summary
-
-    result = await daily_summary_service.add_daily_macros_summary(
-        user_id=uuid.UUID("6ea7ae4d-fc73-4db0-987d-84e8e2bc2a6a"), data=summary
-    )
-
-    assert result == summary
-    mock_daily_summary_repository.add_daily_macros_summary.assert_called_once()
-
-
-@pytest.mark.asyncio
-async def test_add_daily_macros_summary_already_exists(daily_summary_service, mock_daily_summary_repository):
-    summary = DailyMacrosSummaryCreate(day=date.today(), calories=2000, protein=100, carbs=200, fat=70)
-    updated_summary = DailyMacrosSummaryCreate(day=date.today(), calories=0, protein=0, carbs=0, fat=0)
-    mock_daily_summary_repository.get_daily_macros_summary.return_value = summary
-    mock_daily_summary_repository.update_daily_macros_summary.return_value = updated_summary
-
-    result = await daily_summary_service.add_daily_macros_summary(
-        user_id=uuid.UUID("6ea7ae4d-fc73-4db0-987d-84e8e2bc2a6a"), data=updated_summary
-    )
-
-    assert result == updated_summary
-    mock_daily_summary_repository.get_daily_macros_summary.assert_called_once()
-    mock_daily_summary_repository.update_daily_macros_summary.assert_called_once()
-
-
-@pytest.mark.asyncio
-async def test_get_daily_macros_summary_success(daily_summary_service, mock_daily_summary_repository):
-    summary = DailyMacrosSummaryCreate(day=date.today(), calories=2000)
-    mock_daily_summary_repository.get_daily_macros_summary.return_value = summary
+async def test_get_daily_macros_summary_is_derived_from_eaten_meals(
+    daily_summary_service, mock_daily_summary_read_repository
+):
+    mock_daily_summary_read_repository.get_eaten_macros.return_value = [
+        SimpleNamespace(
+            day=date.today(), calories=2000, protein=Decimal("100"), carbs=Decimal("200"), fat=Decimal("70")
+        )
+    ]
 
     result = await daily_summary_service.get_daily_macros_summary(
         user_id=uuid.UUID("6ea7ae4d-fc73-4db0-987d-84e8e2bc2a6a"), day=date.today()
     )
 
-    assert result == summary
+    assert result == DailyMacrosSummaryCreate(day=date.today(), calories=2000, protein=100, carbs=200, fat=70)
 
 
 @pytest.mark.asyncio
-async def test_get_daily_macros_summary_not_found(daily_summary_service, mock_daily_summary_repository):
-    mock_daily_summary_repository.get_daily_macros_summary.return_value = None
+async def test_get_daily_macros_summary_not_found(daily_summary_service, mock_daily_summary_read_repository):
+    mock_daily_summary_read_repository.get_eaten_macros.return_value = []
 
     with pytest.raises(NotFoundInDatabaseException):
         await daily_summary_service.get_daily_macros_summary(
@@ -641,6 +750,179 @@ async def test_get_meal_macros_not_found(daily_summary_service, mock_meal_reposi
 #     mock_daily_summary_repository.update_daily_macros_summary.assert_awaited_once()
 
 
+@pytest.mark.asyncio
+async def test_remove_eaten_meal_commits_removal(daily_summary_service, mock_daily_summary_repository, mock_db):
+    # Given
+    daily_summary_obj = MockDailyMealsSummary()
+    daily_summary_obj.daily_meals[0].status = MealStatus.EATEN
+    mock_daily_summary_repository.get_daily_meal_type_summary.return_value = daily_summary_obj
+    composed_item = MagicMock(planned_calories=500, planned_protein=50, planned_carbs=100, planned_fat=20)
+    daily_summary_service.composed_meal_items_service.remove_composed_meal.return_value = (composed_item, True)
+    meal_request = RemoveMealRequest(day=date.today(), meal_type=MealType.BREAKFAST, meal_id=MEAL_ID)
+
+    # When
+    result = await daily_summary_service.remove_meal_from_summary(user, meal_request)
+
+    # Then
+    assert result.success is True
+    mock_db.commit.assert_awaited_once()
+    mock_db.rollback.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_remove_meal_rolls_back_when_meal_is_not_removed(
+    daily_summary_service, mock_daily_summary_repository, mock_db
+):
+    # Given
+    daily_summary_obj = MockDailyMealsSummary()
+    daily_summary_obj.daily_meals[0].status = MealStatus.EATEN
+    mock_daily_summary_repository.get_daily_meal_type_summary.return_value = daily_summary_obj
+    daily_summary_service.composed_meal_items_service.remove_composed_meal.return_value = (MagicMock(), False)
+    meal_request = RemoveMealRequest(day=date.today(), meal_type=MealType.BREAKFAST, meal_id=MEAL_ID)
+
+    # When
+    with pytest.raises(NotFoundInDatabaseException):
+        await daily_summary_service.remove_meal_from_summary(user, meal_request)
+
+    # Then
+    mock_db.rollback.assert_awaited_once()
+    mock_db.commit.assert_not_awaited()
+
+
+class FakeDayDatabase:
+    """Day plan shared by concurrent requests, the status is compared and set in one step like the SQL"""
+
+    def __init__(self, meals_macros: Dict[MealType, Tuple[int, float, float, float]]):
+        self.summary_id = uuid.uuid4()
+        self.ids = {meal_type: uuid.uuid4() for meal_type in meals_macros}
+        self.statuses = {self.ids[meal_type]: MealStatus.TO_EAT for meal_type in meals_macros}
+        self.meals_macros = meals_macros
+
+    async def get_all_daily_meal_types_with_items(self, user_id, day):
+        snapshot = SimpleNamespace(
+            id=self.summary_id,
+            user_id=user_id,
+            day=day,
+            target_calories=2000,
+            target_protein=150,
+            target_carbs=250,
+            target_fat=70,
+            daily_meals=[
+                SimpleNamespace(
+                    id=self.ids[meal_type],
+                    status=self.statuses[self.ids[meal_type]],
+                    meal_type=meal_type,
+                    meal_items=[
+                        ComposedMealItem(
+                            meal_type_daily_summary_id=self.summary_id,
+                            meal_id=uuid.uuid4(),
+                            planned_calories=calories,
+                            planned_protein=protein,
+                            planned_carbs=carbs,
+                            planned_fat=fat,
+                            planned_weight=300,
+                        )
+                    ],
+                )
+                for meal_type, (calories, protein, carbs, fat) in self.meals_macros.items()
+            ],
+        )
+        # Every request reads the plan before any of them writes
+        await asyncio.sleep(0)
+        return snapshot
+
+    async def get_meal_type_status(self, meal_type_daily_summary_id):
+        return self.statuses.get(meal_type_daily_summary_id)
+
+    async def update_meal_type_status(self, meal_type_daily_summary_id, new_status, previous_status):
+        if self.statuses.get(meal_type_daily_summary_id) != previous_status:
+            return None
+        self.statuses[meal_type_daily_summary_id] = new_status
+        return SimpleNamespace(status=new_status)
+
+    @property
+    def eaten_macros(self) -> Tuple[int, float, float, float]:
+        """Derived like the eaten macros query, from the items of the meal types marked as eaten"""
+        eaten = [
+            macros
+            for meal_type, macros in self.meals_macros.items()
+            if self.statuses[self.ids[meal_type]] == MealStatus.EATEN
+        ]
+        return tuple(sum(values) for values in zip(*eaten)) if eaten else (0, 0, 0, 0)
+
+
+def make_concurrent_services(database: FakeDayDatabase, count: int) -> List[DailySummaryService]:
+    summary_repository = AsyncMock()
+    summary_repository.get_all_daily_meal_types_with_items.side_effect = database.get_all_daily_meal_types_with_items
+    meal_type_repository = AsyncMock()
+    meal_type_repository.get_meal_type_status.side_effect = database.get_meal_type_status
+    meal_type_repository.update_meal_type_status.side_effect = database.update_meal_type_status
+
+    return [
+        DailySummaryService(
+            summary_repository,
+            meal_type_repository,
+            AsyncMock(),
+            AsyncMock(),
+            AsyncMock(),
+            AsyncMock(),
+            AsyncMock(),
+            AsyncMock(),
+            UnitOfWork(AsyncMock()),
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_parallel_status_changes_are_all_applied():
+    # Given
+    database = FakeDayDatabase(
+        {
+            MealType.BREAKFAST: (500, 30, 60, 15),
+            MealType.LUNCH: (700, 45, 80, 20),
+            MealType.DINNER: (600, 35, 70, 25),
+        }
+    )
+    services = make_concurrent_services(database, 3)
+    updates = [
+        MealInfoUpdateRequest(day=date.today(), meal_type=meal_type, status=MealStatus.EATEN)
+        for meal_type in database.meals_macros
+    ]
+
+    # When
+    await asyncio.gather(*(service.update_meal_status(user, update) for service, update in zip(services, updates)))
+
+    # Then
+    assert set(database.statuses.values()) == {MealStatus.EATEN}
+    assert database.eaten_macros == (1800, 110, 210, 60)
+
+
+@pytest.mark.asyncio
+async def test_parallel_changes_of_same_meal_keep_next_meal_pending():
+    # Given
+    database = FakeDayDatabase(
+        {
+            MealType.BREAKFAST: (500, 30, 60, 15),
+            MealType.LUNCH: (700, 45, 80, 20),
+            MealType.DINNER: (600, 35, 70, 25),
+        }
+    )
+    services = make_concurrent_services(database, 3)
+    updates = [
+        MealInfoUpdateRequest(day=date.today(), meal_type=MealType.BREAKFAST, status=status)
+        for status in (MealStatus.EATEN, MealStatus.EATEN, MealStatus.SKIPPED)
+    ]
+
+    # When
+    await asyncio.gather(*(service.update_meal_status(user, update) for service, update in zip(services, updates)))
+
+    # Then
+    assert database.statuses[database.ids[MealType.BREAKFAST]] == MealStatus.SKIPPED
+    assert database.statuses[database.ids[MealType.LUNCH]] == MealStatus.PENDING
+    assert database.eaten_macros == (0, 0, 0, 0)
+
+
 @pytest.mark.asyncio
 async def test_remove_meal_no_plan_raises(daily_summary_service, mock_daily_summary_repository):
     user_id = uuid.uuid4()
@@ -0,0 +1,33 @@
+import uuid
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from backend.daily_summary.enums.meal_status import MealStatus
+from backend.daily_summary.macros_reconciliation import reconcile_daily_macros
+
+
+@pytest.mark.asyncio
+async def test_reconciliation_rebuilds_range_with_one_upsert():
+    # Given
+    db = AsyncMock()
+    db.execute.return_value = SimpleNamespace(rowcount=3)
+    user_id = uuid.uuid4()
+
+    # When
+    reconciled = await reconcile_daily_macros(db, date(2025, 5, 1), date(2025, 5, 31), user_id)
+
+    # Then
+    assert reconciled == 3
+    db.execute.assert_awaited_once()
+    db.commit.assert_awaited_once()
+    compiled = db.execute.await_args.args[0].compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert sql.startswith("INSERT INTO daily_macros_summaries")
+    assert "JOIN LATERAL" in sql
+    assert "ON CONFLICT (day, user_id) DO UPDATE" in sql
+    assert "IS DISTINCT FROM excluded.calories" in sql
+    assert set(compiled.params.values()) >= {date(2025, 5, 1), date(2025, 5, 31), user_id, MealStatus.EATEN}
@@ -1,8 +1,11 @@
+from functools import cache
+
 from langgraph.graph import END, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 
 from backend.core.logger import logger
 from backend.diet_generation.schemas import AgentState
+from backend.diet_generation.tools.macro_fitter import MacroFitterTool
 from backend.diet_generation.tools.planner import PlannerTool
 from backend.diet_generation.tools.validator import ValidatorTool
 
@@ -23,8 +26,9 @@ def should_continue(state: AgentState) -> str:
 
 
 class DietAgentBuilder:
-    def __init__(self, meals_per_day: int):
-        self.planner = PlannerTool()
+    def __init__(self, meals_per_day: int, planner: PlannerTool | None = None):
+        self.planner = planner or PlannerTool()
+        self.fitter = MacroFitterTool()
         self.validator = ValidatorTool(meals_per_day)
 
     def build_graph(self) -> CompiledStateGraph:
@@ -32,6 +36,7 @@ class DietAgentBuilder:
 
         """Here functions also must to be pass as callable"""
         graph_builder.add_node("generate", self.planner.generate_plan)
+        graph_builder.add_node("fit", self.fitter.fit_plan)
         graph_builder.add_node("validate", self.validator.validate_plan)
 
         graph_builder.add_node(
@@ -43,7 +48,9 @@ class DietAgentBuilder:
 
         graph_builder.set_entry_point("generate")
 
-        graph_builder.add_edge("generate", "validate")
+        """Portions are fitted to the targets locally, the LLM is asked for a correction only if that is not enough"""
+        graph_builder.add_edge("generate", "fit")
+        graph_builder.add_edge("fit", "validate")
 
         graph_builder.add_conditional_edges(
             "validate", should_continue, {"end": END, "error": "error", "generate": "generate"}
@@ -52,3 +59,23 @@ class DietAgentBuilder:
         graph_builder.add_edge("error", END)
 
         return graph_builder.compile()
+
+
+"""Compiled graphs hold no per-request state, so one graph per meals_per_day is shared by the whole process"""
+
+SUPPORTED_MEALS_PER_DAY = (3, 4, 5, 6)
+
+
+@cache
+def get_planner_tool() -> PlannerTool:
+    return PlannerTool()
+
+
+@cache
+def get_diet_agent_graph(meals_per_day: int) -> CompiledStateGraph:
+    return DietAgentBuilder(meals_per_day, get_planner_tool()).build_graph()
+
+
+def warm_up_diet_agent_graphs():
+    for meals_per_day in SUPPORTED_MEALS_PER_DAY:
+        get_diet_agent_graph(meals_per_day)
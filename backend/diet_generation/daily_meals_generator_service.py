@@ -1,26 +1,32 @@
 import asyncio
+from contextlib import contextmanager
 from datetime import date, datetime, timedelta
-from typing import Dict, List, Type
+from typing import Any, Awaitable, Callable, Dict, List, Type
 from uuid import UUID
 
 from fastapi import HTTPException, status
 
 from backend.core.logger import logger
 from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
+from backend.core.unit_of_work import UnitOfWork
 from backend.core.value_error_exception import ValueErrorException
 from backend.daily_summary.daily_summary_gateway import DailySummaryGateway
 from backend.daily_summary.enums.meal_status import MealStatus
-from backend.daily_summary.schemas import BasicMealInfo, DailyMacrosSummaryCreate
-from backend.diet_generation.agent.graph_builder import DietAgentBuilder
+from backend.daily_summary.schemas import BasicMealInfo
+from backend.diet_generation.agent.graph_builder import get_diet_agent_graph
+from backend.diet_generation.diet_plan_repository import DietPlanRepository
+from backend.diet_generation.enums.job_status import DietGenerationJobStatus
 from backend.diet_generation.mappers import (
     complete_meal_to_recipe,
     meal_recipe_translation_to_recipe,
     recipe_to_meal_recipe_translation,
     to_daily_meals_create,
     to_empty_basic_meal_info,
+    to_scaled_basic_meal_info,
 )
-from backend.diet_generation.schemas import CompleteMeal, DietGenerationInput, create_agent_state
-from backend.diet_generation.tools.translator import TranslatorTool
+from backend.diet_generation.meal_retrieval_index import MealRetrievalIndex
+from backend.diet_generation.schemas import CompleteMeal, DietGenerationInput, RetrievedMeal, create_agent_state
+from backend.diet_generation.tools.translator import get_translator_tool
 from backend.meals.enums.meal_type import MealType
 from backend.meals.meal_gateway import MealGateway
 from backend.meals.schemas import MealCreate
@@ -30,6 +36,9 @@ from backend.user_details.schemas import PredictedCalories
 from backend.user_details.user_details_gateway import UserDetailsGateway
 from backend.users.enums.language import Language
 
+ProgressCallback = Callable[[DietGenerationJobStatus], Awaitable[None]]
+DayPlan = List[CompleteMeal | RetrievedMeal]
+
 
 class DailyMealsGeneratorService:
     def __init__(
@@ -37,11 +46,17 @@ class DailyMealsGeneratorService:
         meal_gateway: MealGateway,
         daily_summary_gateway: DailySummaryGateway,
         user_details_gateway: UserDetailsGateway,
+        retrieval_index: MealRetrievalIndex | None = None,
+        diet_plan_repository: DietPlanRepository | None = None,
+        unit_of_work: UnitOfWork | None = None,
     ):
         self.meal_gateway = meal_gateway
         self.daily_summary_gateway = daily_summary_gateway
         self.user_details_gateway = user_details_gateway
-        self.translator = TranslatorTool()
+        self.retrieval_index = retrieval_index
+        self.diet_plan_repository = diet_plan_repository
+        self.unit_of_work = unit_of_work
+        self.translator = get_translator_tool()
 
     @staticmethod
     def _prepare_input(
@@ -61,7 +76,55 @@ class DailyMealsGeneratorService:
             cooking_skills=details.cooking_skills,
         )
 
-    async def generate_meal_plan(self, user: Type[User], day: date) -> List[MealRecipe]:
+    async def generate_meal_plan(
+        self, user: Type[User], day: date, progress: ProgressCallback | None = None
+    ) -> List[MealRecipe]:
+        await self._validate_first_day(user, day)
+
+        with self._generation_errors():
+            user_details, user_diet_predictions, user_latest_meals, meal_icons = await self._get_required_arguments(
+                user, day
+            )
+
+            input_data = self._prepare_input(user_details, user_diet_predictions, user_latest_meals)
+
+            saved_recipes = await self._reuse_indexed_meals(day, input_data, user_diet_predictions)
+            if saved_recipes is None:
+                saved_recipes = await self._generate_new_meals(
+                    day, input_data, user_diet_predictions, meal_icons, progress
+                )
+        return saved_recipes
+
+    async def generate_week_meal_plan(
+        self, user: Type[User], start_day: date, days: int
+    ) -> Dict[date, List[MealRecipe]]:
+        """Context is loaded once, days are planned together and saved in one transaction"""
+        if not 1 <= days <= config.DIET_WEEK_MAX_DAYS:
+            raise ValueErrorException(f"Diet can be generated for 1 to {config.DIET_WEEK_MAX_DAYS} days at once.")
+        await self._validate_first_day(user, start_day)
+
+        with self._generation_errors():
+            user_details, user_diet_predictions, user_latest_meals, meal_icons = await self._get_required_arguments(
+                user, start_day
+            )
+            input_data = self._prepare_input(user_details, user_diet_predictions, user_latest_meals)
+            # Names of planned meals are added as the days are planned so the next days avoid them
+            previous_meals = list(input_data.previous_meals)
+            week_days = [start_day + timedelta(days=offset) for offset in range(days)]
+
+            plans = await self._plan_days(week_days, input_data, previous_meals, use_index=True)
+            indexed_recipes = await self._get_indexed_recipes(plans)
+            missing_days = [
+                day
+                for day, plan in plans.items()
+                if any(isinstance(meal, RetrievedMeal) and meal.meal_id not in indexed_recipes for meal in plan)
+            ]
+            if missing_days:
+                plans.update(await self._plan_days(missing_days, input_data, previous_meals, use_index=False))
+
+            return await self._save_week(plans, indexed_recipes, input_data, user_diet_predictions, meal_icons)
+
+    async def _validate_first_day(self, user: Type[User], day: date):
         today = datetime.now(config.TIMEZONE).date()
         if day < today:
             raise ValueErrorException("Cannot generate diet for past days.")
@@ -74,24 +137,11 @@ class DailyMealsGeneratorService:
             except NotFoundInDatabaseException:
                 pass
 
+    @staticmethod
+    @contextmanager
+    def _generation_errors():
         try:
-            user_details, user_diet_predictions, user_latest_meals, meal_icons = await self._get_required_arguments(
-                user, day
-            )
-
-            input_data = self._prepare_input(user_details, user_diet_predictions, user_latest_meals)
-
-            agent = DietAgentBuilder(user_details.meals_per_day)
-            app = agent.build_graph()
-
-            initial_state = create_agent_state(input_data)
-            generated_diet = await asyncio.to_thread(lambda: app.invoke(initial_state))
-
-            saved_meals, saved_recipes, meals_type_map = await self._save_meals(
-                generated_diet.get("current_plan"), meal_icons
-            )
-            await self._save_daily_summary(day, user_diet_predictions, meals_type_map)
-            await self._translate_and_save_recipes(saved_meals, saved_recipes)
+            yield
         except NotFoundInDatabaseException:
             logger.debug("Diet not found in database")
             raise
@@ -104,8 +154,168 @@ class DailyMealsGeneratorService:
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Error while generating meal plan",
             ) from e
+
+    async def _plan_days(
+        self, days: List[date], input_data: DietGenerationInput, previous_meals: List[str], use_index: bool
+    ) -> Dict[date, DayPlan]:
+        semaphore = asyncio.Semaphore(config.DIET_WEEK_GENERATION_CONCURRENCY)
+        app = get_diet_agent_graph(input_data.meals_per_day)
+
+        async def plan_day(day: date) -> DayPlan:
+            async with semaphore:
+                for attempt in range(config.DIET_WEEK_MAX_REPLANS + 1):
+                    day_input = input_data.model_copy(update={"previous_meals": list(previous_meals)})
+                    plan = await self._plan_day(app, day_input, use_index)
+                    # Days planned concurrently did not see each other, so meals of days finished meanwhile are
+                    # checked here, with no await between the check and extending the list
+                    repeated = {meal.meal_name.lower() for meal in plan} & {name.lower() for name in previous_meals}
+                    if not repeated:
+                        break
+                    logger.debug(f"Plan for {day} repeats {', '.join(sorted(repeated))} (attempt {attempt + 1})")
+                previous_meals.extend(meal.meal_name for meal in plan)
+                return plan
+
+        plans = await asyncio.gather(*(plan_day(day) for day in days))
+        return dict(zip(days, plans))
+
+    async def _plan_day(self, app, day_input: DietGenerationInput, use_index: bool) -> DayPlan:
+        plan = self.retrieval_index.build_day_plan(day_input) if use_index and self.retrieval_index else None
+        if plan:
+            return plan
+        final_state = await self._run_agent(app, create_agent_state(day_input), None)
+        return [
+            meal if isinstance(meal, CompleteMeal) else CompleteMeal(**meal) for meal in final_state.get("current_plan")
+        ]
+
+    async def _get_indexed_recipes(self, plans: Dict[date, DayPlan]) -> Dict[UUID, MealRecipe]:
+        meal_ids = {meal.meal_id for plan in plans.values() for meal in plan if isinstance(meal, RetrievedMeal)}
+        if not meal_ids:
+            return {}
+
+        recipes = {
+            recipe.meal_id: recipe
+            for recipe in await self.meal_gateway.get_meal_recipes_by_meal_ids(list(meal_ids), Language.EN)
+        }
+        if len(recipes) != len(meal_ids):
+            # Meals deleted since they were indexed
+            self.retrieval_index.remove_meals(meal_ids - recipes.keys())
+        return recipes
+
+    async def _save_week(
+        self,
+        plans: Dict[date, DayPlan],
+        indexed_recipes: Dict[UUID, MealRecipe],
+        input_data: DietGenerationInput,
+        user_diet_predictions: PredictedCalories,
+        meal_icons: Dict[str, UUID],
+    ) -> Dict[date, List[MealRecipe]]:
+        new_meals, new_recipes, daily_meals = [], [], []
+        week_recipes = {}
+        for day in sorted(plans):
+            meals_type_map = {}
+            week_recipes[day] = []
+            for planned_meal in plans[day]:
+                _status = self._initial_meal_status(planned_meal.meal_type)
+                if isinstance(planned_meal, RetrievedMeal):
+                    meal_info = to_scaled_basic_meal_info(planned_meal, _status)
+                    recipe = indexed_recipes[planned_meal.meal_id]
+                else:
+                    meal = Meal(
+                        **MealCreate.from_complete_meal(planned_meal, meal_icons[planned_meal.meal_type]).model_dump()
+                    )
+                    recipe = complete_meal_to_recipe(planned_meal, meal.id, Language.EN)
+                    meal_info = to_empty_basic_meal_info(saved_meal=meal, status=_status)
+                    new_meals.append(meal)
+                    new_recipes.append(recipe)
+                meals_type_map[planned_meal.meal_type] = [meal_info]
+                week_recipes[day].append(recipe)
+            daily_meals.append(to_daily_meals_create(day, user_diet_predictions, meals_type_map))
+
+        async with self.unit_of_work:
+            await self.diet_plan_repository.save_diet_plans(
+                user_diet_predictions.user_id, daily_meals, new_meals, new_recipes
+            )
+        if self.retrieval_index:
+            self.retrieval_index.add_meals(new_meals, input_data)
+            await self.retrieval_index.save_if_needed()
+        await self._translate_and_save_recipes(new_meals, new_recipes)
+        return week_recipes
+
+    async def _reuse_indexed_meals(
+        self, day: date, input_data: DietGenerationInput, user_diet_predictions: PredictedCalories
+    ) -> List[MealRecipe] | None:
+        if not self.retrieval_index:
+            return None
+
+        retrieved_meals = self.retrieval_index.build_day_plan(input_data)
+        if not retrieved_meals:
+            logger.debug("Meal retrieval index cannot cover the targets, falling back to the LLM")
+            return None
+
+        meal_ids = [meal.meal_id for meal in retrieved_meals]
+        recipes = {
+            recipe.meal_id: recipe
+            for recipe in await self.meal_gateway.get_meal_recipes_by_meal_ids(meal_ids, Language.EN)
+        }
+        if len(recipes) != len(meal_ids):
+            # Meals deleted since they were indexed
+            self.retrieval_index.remove_meals(set(meal_ids) - recipes.keys())
+            return None
+
+        meals_type_map = {
+            meal.meal_type: [to_scaled_basic_meal_info(meal, self._initial_meal_status(meal.meal_type))]
+            for meal in retrieved_meals
+        }
+        await self._save_daily_summary(day, user_diet_predictions, meals_type_map)
+        logger.debug(f"Meal plan for {day} assembled from {len(meal_ids)} indexed meals")
+        return [recipes[meal_id] for meal_id in meal_ids]
+
+    async def _generate_new_meals(
+        self,
+        day: date,
+        input_data: DietGenerationInput,
+        user_diet_predictions: PredictedCalories,
+        meal_icons: Dict[str, UUID],
+        progress: ProgressCallback | None,
+    ) -> List[MealRecipe]:
+        app = get_diet_agent_graph(input_data.meals_per_day)
+
+        initial_state = create_agent_state(input_data)
+        generated_diet = await self._run_agent(app, initial_state, progress)
+
+        saved_meals, saved_recipes, meals_type_map = await self._save_meals(
+            generated_diet.get("current_plan"), meal_icons
+        )
+        await self._save_daily_summary(day, user_diet_predictions, meals_type_map)
+        if self.retrieval_index:
+            self.retrieval_index.add_meals(saved_meals, input_data)
+            await self.retrieval_index.save_if_needed()
+        await self._report_progress(progress, DietGenerationJobStatus.TRANSLATING)
+        await self._translate_and_save_recipes(saved_meals, saved_recipes)
         return saved_recipes
 
+    @staticmethod
+    def _initial_meal_status(meal_type: str) -> MealStatus:
+        return MealStatus.PENDING if meal_type == MealType.BREAKFAST.value else MealStatus.TO_EAT
+
+    async def _run_agent(self, app, initial_state: Dict[str, Any], progress: ProgressCallback | None) -> Dict[str, Any]:
+        await self._report_progress(progress, DietGenerationJobStatus.GENERATING)
+
+        final_state = initial_state
+        async for mode, chunk in app.astream(initial_state, stream_mode=["updates", "values"]):
+            if mode == "values":
+                final_state = chunk
+            elif "generate" in chunk:
+                await self._report_progress(progress, DietGenerationJobStatus.VALIDATING)
+            elif "validate" in chunk and (chunk["validate"] or {}).get("validation_report") != "OK":
+                await self._report_progress(progress, DietGenerationJobStatus.GENERATING)
+        return final_state
+
+    @staticmethod
+    async def _report_progress(progress: ProgressCallback | None, job_status: DietGenerationJobStatus):
+        if progress:
+            await progress(job_status)
+
     async def _get_required_arguments(self, user: Type[User], day: date):
         user_details = await self.user_details_gateway.get_user_details(user)
         user_diet_predictions = await self.user_details_gateway.get_user_diet_predictions(user)
@@ -113,7 +323,8 @@ class DailyMealsGeneratorService:
             user.id, day - timedelta(days=7), day
         )
         meal_types = MealType.daily_meals(user_details.meals_per_day)
-        meal_icons = {meal_type.value: await self.meal_gateway.get_meal_icon_id(meal_type) for meal_type in meal_types}
+        meal_icon_ids = await self.meal_gateway.get_meal_icon_ids(meal_types)
+        meal_icons = {meal_type.value: icon_id for meal_type, icon_id in meal_icon_ids.items()}
 
         return user_details, user_diet_predictions, user_latest_meals, meal_icons
 
@@ -132,7 +343,7 @@ class DailyMealsGeneratorService:
 
             saved_meals.append(saved_meal)
             saved_recipes.append(meal_recipe)
-            _status = MealStatus.PENDING if complete_meal.meal_type == MealType.BREAKFAST.value else MealStatus.TO_EAT
+            _status = self._initial_meal_status(complete_meal.meal_type)
             meals_type_map[saved_meal.meal_type.value] = [
                 to_empty_basic_meal_info(saved_meal=saved_meal, status=_status)
             ]
@@ -145,20 +356,28 @@ class DailyMealsGeneratorService:
         await self.daily_summary_gateway.add_daily_meals(
             to_daily_meals_create(day, user_diet_predictions, meals_type_map), user_diet_predictions.user_id
         )
-        await self.daily_summary_gateway.add_daily_macros_summary(
-            user_diet_predictions.user_id, DailyMacrosSummaryCreate(day=day)
-        )
 
     async def _translate_and_save_recipes(self, meals: List[Meal], meal_recipes: List[MealRecipe]):
-        for meal, meal_recipe in zip(meals, meal_recipes):
-            try:
-                translated_recipe = await asyncio.to_thread(
-                    lambda _meal_recipe=meal_recipe: self.translator.translate_meal_recipe_to_polish(
-                        recipe_to_meal_recipe_translation(_meal_recipe)
+        semaphore = asyncio.Semaphore(config.DIET_TRANSLATION_CONCURRENCY)
+
+        async def translate(meal: Meal, meal_recipe: MealRecipe) -> MealRecipe | None:
+            async with semaphore:
+                try:
+                    translated_recipe = await self.translator.translate_meal_recipe_to_polish(
+                        recipe_to_meal_recipe_translation(meal_recipe)
                     )
-                )
-                await self.meal_gateway.add_meal_recipe(meal_recipe_translation_to_recipe(translated_recipe, meal.id))
-            # Error suppression in case of failed translation
-            except Exception as e:
-                logger.error(f"Error while translating recipe: {str(e)}")
-                pass
+                # Error suppression in case of failed translation
+                except Exception as e:
+                    logger.error(f"Error while translating recipe: {str(e)}")
+                    return None
+            return meal_recipe_translation_to_recipe(translated_recipe, meal.id)
+
+        translated_recipes = await asyncio.gather(*(translate(m, r) for m, r in zip(meals, meal_recipes)))
+        translated_recipes = [recipe for recipe in translated_recipes if recipe]
+        if not translated_recipes:
+            return
+
+        try:
+            await self.meal_gateway.add_meal_recipes(translated_recipes)
+        except Exception as e:
+            logger.error(f"Error while saving translated recipes: {str(e)}")
@@ -1,14 +1,113 @@
+import redis.asyncio as aioredis
 from fastapi.params import Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from backend.core.database import get_db, get_redis_queue
+from backend.core.unit_of_work import UnitOfWork, get_unit_of_work
+from backend.daily_summary.composed_meal_items_service import ComposedMealItemsService
 from backend.daily_summary.daily_summary_gateway import DailySummaryGateway, get_daily_summary_gateway
+from backend.daily_summary.daily_summary_service import DailySummaryService
+from backend.daily_summary.repositories.composed_meal_items_repository import ComposedMealItemsRepository
+from backend.daily_summary.repositories.daily_summary_read_repository import DailySummaryReadRepository
+from backend.daily_summary.repositories.daily_summary_repository import DailySummaryRepository
+from backend.daily_summary.repositories.last_generated_meals_repository import LastGeneratedMealsRepository
+from backend.daily_summary.repositories.meal_type_daily_summary_repository import MealTypeDailySummaryRepository
 from backend.diet_generation.daily_meals_generator_service import DailyMealsGeneratorService
+from backend.diet_generation.diet_generation_job_repository import DietGenerationJobRepository
+from backend.diet_generation.diet_generation_job_service import DietGenerationJobService
+from backend.diet_generation.diet_plan_repository import DietPlanRepository
+from backend.diet_generation.meal_retrieval_index import get_meal_retrieval_index
+from backend.meals.meal_cache import meal_cache
 from backend.meals.meal_gateway import MealGateway, get_meal_gateway
+from backend.meals.meal_service import MealService
+from backend.meals.repositories.meal_icons_repository import MealIconsRepository
+from backend.meals.repositories.meal_recipes_repository import MealRecipesRepository
+from backend.meals.repositories.meal_repository import MealRepository
+from backend.user_details.calories_prediction_repository import CaloriesPredictionRepository
+from backend.user_details.service.calories_prediction_service import CaloriesPredictionService
+from backend.user_details.service.user_details_service import UserDetailsService
+from backend.user_details.service.user_details_validation_service import UserDetailsValidationService
 from backend.user_details.user_details_gateway import UserDetailsGateway, get_user_details_gateway
+from backend.user_details.user_details_repository import UserDetailsRepository
+from backend.users.service.user_validation_service import UserValidationService
+from backend.users.user_gateway import UserGateway
+from backend.users.user_repository import UserRepository
+
+
+async def get_diet_plan_repository(db: AsyncSession = Depends(get_db)) -> DietPlanRepository:
+    return DietPlanRepository(db)
 
 
 async def get_prompt_service(
     meal_gateway: MealGateway = Depends(get_meal_gateway),
     daily_summary_gateway: DailySummaryGateway = Depends(get_daily_summary_gateway),
     user_details_gateway: UserDetailsGateway = Depends(get_user_details_gateway),
+    diet_plan_repository: DietPlanRepository = Depends(get_diet_plan_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
 ) -> DailyMealsGeneratorService:
-    return DailyMealsGeneratorService(meal_gateway, daily_summary_gateway, user_details_gateway)
+    return DailyMealsGeneratorService(
+        meal_gateway,
+        daily_summary_gateway,
+        user_details_gateway,
+        get_meal_retrieval_index(),
+        diet_plan_repository,
+        unit_of_work,
+    )
+
+
+async def get_diet_generation_job_repository(
+    redis: aioredis.Redis = Depends(get_redis_queue),
+) -> DietGenerationJobRepository:
+    return DietGenerationJobRepository(redis)
+
+
+async def get_diet_generation_job_service(
+    job_repository: DietGenerationJobRepository = Depends(get_diet_generation_job_repository),
+) -> DietGenerationJobService:
+    return DietGenerationJobService(job_repository)
+
+
+def build_prompt_service(db: AsyncSession) -> DailyMealsGeneratorService:
+    # Mirrors the get_prompt_service dependency tree for code running outside of a request (workers).
+    unit_of_work = UnitOfWork(db)
+    meal_repository = MealRepository(db)
+    meal_gateway = MealGateway(
+        MealService(MealRecipesRepository(db), meal_repository, MealIconsRepository(db), unit_of_work, meal_cache)
+    )
+
+    user_details_repository = UserDetailsRepository(db)
+    user_details_service = UserDetailsService(
+        user_details_repository,
+        # There is no access token outside of a request, the diet generation flow does not need it.
+        UserGateway(None, UserValidationService(UserRepository(db))),
+        UserDetailsValidationService(user_details_repository),
+    )
+    user_details_gateway = UserDetailsGateway(
+        user_details_service, CaloriesPredictionService(user_details_service, CaloriesPredictionRepository(db))
+    )
+
+    daily_summary_repository = DailySummaryRepository(db)
+    daily_summary_gateway = DailySummaryGateway(
+        DailySummaryService(
+            daily_summary_repository,
+            MealTypeDailySummaryRepository(db),
+            meal_repository,
+            LastGeneratedMealsRepository(db),
+            ComposedMealItemsService(
+                daily_summary_repository, ComposedMealItemsRepository(db), meal_gateway, unit_of_work
+            ),
+            meal_gateway,
+            user_details_gateway,
+            DailySummaryReadRepository(db),
+            unit_of_work,
+        )
+    )
+
+    return DailyMealsGeneratorService(
+        meal_gateway,
+        daily_summary_gateway,
+        user_details_gateway,
+        get_meal_retrieval_index(),
+        DietPlanRepository(db),
+        unit_of_work,
+    )
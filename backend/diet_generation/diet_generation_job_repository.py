@@ -0,0 +1,128 @@
+from datetime import date, datetime
+from uuid import UUID, uuid4
+
+import redis.asyncio as aioredis
+from redis.exceptions import WatchError
+
+from backend.core import reliable_queue
+from backend.diet_generation.schemas import DietGenerationJob
+from backend.settings import config
+
+
+class DietGenerationJobRepository:
+    QUEUE_KEY = "diet_generation:queue"
+    # Jobs taken by a worker stay here until they finish, so a job of a dead worker can be queued again
+    PROCESSING_KEY = "diet_generation:processing"
+    LEASE_KEY_PREFIX = "diet_generation:lease:"
+
+    def __init__(self, redis: aioredis.Redis):
+        self.redis = redis
+
+    @staticmethod
+    def _job_key(job_id: UUID) -> str:
+        return f"diet_generation:job:{job_id}"
+
+    @staticmethod
+    def _active_job_key(user_id: UUID, day: date) -> str:
+        return f"diet_generation:active:{user_id}:{day.isoformat()}"
+
+    @classmethod
+    def _lease_key(cls, job_id: UUID) -> str:
+        return f"{cls.LEASE_KEY_PREFIX}{job_id}"
+
+    async def enqueue_job(self, user_id: UUID, day: date) -> DietGenerationJob:
+        """The active key is claimed with SET NX, so parallel requests for one day get the same job"""
+        now = datetime.now(config.TIMEZONE)
+        job = DietGenerationJob(job_id=uuid4(), user_id=user_id, day=day, created_at=now, updated_at=now)
+        active_job_key = self._active_job_key(user_id, day)
+        ttl = config.DIET_GENERATION_JOB_TTL_SECONDS
+
+        while not await self.redis.set(active_job_key, str(job.job_id), ex=ttl, nx=True):
+            active_job = await self.get_active_job(user_id, day)
+            if active_job:
+                return active_job
+            await self._release_stale_active_job(active_job_key)
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.job_id), job.model_dump_json(), ex=ttl)
+            pipe.lpush(self.QUEUE_KEY, str(job.job_id))
+            await pipe.execute()
+        return job
+
+    async def _release_stale_active_job(self, active_job_key: str):
+        """Removes an active key of an expired or finished job, unless another request replaced it meanwhile"""
+        async with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(active_job_key)
+                job_id = await pipe.get(active_job_key)
+                if job_id:
+                    job = await self.get_job(UUID(job_id.decode()))
+                    if job and not job.status.is_finished:
+                        return
+                pipe.multi()
+                pipe.delete(active_job_key)
+                await pipe.execute()
+            except WatchError:
+                pass
+
+    async def get_active_job(self, user_id: UUID, day: date) -> DietGenerationJob | None:
+        job_id = await self.redis.get(self._active_job_key(user_id, day))
+        if not job_id:
+            return None
+        job = await self.get_job(UUID(job_id.decode()))
+        if job and not job.status.is_finished:
+            return job
+        return None
+
+    async def get_job(self, job_id: UUID) -> DietGenerationJob | None:
+        raw_job = await self.redis.get(self._job_key(job_id))
+        if not raw_job:
+            return None
+        return DietGenerationJob.model_validate_json(raw_job)
+
+    async def save_job(self, job: DietGenerationJob) -> DietGenerationJob:
+        job.updated_at = datetime.now(config.TIMEZONE)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._job_key(job.job_id), job.model_dump_json(), ex=config.DIET_GENERATION_JOB_TTL_SECONDS)
+            if job.status.is_finished:
+                pipe.delete(self._active_job_key(job.user_id, job.day))
+            await pipe.execute()
+        return job
+
+    async def dequeue_job_id(self, timeout: int) -> UUID | None:
+        """The job is moved to the processing list together with its lease, so it is never taken as abandoned"""
+        job_ids = await reliable_queue.claim(
+            self.redis,
+            self.QUEUE_KEY,
+            self.PROCESSING_KEY,
+            self.LEASE_KEY_PREFIX,
+            config.DIET_GENERATION_JOB_LEASE_SECONDS,
+            count=1,
+            timeout=timeout,
+        )
+        return UUID(job_ids[0]) if job_ids else None
+
+    async def renew_lease(self, job_id: UUID):
+        await self.redis.set(self._lease_key(job_id), 1, ex=config.DIET_GENERATION_JOB_LEASE_SECONDS)
+
+    async def complete_job(self, job_id: UUID):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.PROCESSING_KEY, 1, str(job_id))
+            pipe.delete(self._lease_key(job_id))
+            await pipe.execute()
+
+    async def requeue_job(self, job_id: UUID) -> bool:
+        """Moves a taken job back to the head of the queue, False when it is no longer being processed"""
+        return bool(
+            await reliable_queue.requeue(
+                self.redis, self.PROCESSING_KEY, self.QUEUE_KEY, self.LEASE_KEY_PREFIX, [str(job_id)]
+            )
+        )
+
+    async def requeue_abandoned_jobs(self) -> int:
+        """Queues again the taken jobs whose worker stopped renewing the lease"""
+        job_ids = [job_id.decode() for job_id in await self.redis.lrange(self.PROCESSING_KEY, 0, -1)]
+        requeued = await reliable_queue.requeue(
+            self.redis, self.PROCESSING_KEY, self.QUEUE_KEY, self.LEASE_KEY_PREFIX, job_ids, only_abandoned=True
+        )
+        return len(requeued)
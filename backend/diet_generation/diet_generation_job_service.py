@@ -0,0 +1,31 @@
+from datetime import date, datetime
+from typing import Type
+from uuid import UUID
+
+from backend.core.logger import logger
+from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
+from backend.core.value_error_exception import ValueErrorException
+from backend.diet_generation.diet_generation_job_repository import DietGenerationJobRepository
+from backend.diet_generation.schemas import DietGenerationJob
+from backend.models import User
+from backend.settings import config
+
+
+class DietGenerationJobService:
+    def __init__(self, job_repository: DietGenerationJobRepository):
+        self.job_repository = job_repository
+
+    async def enqueue_meal_plan_generation(self, user: Type[User], day: date) -> DietGenerationJob:
+        if day < datetime.now(config.TIMEZONE).date():
+            raise ValueErrorException("Cannot generate diet for past days.")
+
+        job = await self.job_repository.enqueue_job(user.id, day)
+        logger.debug(f"Diet generation job {job.job_id} for user {user.id} and day {day} is {job.status.value}")
+        return job
+
+    async def get_job(self, user: Type[User], job_id: UUID) -> DietGenerationJob:
+        job = await self.job_repository.get_job(job_id)
+        if not job or job.user_id != user.id:
+            logger.debug(f"Diet generation job {job_id} not found for user {user.id}")
+            raise NotFoundInDatabaseException(f"Diet generation job {job_id} not found.")
+        return job
@@ -1,12 +1,15 @@
 from datetime import date
-from typing import List
+from typing import Dict, List
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request, status
 
 from backend.core.limiter import limiter, user_target_date_key, user_triggered_date_key
 from backend.core.role_sets import user_or_admin
 from backend.diet_generation.daily_meals_generator_service import DailyMealsGeneratorService
-from backend.diet_generation.dependencies import get_prompt_service
+from backend.diet_generation.dependencies import get_diet_generation_job_service, get_prompt_service
+from backend.diet_generation.diet_generation_job_service import DietGenerationJobService
+from backend.diet_generation.schemas import DietGenerationJob
 from backend.models import MealRecipe
 from backend.users.user_gateway import UserGateway, get_user_gateway
 
@@ -30,3 +33,59 @@ async def generate_meal_plan(
 ):
     user, _ = await user_gateway.get_current_user()
     return await prompt_service.generate_meal_plan(user, day)
+
+
+@diet_generation_router.post(
+    "/generate-week",
+    response_model=Dict[date, List[MealRecipe]],
+    summary="Generate meal plans for several days",
+    description="Generate meal plans for the currently authenticated user for consecutive days from the chosen date. "
+    "User data is loaded once and all days are saved together.",
+)
+@limiter.limit("2/day", key_func=user_triggered_date_key)
+@limiter.limit("1 per 2 minutes", key_func=user_triggered_date_key)
+async def generate_week_meal_plan(
+    request: Request,
+    start_day: date,
+    days: int = Query(7, ge=1),
+    prompt_service: DailyMealsGeneratorService = Depends(get_prompt_service),
+    user_gateway: UserGateway = Depends(get_user_gateway),
+):
+    user, _ = await user_gateway.get_current_user()
+    return await prompt_service.generate_week_meal_plan(user, start_day, days)
+
+
+@diet_generation_router.post(
+    "/jobs",
+    response_model=DietGenerationJob,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Enqueue meal plan generation",
+    description="Enqueue meal plan generation for the currently authenticated user and chosen date. "
+    "Returns the job which progress can be polled.",
+)
+@limiter.limit("10/day", key_func=user_triggered_date_key)
+@limiter.limit("3/day", key_func=user_target_date_key)
+@limiter.limit("1 per 2 minutes", key_func=user_target_date_key)
+async def enqueue_meal_plan_generation(
+    request: Request,
+    day: date,
+    job_service: DietGenerationJobService = Depends(get_diet_generation_job_service),
+    user_gateway: UserGateway = Depends(get_user_gateway),
+):
+    user, _ = await user_gateway.get_current_user()
+    return await job_service.enqueue_meal_plan_generation(user, day)
+
+
+@diet_generation_router.get(
+    "/jobs/{job_id}",
+    response_model=DietGenerationJob,
+    summary="Get meal plan generation job",
+    description="Get the progress of meal plan generation job of the currently authenticated user.",
+)
+async def get_meal_plan_generation_job(
+    job_id: UUID,
+    job_service: DietGenerationJobService = Depends(get_diet_generation_job_service),
+    user_gateway: UserGateway = Depends(get_user_gateway),
+):
+    user, _ = await user_gateway.get_current_user()
+    return await job_service.get_job(user, job_id)
@@ -0,0 +1,123 @@
+import asyncio
+from typing import List
+from uuid import UUID
+
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+
+from backend.core.database import SessionLocal, redis_queue
+from backend.core.logger import logger
+from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
+from backend.core.value_error_exception import ValueErrorException
+from backend.diet_generation.agent.graph_builder import warm_up_diet_agent_graphs
+from backend.diet_generation.dependencies import build_prompt_service
+from backend.diet_generation.diet_generation_job_repository import DietGenerationJobRepository
+from backend.diet_generation.enums.job_status import DietGenerationJobStatus
+from backend.diet_generation.meal_retrieval_index import get_meal_retrieval_index, save_meal_retrieval_index
+from backend.diet_generation.schemas import DietGenerationJob
+from backend.settings import config
+from backend.users.user_repository import UserRepository
+
+
+class DietGenerationWorker:
+    def __init__(self, job_repository: DietGenerationJobRepository, session_factory=SessionLocal):
+        self.job_repository = job_repository
+        self.session_factory = session_factory
+
+    async def run(self):
+        # Jobs of workers which died without finishing are queued again on startup and whenever the queue is idle
+        job_id = None
+        while True:
+            try:
+                if not job_id:
+                    await self._requeue_abandoned_jobs()
+                job_id = await self.job_repository.dequeue_job_id(config.DIET_GENERATION_QUEUE_POLL_TIMEOUT_SECONDS)
+            except RedisError as e:
+                logger.error(f"Diet generation worker cannot reach the queue: {str(e)}")
+                await asyncio.sleep(config.DIET_GENERATION_QUEUE_POLL_TIMEOUT_SECONDS)
+                continue
+
+            if job_id:
+                await self.process_job(job_id)
+
+    async def _requeue_abandoned_jobs(self):
+        requeued = await self.job_repository.requeue_abandoned_jobs()
+        if requeued:
+            logger.warning(f"{requeued} diet generation job(s) of stopped workers queued again")
+
+    async def process_job(self, job_id: UUID):
+        job = await self.job_repository.get_job(job_id)
+        if not job or job.status.is_finished:
+            logger.debug(f"Diet generation job {job_id} expired or finished before processing")
+            await self.job_repository.complete_job(job_id)
+            return
+
+        async def report_progress(job_status: DietGenerationJobStatus):
+            await self._update_job(job, job_status)
+
+        heartbeat = asyncio.create_task(self._renew_lease(job_id))
+        try:
+            async with self.session_factory() as db:
+                user = await UserRepository(db).get_user_by_id(job.user_id)
+                if not user:
+                    raise NotFoundInDatabaseException("User not found.")
+                await build_prompt_service(db).generate_meal_plan(user, job.day, progress=report_progress)
+        except asyncio.CancelledError:
+            # Worker shutdown, the job is generated from scratch by the next worker
+            logger.info(f"Diet generation job {job_id} interrupted, queued again")
+            await self._update_job(job, DietGenerationJobStatus.QUEUED)
+            await self.job_repository.requeue_job(job_id)
+            raise
+        except (HTTPException, NotFoundInDatabaseException, ValueErrorException) as e:
+            logger.debug(f"Diet generation job {job_id} failed: {e.detail}")
+            await self._finish_job(job, DietGenerationJobStatus.FAILED, str(e.detail))
+        except Exception:
+            logger.exception(f"Diet generation job {job_id} failed")
+            await self._finish_job(job, DietGenerationJobStatus.FAILED, "Error while generating meal plan")
+        else:
+            await self._finish_job(job, DietGenerationJobStatus.SAVED)
+        finally:
+            heartbeat.cancel()
+
+    async def _renew_lease(self, job_id: UUID):
+        while True:
+            await asyncio.sleep(config.DIET_GENERATION_JOB_LEASE_SECONDS / 3)
+            try:
+                await self.job_repository.renew_lease(job_id)
+            except RedisError as e:
+                logger.warning(f"Lease of diet generation job {job_id} not renewed: {str(e)}")
+
+    async def _finish_job(self, job: DietGenerationJob, job_status: DietGenerationJobStatus, detail: str | None = None):
+        await self._update_job(job, job_status, detail)
+        await self.job_repository.complete_job(job.job_id)
+
+    async def _update_job(self, job: DietGenerationJob, job_status: DietGenerationJobStatus, detail: str | None = None):
+        job.status = job_status
+        job.detail = detail
+        await self.job_repository.save_job(job)
+
+
+def start_diet_generation_workers(count: int) -> List[asyncio.Task]:
+    worker = DietGenerationWorker(DietGenerationJobRepository(redis_queue))
+    return [asyncio.create_task(worker.run(), name=f"diet-generation-worker-{i}") for i in range(count)]
+
+
+async def stop_diet_generation_workers(tasks: List[asyncio.Task]):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def main():
+    count = max(config.DIET_GENERATION_WORKERS, 1)
+    logger.info(f"Starting {count} diet generation worker(s)")
+    warm_up_diet_agent_graphs()
+    get_meal_retrieval_index()
+    try:
+        await asyncio.gather(*start_diet_generation_workers(count))
+    finally:
+        await save_meal_retrieval_index()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
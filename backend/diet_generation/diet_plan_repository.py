@@ -0,0 +1,55 @@
+from typing import List
+from uuid import UUID
+
+from sqlalchemy import delete
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.daily_summary.schemas import DailyMealsCreate
+from backend.models import ComposedMealItem, DailySummary, Meal, MealRecipe
+from backend.models.meal_type_daily_summary import MealTypeDailySummary
+
+
+class DietPlanRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def save_diet_plans(
+        self, user_id: UUID, daily_meals: List[DailyMealsCreate], meals: List[Meal], meal_recipes: List[MealRecipe]
+    ):
+        """New meals, recipes and daily summaries of several days, the caller commits them in one transaction"""
+        days = [daily_meals_data.day for daily_meals_data in daily_meals]
+        # Meal type links and composed items are removed by the ON DELETE CASCADE
+        await self.db.execute(delete(DailySummary).where(DailySummary.user_id == user_id, DailySummary.day.in_(days)))
+
+        self.db.add_all(meals)
+        self.db.add_all(meal_recipes)
+        await self.db.flush()
+
+        self.db.add_all([self._to_daily_summary(user_id, daily_meals_data) for daily_meals_data in daily_meals])
+        await self.db.flush()
+
+    @staticmethod
+    def _to_daily_summary(user_id: UUID, daily_meals_data: DailyMealsCreate) -> DailySummary:
+        return DailySummary(
+            user_id=user_id,
+            **daily_meals_data.model_dump(exclude={"meals"}),
+            daily_meals=[
+                MealTypeDailySummary(
+                    meal_type=meal_type,
+                    status=meal_infos[0].status,
+                    meal_items=[
+                        ComposedMealItem(
+                            meal_id=meal.meal_id,
+                            planned_calories=meal.planned_calories,
+                            planned_protein=meal.planned_protein,
+                            planned_fat=meal.planned_fat,
+                            planned_carbs=meal.planned_carbs,
+                            planned_weight=meal.planned_weight,
+                        )
+                        for meal in meal_infos
+                    ],
+                )
+                for meal_type, meal_infos in daily_meals_data.meals.items()
+                if meal_infos
+            ],
+        )
@@ -0,0 +1,14 @@
+from enum import Enum
+
+
+class DietGenerationJobStatus(str, Enum):
+    QUEUED = "queued"
+    GENERATING = "generating"
+    VALIDATING = "validating"
+    TRANSLATING = "translating"
+    SAVED = "saved"
+    FAILED = "failed"
+
+    @property
+    def is_finished(self) -> bool:
+        return self in (DietGenerationJobStatus.SAVED, DietGenerationJobStatus.FAILED)
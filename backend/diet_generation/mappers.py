@@ -4,7 +4,13 @@ from uuid import UUID
 
 from backend.daily_summary.enums.meal_status import MealStatus
 from backend.daily_summary.schemas import BasicMealInfo, DailyMealsCreate
-from backend.diet_generation.schemas import CompleteMeal, IngredientCreate, MealRecipeTranslation, StepCreate
+from backend.diet_generation.schemas import (
+    CompleteMeal,
+    IngredientCreate,
+    MealRecipeTranslation,
+    RetrievedMeal,
+    StepCreate,
+)
 from backend.meals.enums.meal_type import MealType
 from backend.models import Ingredient, Ingredients, Meal, MealRecipe, Step
 from backend.user_details.schemas import PredictedCalories
@@ -79,3 +85,20 @@ def to_empty_basic_meal_info(saved_meal: Meal, status: MealStatus = MealStatus.T
         planned_carbs=saved_meal.carbs,
         planned_fat=saved_meal.fat,
     )
+
+
+def to_scaled_basic_meal_info(meal: RetrievedMeal, status: MealStatus = MealStatus.TO_EAT) -> BasicMealInfo:
+    return BasicMealInfo(
+        meal_id=meal.meal_id,
+        status=status,
+        calories=meal.calories,
+        protein=meal.protein,
+        fat=meal.fat,
+        carbs=meal.carbs,
+        unit_weight=meal.weight,
+        planned_weight=int(round(meal.weight * meal.scale)),
+        planned_calories=int(round(meal.calories * meal.scale)),
+        planned_protein=round(meal.protein * meal.scale, 1),
+        planned_carbs=round(meal.carbs * meal.scale, 1),
+        planned_fat=round(meal.fat * meal.scale, 1),
+    )
@@ -0,0 +1,304 @@
+import asyncio
+import os
+from functools import cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from filelock import FileLock
+
+from backend.core.database import SessionLocal
+from backend.core.logger import logger
+from backend.diet_generation.schemas import DietGenerationInput, RetrievedMeal
+from backend.diet_generation.tools.macro_fitter import fit_macro_scales
+from backend.diet_generation.tools.nutrition_table import MACROS
+from backend.meals.enums.meal_type import MealType
+from backend.meals.repositories.meal_repository import MealRepository
+from backend.models import Meal
+from backend.settings import config
+from backend.user_details.enums import CookingSkills, DietaryRestriction
+from backend.user_details.enums.diet_style import DietStyle
+
+"""Local index over already generated meals, a day plan is assembled from them before the LLM is asked"""
+
+MEAL_TYPES = list(MealType)
+DIET_STYLES = list(DietStyle)
+# Ordered from the easiest, a meal is suitable for every user with at least its skills
+COOKING_SKILLS = list(CookingSkills)
+RESTRICTIONS = list(DietaryRestriction)
+
+UNKNOWN = -1
+MAX_PLANNED_WEIGHT = 2250
+
+
+def _code(values: List, value) -> int:
+    return values.index(value) if value is not None else UNKNOWN
+
+
+def _restrictions_mask(restrictions: Iterable[DietaryRestriction]) -> int:
+    mask = 0
+    for restriction in restrictions:
+        mask |= 1 << RESTRICTIONS.index(DietaryRestriction(restriction))
+    return mask
+
+
+class MealRetrievalIndex:
+    def __init__(
+        self,
+        path: Path | None = None,
+        min_scale: float = 0.5,
+        max_scale: float = 2.0,
+        candidates_per_slot: int = 5,
+        calorie_tolerance: float = 0.05,
+        macro_tolerance: float = 0.1,
+    ):
+        self.path = path
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.candidates_per_slot = candidates_per_slot
+        self.tolerances = np.array([calorie_tolerance] + [macro_tolerance] * (len(MACROS) - 1))
+
+        self.meal_ids: List[str] = []
+        self.meal_names: List[str] = []
+        self.meal_types = np.empty(0, dtype=np.int8)
+        self.macros = np.empty((0, len(MACROS)))
+        self.weights = np.empty(0)
+        self.restrictions = np.empty(0, dtype=np.int64)
+        self.diet_styles = np.empty(0, dtype=np.int8)
+        self.cooking_skills = np.empty(0, dtype=np.int8)
+        self._positions: Dict[str, int] = {}
+        self._removed_since_save: set[str] = set()
+        self.unsaved_changes = 0
+
+    def __len__(self) -> int:
+        return len(self.meal_ids)
+
+    def add_meals(self, meals: Sequence[Meal], targets: DietGenerationInput | None = None):
+        """Meals are tagged with the restrictions, diet style and skills of the input they were generated for"""
+        meals = [meal for meal in meals if str(meal.id) not in self._positions]
+        if not meals:
+            return
+
+        count = len(meals)
+        restrictions = _restrictions_mask(targets.dietary_restriction) if targets else 0
+        diet_style = _code(DIET_STYLES, targets.diet_style) if targets else UNKNOWN
+        cooking_skills = _code(COOKING_SKILLS, targets.cooking_skills) if targets else UNKNOWN
+
+        self._append_arrays(
+            {
+                "meal_ids": np.array([str(meal.id) for meal in meals], dtype=str),
+                "meal_names": np.array([meal.meal_name for meal in meals], dtype=str),
+                "meal_types": np.array([MEAL_TYPES.index(MealType(meal.meal_type)) for meal in meals], dtype=np.int8),
+                "macros": np.array([[float(getattr(meal, macro)) for macro in MACROS] for meal in meals]),
+                "weights": np.array([float(meal.weight) for meal in meals]),
+                "restrictions": np.full(count, restrictions, dtype=np.int64),
+                "diet_styles": np.full(count, diet_style, dtype=np.int8),
+                "cooking_skills": np.full(count, cooking_skills, dtype=np.int8),
+            }
+        )
+        self._removed_since_save.difference_update(str(meal.id) for meal in meals)
+        self.unsaved_changes += count
+
+    def remove_meals(self, meal_ids: Iterable[UUID]):
+        removed = {str(meal_id) for meal_id in meal_ids} & self._positions.keys()
+        if not removed:
+            return
+
+        keep = np.array([meal_id not in removed for meal_id in self.meal_ids], dtype=bool)
+        self._set_arrays({name: values[keep] for name, values in self._arrays().items()})
+        self._removed_since_save |= removed
+        self.unsaved_changes += len(removed)
+
+    def build_day_plan(self, targets: DietGenerationInput) -> List[RetrievedMeal] | None:
+        """Nearest meal of every type, then portions are fitted; None when the index cannot cover the targets"""
+        target = np.array([getattr(targets, macro) for macro in MACROS], dtype=float)
+        candidates = self._candidates(targets)
+
+        slots = []
+        for meal_type in targets.meal_types:
+            rows = np.flatnonzero(candidates & (self.meal_types == MEAL_TYPES.index(MealType(meal_type))))
+            if not rows.size:
+                return None
+            slots.append(rows)
+
+        # Share of the day taken by each meal type follows what was generated for it so far
+        shares = np.array([self.macros[rows, 0].mean() for rows in slots])
+        if shares.sum() > 0:
+            shares /= shares.sum()
+        else:
+            # Only meals without calories so far, nothing to follow
+            shares = np.full(len(slots), 1 / len(slots))
+        options = [self._nearest(rows, target * share) for rows, share in zip(slots, shares)]
+
+        rows, scales, error = self._search(options, target)
+        if error > 1.0:
+            return None
+
+        return [
+            RetrievedMeal(
+                meal_id=UUID(self.meal_ids[row]),
+                meal_name=self.meal_names[row],
+                meal_type=MEAL_TYPES[self.meal_types[row]].value,
+                calories=int(self.macros[row, 0]),
+                protein=self.macros[row, 1],
+                carbs=self.macros[row, 2],
+                fat=self.macros[row, 3],
+                weight=int(self.weights[row]),
+                scale=round(float(scale), 3),
+            )
+            for row, scale in zip(rows, scales)
+        ]
+
+    def _candidates(self, targets: DietGenerationInput) -> np.ndarray:
+        required = _restrictions_mask(targets.dietary_restriction)
+        candidates = (self.restrictions & required) == required
+        candidates &= self.weights * self.max_scale <= MAX_PLANNED_WEIGHT
+        if targets.diet_style:
+            candidates &= self.diet_styles == _code(DIET_STYLES, targets.diet_style)
+        if targets.cooking_skills:
+            candidates &= self.cooking_skills <= _code(COOKING_SKILLS, targets.cooking_skills)
+
+        previous_meals = {name.lower() for name in targets.previous_meals if isinstance(name, str)}
+        if previous_meals:
+            candidates &= np.array([name.lower() not in previous_meals for name in self.meal_names], dtype=bool)
+        return candidates
+
+    def _nearest(self, rows: np.ndarray, slot_target: np.ndarray) -> np.ndarray:
+        """Distance is measured after the portion is scaled to the calories of the slot"""
+        macros = self.macros[rows]
+        scales = np.clip(slot_target[0] / np.maximum(macros[:, 0], 1.0), self.min_scale, self.max_scale)
+        distances = np.linalg.norm((macros * scales[:, None] - slot_target) / np.maximum(slot_target, 1.0), axis=1)
+        return rows[np.argsort(distances, kind="stable")[: self.candidates_per_slot]]
+
+    def _fit(self, rows: List[int], target: np.ndarray) -> Tuple[np.ndarray, float]:
+        macros = self.macros[rows].T
+        scales = fit_macro_scales(macros, target, self.min_scale, self.max_scale)
+        relative_errors = np.abs(macros @ scales - target) / np.maximum(target, 1.0)
+        return scales, float(np.max(relative_errors / self.tolerances))
+
+    def _search(self, options: List[np.ndarray], target: np.ndarray) -> Tuple[List[int], np.ndarray, float]:
+        """Starts from the nearest meals and swaps single meals while it reduces the error"""
+        rows = [int(slot_options[0]) for slot_options in options]
+        scales, error = self._fit(rows, target)
+
+        improved = True
+        while improved and error > 1.0:
+            improved = False
+            for slot, slot_options in enumerate(options):
+                for row in slot_options[1:]:
+                    candidate_rows = rows[:slot] + [int(row)] + rows[slot + 1 :]
+                    candidate_scales, candidate_error = self._fit(candidate_rows, target)
+                    if candidate_error < error:
+                        rows, scales, error, improved = candidate_rows, candidate_scales, candidate_error, True
+        return rows, scales, error
+
+    def _arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "meal_ids": np.array(self.meal_ids, dtype=str),
+            "meal_names": np.array(self.meal_names, dtype=str),
+            "meal_types": self.meal_types,
+            "macros": self.macros,
+            "weights": self.weights,
+            "restrictions": self.restrictions,
+            "diet_styles": self.diet_styles,
+            "cooking_skills": self.cooking_skills,
+        }
+
+    def _set_arrays(self, arrays: Dict[str, np.ndarray]):
+        self.meal_ids = arrays["meal_ids"].tolist()
+        self.meal_names = arrays["meal_names"].tolist()
+        self.meal_types = arrays["meal_types"]
+        self.macros = arrays["macros"].reshape(-1, len(MACROS))
+        self.weights = arrays["weights"]
+        self.restrictions = arrays["restrictions"]
+        self.diet_styles = arrays["diet_styles"]
+        self.cooking_skills = arrays["cooking_skills"]
+        self._positions = {meal_id: i for i, meal_id in enumerate(self.meal_ids)}
+
+    def _append_arrays(self, arrays: Dict[str, np.ndarray]):
+        current = self._arrays()
+        self._set_arrays({name: np.concatenate([current[name], values]) for name, values in arrays.items()})
+
+    @classmethod
+    def load(cls, path: Path, **kwargs) -> "MealRetrievalIndex":
+        index = cls(path, **kwargs)
+        if path.exists():
+            with np.load(path, allow_pickle=False) as arrays:
+                index._set_arrays({name: arrays[name] for name in arrays.files})
+        return index
+
+    async def save_if_needed(self, force: bool = False):
+        """Written every few new meals (and on shutdown) so a restart does not have to rebuild the index
+
+        Every worker process keeps its own copy, so meals the others saved meanwhile are merged in, not overwritten.
+        """
+        if not self.path or not self.unsaved_changes:
+            return
+        if force or self.unsaved_changes >= config.MEAL_RETRIEVAL_SAVE_EVERY:
+            arrays, removed = self._arrays(), self._removed_since_save
+            self.unsaved_changes = 0
+            self._removed_since_save = set()
+            saved_by_others = await asyncio.to_thread(self._merge_and_write, self.path, arrays, removed)
+            skipped = self._positions.keys() | self._removed_since_save
+            missing = np.array([meal_id not in skipped for meal_id in saved_by_others["meal_ids"]], dtype=bool)
+            if missing.any():
+                self._append_arrays({name: values[missing] for name, values in saved_by_others.items()})
+
+    @staticmethod
+    def _merge_and_write(path: Path, arrays: Dict[str, np.ndarray], removed: set[str]) -> Dict[str, np.ndarray]:
+        """Returns the meals found only in the file, they are written back together with the given ones"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with FileLock(path.with_name(f"{path.name}.lock")):
+            saved_by_others = {name: values[:0] for name, values in arrays.items()}
+            if path.exists():
+                with np.load(path, allow_pickle=False) as saved:
+                    skipped = set(arrays["meal_ids"].tolist()) | removed
+                    missing = np.array([meal_id not in skipped for meal_id in saved["meal_ids"]], dtype=bool)
+                    saved_by_others = {name: saved[name][missing] for name in arrays}
+
+            merged = {name: np.concatenate([values, saved_by_others[name]]) for name, values in arrays.items()}
+            temporary_path = path.with_name(f"{path.name}.tmp")
+            with open(temporary_path, "wb") as file:
+                np.savez(file, **merged)
+            os.replace(temporary_path, path)
+        return saved_by_others
+
+
+@cache
+def get_meal_retrieval_index() -> MealRetrievalIndex | None:
+    if not config.MEAL_RETRIEVAL_ENABLED:
+        return None
+
+    index = MealRetrievalIndex.load(
+        Path(config.MEAL_RETRIEVAL_INDEX_PATH),
+        calorie_tolerance=config.MEAL_RETRIEVAL_CALORIE_TOLERANCE,
+        macro_tolerance=config.MEAL_RETRIEVAL_MACRO_TOLERANCE,
+    )
+    logger.info(f"Meal retrieval index loaded with {len(index)} meals")
+    return index
+
+
+async def save_meal_retrieval_index():
+    index = get_meal_retrieval_index()
+    if index is not None:
+        await index.save_if_needed(force=True)
+
+
+async def rebuild_meal_retrieval_index():
+    """Adds generated meals missing in the index (without tags, so only for users without restrictions)"""
+    index = get_meal_retrieval_index()
+    if index is None:
+        return
+
+    async with SessionLocal() as db:
+        meals = await MealRepository(db).get_generated_meals()
+
+    index.remove_meals(set(index.meal_ids) - {str(meal.id) for meal in meals})
+    index.add_meals(meals)
+    await index.save_if_needed(force=True)
+    logger.info(f"Meal retrieval index rebuilt with {len(index)} meals")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_meal_retrieval_index())
@@ -1,7 +1,10 @@
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+from backend.diet_generation.enums.job_status import DietGenerationJobStatus
 from backend.user_details.enums import CookingSkills, DailyBudget, DietaryRestriction
 from backend.user_details.enums.diet_style import DietStyle
 
@@ -51,6 +54,18 @@ class DietGenerationInput(BaseModel):
     cooking_skills: Optional[CookingSkills] = None
 
 
+class RetrievedMeal(BaseModel):
+    meal_id: UUID
+    meal_name: str
+    meal_type: str
+    calories: int
+    protein: float
+    carbs: float
+    fat: float
+    weight: int
+    scale: float = 1.0
+
+
 class MealRecipeTranslation(BaseModel):
     meal_name: str = Field(min_length=1)
     meal_description: str = Field(min_length=1)
@@ -72,3 +87,13 @@ def agent_state_to_dict(state: AgentState) -> Dict[str, Any]:
 
 def create_agent_state(targets: DietGenerationInput) -> AgentState:
     return AgentState(targets=targets).model_dump()
+
+
+class DietGenerationJob(BaseModel):
+    job_id: UUID
+    user_id: UUID
+    day: date
+    status: DietGenerationJobStatus = Field(default=DietGenerationJobStatus.QUEUED)
+    detail: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,207 @@
+import asyncio
+import uuid
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.core.unit_of_work import UnitOfWork
+from backend.diet_generation.agent.graph_builder import get_diet_agent_graph
+from backend.diet_generation.daily_meals_generator_service import DailyMealsGeneratorService
+from backend.diet_generation.mappers import recipe_to_meal_recipe_translation
+from backend.diet_generation.schemas import CompleteMeal, IngredientCreate, StepCreate
+from backend.diet_generation.tools.planner import PlannerTool
+from backend.diet_generation.tools.translator import TranslatorTool
+from backend.meals.enums.meal_type import MealType
+from backend.meals.test.test_data import MEAL_RECIPES
+from backend.users.enums.language import Language
+
+
+@pytest.fixture
+def mock_meal_gateway():
+    gateway = AsyncMock()
+    gateway.add_meal_recipes = AsyncMock()
+    return gateway
+
+
+@pytest.fixture
+def generator_service(mock_meal_gateway):
+    service = DailyMealsGeneratorService(mock_meal_gateway, AsyncMock(), AsyncMock())
+    service.translator = MagicMock()
+    service.translator.translate_meal_recipe_to_polish = AsyncMock()
+    return service
+
+
+def make_meal():
+    meal = MagicMock()
+    meal.id = uuid.uuid4()
+    return meal
+
+
+@pytest.mark.asyncio
+async def test_translate_and_save_recipes_translates_concurrently_and_saves_once(generator_service, mock_meal_gateway):
+    # Given
+    meals = [make_meal(), make_meal()]
+    recipes = [MEAL_RECIPES[0], MEAL_RECIPES[0]]
+    in_flight = 0
+    max_in_flight = 0
+
+    async def translate(recipe):
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return recipe
+
+    generator_service.translator.translate_meal_recipe_to_polish.side_effect = translate
+
+    # When
+    with patch("backend.diet_generation.daily_meals_generator_service.config.DIET_TRANSLATION_CONCURRENCY", 2):
+        await generator_service._translate_and_save_recipes(meals, recipes)
+
+    # Then
+    assert max_in_flight == 2
+    mock_meal_gateway.add_meal_recipes.assert_awaited_once()
+    saved_recipes = mock_meal_gateway.add_meal_recipes.await_args.args[0]
+    assert [recipe.meal_id for recipe in saved_recipes] == [meal.id for meal in meals]
+    assert all(recipe.language == Language.PL for recipe in saved_recipes)
+
+
+@pytest.mark.asyncio
+async def test_translate_and_save_recipes_skips_failed_translations(generator_service, mock_meal_gateway):
+    # Given
+    meals = [make_meal(), make_meal()]
+    recipes = [MEAL_RECIPES[0], MEAL_RECIPES[0]]
+    translation = recipe_to_meal_recipe_translation(MEAL_RECIPES[0])
+    generator_service.translator.translate_meal_recipe_to_polish.side_effect = [
+        translation,
+        RuntimeError("LLM unavailable"),
+    ]
+
+    # When
+    await generator_service._translate_and_save_recipes(meals, recipes)
+
+    # Then
+    saved_recipes = mock_meal_gateway.add_meal_recipes.await_args.args[0]
+    assert len(saved_recipes) == 1
+
+
+def test_planner_and_translator_share_one_llm_client():
+    # When
+    planner, translator = PlannerTool(), TranslatorTool()
+
+    # Then
+    assert planner.llm is translator.llm
+
+
+def test_compiled_graph_is_reused_per_meals_per_day():
+    # When
+    graph = get_diet_agent_graph(4)
+
+    # Then
+    assert get_diet_agent_graph(4) is graph
+    assert get_diet_agent_graph(5) is not graph
+
+
+def make_complete_meal(meal_type: MealType, name: str) -> CompleteMeal:
+    return CompleteMeal(
+        meal_name=name,
+        meal_type=meal_type.value,
+        meal_description="Description",
+        calories=600,
+        protein=40,
+        carbs=60,
+        fat=20,
+        weight=400,
+        ingredients_list=[IngredientCreate(volume=100, unit="g", name="house dressing")],
+        steps=[StepCreate(description="Cook")],
+    )
+
+
+@pytest.mark.asyncio
+async def test_generate_week_loads_context_once_and_saves_all_days_together(mock_meal_gateway):
+    # Given
+    user_details_gateway = AsyncMock()
+    user_details_gateway.get_user_details.return_value = SimpleNamespace(
+        dietary_restrictions=[], meals_per_day=3, diet_style=None, daily_budget=None, cooking_skills=None
+    )
+    user_details_gateway.get_user_diet_predictions.return_value = SimpleNamespace(
+        user_id=uuid.uuid4(), target_calories=1800, predicted_macros=SimpleNamespace(protein=120, carbs=180, fat=60)
+    )
+    daily_summary_gateway = AsyncMock()
+    daily_summary_gateway.get_last_generated_meals.return_value = ["Old soup"]
+    mock_meal_gateway.get_meal_icon_ids.return_value = {meal_type: uuid.uuid4() for meal_type in MealType}
+    diet_plan_repository = AsyncMock()
+    unit_of_work = UnitOfWork(AsyncMock())
+    service = DailyMealsGeneratorService(
+        mock_meal_gateway, daily_summary_gateway, user_details_gateway, None, diet_plan_repository, unit_of_work
+    )
+    service._translate_and_save_recipes = AsyncMock()
+    seen_previous_meals = []
+
+    async def run_agent(_app, state, _progress):
+        previous_meals = state["targets"]["previous_meals"]
+        seen_previous_meals.append(previous_meals)
+        day = len(seen_previous_meals)
+        return {
+            "current_plan": [
+                make_complete_meal(meal_type, f"{meal_type.value} {day}") for meal_type in MealType.daily_meals(3)
+            ]
+        }
+
+    service._run_agent = run_agent
+    start_day = date.today() + timedelta(days=1)
+
+    # When
+    with patch("backend.diet_generation.daily_meals_generator_service.config.DIET_WEEK_GENERATION_CONCURRENCY", 1):
+        week = await service.generate_week_meal_plan(MagicMock(), start_day, 3)
+
+    # Then
+    assert list(week) == [start_day + timedelta(days=offset) for offset in range(3)]
+    user_details_gateway.get_user_details.assert_awaited_once()
+    mock_meal_gateway.get_meal_icon_ids.assert_awaited_once()
+    assert seen_previous_meals[0] == ["Old soup"]
+    assert "lunch 1" in seen_previous_meals[1]
+    assert {"lunch 1", "lunch 2"} <= set(seen_previous_meals[2])
+    diet_plan_repository.save_diet_plans.assert_awaited_once()
+    unit_of_work.db.commit.assert_awaited_once()
+    _, daily_meals, meals, recipes = diet_plan_repository.save_diet_plans.await_args.args
+    assert [daily_meals_data.day for daily_meals_data in daily_meals] == list(week)
+    assert len(meals) == len(recipes) == 9
+    assert [recipe.meal_id for recipe in week[start_day]] == [meal.id for meal in meals[:3]]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_days_do_not_repeat_meals_of_each_other(mock_meal_gateway):
+    # Given
+    service = DailyMealsGeneratorService(mock_meal_gateway, AsyncMock(), AsyncMock())
+    input_data = SimpleNamespace(
+        meals_per_day=3,
+        model_copy=lambda update: SimpleNamespace(previous_meals=update["previous_meals"]),
+    )
+    calls = []
+
+    async def run_agent(_app, state, _progress):
+        calls.append(state)
+        await asyncio.sleep(0.01)
+        suffix = "again" if "lunch salad" in state["previous_meals"] else "salad"
+        return {"current_plan": [make_complete_meal(MealType.LUNCH, f"lunch {suffix}")]}
+
+    service._run_agent = run_agent
+    days = [date.today() + timedelta(days=offset) for offset in range(2)]
+
+    # When
+    with (
+        patch("backend.diet_generation.daily_meals_generator_service.config.DIET_WEEK_GENERATION_CONCURRENCY", 2),
+        patch(
+            "backend.diet_generation.daily_meals_generator_service.create_agent_state",
+            side_effect=lambda day_input: {"previous_meals": day_input.previous_meals},
+        ),
+    ):
+        plans = await service._plan_days(days, input_data, [], use_index=False)
+
+    # Then
+    assert sorted(plan[0].meal_name for plan in plans.values()) == ["lunch again", "lunch salad"]
+    assert len(calls) == 3
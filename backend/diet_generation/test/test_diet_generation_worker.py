@@ -0,0 +1,269 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
+from backend.core.value_error_exception import ValueErrorException
+from backend.diet_generation.daily_meals_generator_service import DailyMealsGeneratorService
+from backend.diet_generation.diet_generation_job_repository import DietGenerationJobRepository
+from backend.diet_generation.diet_generation_job_service import DietGenerationJobService
+from backend.diet_generation.diet_generation_worker import DietGenerationWorker
+from backend.diet_generation.enums.job_status import DietGenerationJobStatus
+from backend.diet_generation.schemas import DietGenerationJob
+from backend.models import User
+from backend.settings import config
+
+user = User(id=uuid.uuid4(), email="test@example.com")
+
+
+def make_job(**overrides):
+    now = datetime.now(timezone.utc)
+    data = dict(job_id=uuid.uuid4(), user_id=user.id, day=date.today(), created_at=now, updated_at=now)
+    data.update(overrides)
+    return DietGenerationJob(**data)
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return MagicMock()
+
+    async def __aexit__(self, *args):
+        return False
+
+
+class FakeAgent:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def astream(self, initial_state, stream_mode):
+        for chunk in self.chunks:
+            yield chunk
+
+
+@pytest.fixture
+def mock_job_repository():
+    repo = AsyncMock()
+    repo.get_job = AsyncMock()
+    repo.save_job = AsyncMock()
+    repo.enqueue_job = AsyncMock()
+    return repo
+
+
+@pytest.fixture
+def worker(mock_job_repository):
+    return DietGenerationWorker(mock_job_repository, session_factory=FakeSession)
+
+
+@pytest.mark.asyncio
+async def test_worker_reports_progress_and_marks_job_saved(worker, mock_job_repository):
+    # Given
+    job = make_job()
+    mock_job_repository.get_job.return_value = job
+    saved = []
+    mock_job_repository.save_job.side_effect = lambda j: saved.append(j.status)
+
+    async def generate_meal_plan(_user, _day, progress):
+        await progress(DietGenerationJobStatus.GENERATING)
+        await progress(DietGenerationJobStatus.TRANSLATING)
+
+    prompt_service = MagicMock()
+    prompt_service.generate_meal_plan = generate_meal_plan
+
+    # When
+    with (
+        patch("backend.diet_generation.diet_generation_worker.UserRepository") as user_repository,
+        patch("backend.diet_generation.diet_generation_worker.build_prompt_service", return_value=prompt_service),
+    ):
+        user_repository.return_value.get_user_by_id = AsyncMock(return_value=user)
+        await worker.process_job(job.job_id)
+
+    # Then
+    assert saved == [
+        DietGenerationJobStatus.GENERATING,
+        DietGenerationJobStatus.TRANSLATING,
+        DietGenerationJobStatus.SAVED,
+    ]
+    mock_job_repository.complete_job.assert_awaited_once_with(job.job_id)
+
+
+@pytest.mark.asyncio
+async def test_worker_marks_job_failed_with_error_detail(worker, mock_job_repository):
+    # Given
+    job = make_job()
+    mock_job_repository.get_job.return_value = job
+    prompt_service = MagicMock()
+    prompt_service.generate_meal_plan = AsyncMock(side_effect=ValueErrorException("Cannot generate diet."))
+
+    # When
+    with (
+        patch("backend.diet_generation.diet_generation_worker.UserRepository") as user_repository,
+        patch("backend.diet_generation.diet_generation_worker.build_prompt_service", return_value=prompt_service),
+    ):
+        user_repository.return_value.get_user_by_id = AsyncMock(return_value=user)
+        await worker.process_job(job.job_id)
+
+    # Then
+    assert job.status == DietGenerationJobStatus.FAILED
+    assert job.detail == "Cannot generate diet."
+
+
+@pytest.mark.asyncio
+async def test_cancelled_job_is_queued_again(worker, mock_job_repository):
+    # Given
+    job = make_job(status=DietGenerationJobStatus.GENERATING)
+    mock_job_repository.get_job.return_value = job
+    prompt_service = MagicMock()
+    prompt_service.generate_meal_plan = AsyncMock(side_effect=asyncio.CancelledError)
+
+    # When
+    with (
+        patch("backend.diet_generation.diet_generation_worker.UserRepository") as user_repository,
+        patch("backend.diet_generation.diet_generation_worker.build_prompt_service", return_value=prompt_service),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        user_repository.return_value.get_user_by_id = AsyncMock(return_value=user)
+        await worker.process_job(job.job_id)
+
+    # Then
+    assert job.status == DietGenerationJobStatus.QUEUED
+    mock_job_repository.requeue_job.assert_awaited_once_with(job.job_id)
+    mock_job_repository.complete_job.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_finished_job_taken_again_is_not_generated(worker, mock_job_repository):
+    # Given
+    job = make_job(status=DietGenerationJobStatus.SAVED)
+    mock_job_repository.get_job.return_value = job
+
+    # When
+    with patch("backend.diet_generation.diet_generation_worker.build_prompt_service") as build_prompt_service:
+        await worker.process_job(job.job_id)
+
+    # Then
+    build_prompt_service.assert_not_called()
+    mock_job_repository.complete_job.assert_awaited_once_with(job.job_id)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_returns_job_which_claimed_the_day_first():
+    # Given
+    active_job = make_job(status=DietGenerationJobStatus.GENERATING)
+    raw_values = {
+        f"diet_generation:active:{user.id}:{active_job.day.isoformat()}": str(active_job.job_id).encode(),
+        f"diet_generation:job:{active_job.job_id}": active_job.model_dump_json().encode(),
+    }
+    redis = MagicMock()
+    redis.set = AsyncMock(return_value=None)
+    redis.get = AsyncMock(side_effect=lambda key: raw_values.get(key))
+    repository = DietGenerationJobRepository(redis)
+
+    # When
+    job = await repository.enqueue_job(user.id, active_job.day)
+
+    # Then
+    assert job.job_id == active_job.job_id
+    assert redis.set.await_args.kwargs["nx"] is True
+    redis.pipeline.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_job_is_moved_to_processing_list_together_with_its_lease():
+    # Given
+    job_id = uuid.uuid4()
+    claim_script = AsyncMock(return_value=[str(job_id).encode()])
+    redis = MagicMock()
+    redis.blmove = AsyncMock(return_value=str(job_id).encode())
+    redis.register_script.return_value = claim_script
+    repository = DietGenerationJobRepository(redis)
+
+    # When
+    dequeued_job_id = await repository.dequeue_job_id(timeout=5)
+
+    # Then
+    assert dequeued_job_id == job_id
+    redis.blmove.assert_awaited_once_with(repository.QUEUE_KEY, repository.QUEUE_KEY, 5, "RIGHT", "RIGHT")
+    assert "SET" in redis.register_script.call_args.args[0]
+    claim_script.assert_awaited_once_with(
+        keys=[repository.QUEUE_KEY, repository.PROCESSING_KEY],
+        args=[repository.LEASE_KEY_PREFIX, config.DIET_GENERATION_JOB_LEASE_SECONDS, 1],
+    )
+
+
+@pytest.mark.asyncio
+async def test_abandoned_jobs_are_checked_and_queued_again_by_one_script():
+    # Given
+    leased_job_id, abandoned_job_id = uuid.uuid4(), uuid.uuid4()
+    requeue_script = AsyncMock(return_value=[str(abandoned_job_id).encode()])
+    redis = MagicMock()
+    redis.lrange = AsyncMock(return_value=[str(leased_job_id).encode(), str(abandoned_job_id).encode()])
+    redis.register_script.return_value = requeue_script
+    repository = DietGenerationJobRepository(redis)
+
+    # When
+    requeued = await repository.requeue_abandoned_jobs()
+
+    # Then
+    assert requeued == 1
+    requeue_script.assert_awaited_once_with(
+        keys=[repository.PROCESSING_KEY, repository.QUEUE_KEY],
+        args=[repository.LEASE_KEY_PREFIX, 1, str(leased_job_id), str(abandoned_job_id)],
+    )
+    redis.pipeline.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_agent_reports_each_correction_loop():
+    # Given
+    service = DailyMealsGeneratorService(AsyncMock(), AsyncMock(), AsyncMock())
+    progress = AsyncMock()
+    agent = FakeAgent(
+        [
+            ("values", {"current_plan": None}),
+            ("updates", {"generate": {"current_plan": []}}),
+            ("values", {"current_plan": []}),
+            ("updates", {"validate": {"validation_report": "Too many calories"}}),
+            ("updates", {"generate": {"current_plan": ["meal"]}}),
+            ("values", {"current_plan": ["meal"]}),
+            ("updates", {"validate": {"validation_report": "OK"}}),
+        ]
+    )
+
+    # When
+    final_state = await service._run_agent(agent, {"current_plan": None}, progress)
+
+    # Then
+    assert final_state == {"current_plan": ["meal"]}
+    assert [call.args[0] for call in progress.await_args_list] == [
+        DietGenerationJobStatus.GENERATING,
+        DietGenerationJobStatus.VALIDATING,
+        DietGenerationJobStatus.GENERATING,
+        DietGenerationJobStatus.VALIDATING,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_enqueue_rejects_past_days(mock_job_repository):
+    # Given
+    service = DietGenerationJobService(mock_job_repository)
+
+    # When
+    with pytest.raises(ValueErrorException):
+        await service.enqueue_meal_plan_generation(user, date.today() - timedelta(days=1))
+
+    # Then
+    mock_job_repository.enqueue_job.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_job_of_another_user_raises_not_found(mock_job_repository):
+    # Given
+    service = DietGenerationJobService(mock_job_repository)
+    mock_job_repository.get_job.return_value = make_job(user_id=uuid.uuid4())
+
+    # When / Then
+    with pytest.raises(NotFoundInDatabaseException):
+        await service.get_job(user, uuid.uuid4())
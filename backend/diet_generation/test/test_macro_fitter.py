@@ -0,0 +1,135 @@
+import numpy as np
+import pytest
+
+from backend.diet_generation.schemas import AgentState, CompleteMeal, DietGenerationInput, IngredientCreate, StepCreate
+from backend.diet_generation.tools.macro_fitter import (
+    MacroFitterTool,
+    round_preserving_sum,
+    solve_bounded_least_squares,
+)
+from backend.diet_generation.tools.validator import ValidatorTool
+from backend.meals.enums.meal_type import MealType
+
+
+def make_meal(meal_type: MealType, calories: int, protein: float, carbs: float, fat: float) -> CompleteMeal:
+    return CompleteMeal(
+        meal_name=f"{meal_type.value} meal",
+        meal_type=meal_type.value,
+        meal_description="Description",
+        calories=calories,
+        protein=protein,
+        carbs=carbs,
+        fat=fat,
+        weight=400,
+        ingredients_list=[IngredientCreate(volume=100, unit="g", name="house dressing")],
+        steps=[StepCreate(description="Cook")],
+    )
+
+
+PLAN = [
+    make_meal(MealType.BREAKFAST, 500, 20, 80, 10),
+    make_meal(MealType.MORNING_SNACK, 200, 15, 10, 12),
+    make_meal(MealType.LUNCH, 700, 50, 60, 25),
+    make_meal(MealType.DINNER, 600, 45, 30, 30),
+]
+
+
+def make_targets(calories, protein, carbs, fat) -> DietGenerationInput:
+    return DietGenerationInput(
+        dietary_restriction=[],
+        meals_per_day=4,
+        meal_types=[meal_type.value for meal_type in MealType.daily_meals(4)],
+        calories=calories,
+        protein=protein,
+        carbs=carbs,
+        fat=fat,
+    )
+
+
+def test_solver_recovers_exact_scales():
+    # Given
+    matrix = np.array([[500, 200, 700, 600], [20, 15, 50, 45], [80, 10, 60, 30], [10, 12, 25, 30]], dtype=float)
+    expected = np.array([1.2, 0.8, 1.1, 0.9])
+
+    # When
+    scales = solve_bounded_least_squares(matrix, matrix @ expected, 0.5, 2.0)
+
+    # Then
+    np.testing.assert_allclose(scales, expected, rtol=1e-3)
+
+
+def test_solver_respects_bounds():
+    # When
+    scales = solve_bounded_least_squares(np.array([[100.0]]), np.array([1000.0]), 0.5, 2.0)
+
+    # Then
+    assert scales[0] == pytest.approx(2.0)
+
+
+def test_fitted_plan_passes_validation():
+    # Given
+    scales = [1.2, 0.8, 1.1, 0.9]
+    totals = {
+        macro: sum(getattr(meal, macro) * scale for meal, scale in zip(PLAN, scales))
+        for macro in ("calories", "protein", "carbs", "fat")
+    }
+    state = AgentState(targets=make_targets(**totals), current_plan=PLAN)
+    validator = ValidatorTool(4)
+
+    # When
+    fitted = MacroFitterTool().fit_plan(state)
+
+    # Then
+    assert validator.validate_plan(state)["validation_report"] != "OK"
+    fitted_state = state.model_copy(update=fitted)
+    assert validator.validate_plan(fitted_state)["validation_report"] == "OK"
+    assert fitted["current_plan"][0].ingredients_list[0].volume == pytest.approx(120, abs=1)
+    assert fitted["current_plan"][0].weight == pytest.approx(480, abs=5)
+
+
+def test_solver_returns_scales_closest_to_original_portions():
+    # Given
+    matrix = np.array([[1.0, 1.0]])
+
+    # When
+    scales = solve_bounded_least_squares(matrix, np.array([3.0]), 0.5, 2.0)
+
+    # Then
+    np.testing.assert_allclose(scales, [1.5, 1.5])
+
+
+def test_rounding_keeps_rounded_sum():
+    # When
+    rounded = round_preserving_sum(np.array([10.04, 20.04, 30.04, 40.04]), 1)
+
+    # Then
+    assert rounded.sum() == pytest.approx(100.2)
+    assert np.abs(rounded - [10.04, 20.04, 30.04, 40.04]).max() < 0.1
+
+
+def test_reachable_targets_pass_default_validation():
+    # Given
+    rng = np.random.default_rng(7)
+    validator = ValidatorTool(4)
+    failed = []
+
+    for _ in range(100):
+        plan = [
+            make_meal(meal_type, int(rng.integers(200, 800)), *np.round(rng.uniform([10, 10, 5], [50, 90, 30]), 1))
+            for meal_type in MealType.daily_meals(4)
+        ]
+        scales = rng.uniform(0.6, 1.8, len(plan))
+        totals = {
+            macro: sum(getattr(meal, macro) * scale for meal, scale in zip(plan, scales))
+            for macro in ("protein", "carbs", "fat")
+        }
+        calories = int(round(sum(meal.calories * scale for meal, scale in zip(plan, scales))))
+        state = AgentState(targets=make_targets(calories, **totals), current_plan=plan)
+
+        # When
+        fitted_state = state.model_copy(update=MacroFitterTool().fit_plan(state))
+
+        # Then
+        if validator.validate_plan(fitted_state)["validation_report"] != "OK":
+            failed.append(totals)
+    assert not failed
@@ -0,0 +1,191 @@
+import uuid
+import warnings
+from datetime import date
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import pytest
+
+from backend.diet_generation.daily_meals_generator_service import DailyMealsGeneratorService
+from backend.diet_generation.meal_retrieval_index import MealRetrievalIndex
+from backend.diet_generation.schemas import DietGenerationInput
+from backend.meals.enums.meal_type import MealType
+from backend.user_details.enums import CookingSkills, DietaryRestriction
+
+
+def make_meal(meal_type: MealType, calories: int, protein: float, carbs: float, fat: float, name: str | None = None):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        meal_name=name or f"{meal_type.value} {calories}",
+        meal_type=meal_type,
+        calories=calories,
+        protein=protein,
+        carbs=carbs,
+        fat=fat,
+        weight=400,
+    )
+
+
+def make_targets(calories, protein, carbs, fat, **kwargs) -> DietGenerationInput:
+    return DietGenerationInput(
+        dietary_restriction=kwargs.pop("dietary_restriction", []),
+        meals_per_day=3,
+        meal_types=[meal_type.value for meal_type in MealType.daily_meals(3)],
+        calories=calories,
+        protein=protein,
+        carbs=carbs,
+        fat=fat,
+        previous_meals=kwargs.pop("previous_meals", []),
+        **kwargs,
+    )
+
+
+BREAKFASTS = [make_meal(MealType.BREAKFAST, 500, 25, 70, 13), make_meal(MealType.BREAKFAST, 450, 15, 40, 25)]
+LUNCHES = [make_meal(MealType.LUNCH, 700, 50, 70, 23), make_meal(MealType.LUNCH, 800, 30, 100, 30)]
+DINNERS = [make_meal(MealType.DINNER, 600, 40, 50, 26), make_meal(MealType.DINNER, 550, 20, 80, 16)]
+
+
+@pytest.fixture
+def index():
+    index = MealRetrievalIndex()
+    index.add_meals(BREAKFASTS + LUNCHES + DINNERS)
+    return index
+
+
+def test_build_day_plan_scales_nearest_meals_to_targets(index):
+    # Given
+    scales = {BREAKFASTS[0].id: 1.2, LUNCHES[0].id: 0.9, DINNERS[0].id: 1.1}
+    meals = [BREAKFASTS[0], LUNCHES[0], DINNERS[0]]
+    totals = {m: sum(getattr(meal, m) * scales[meal.id] for meal in meals) for m in ("protein", "carbs", "fat")}
+    targets = make_targets(int(sum(meal.calories * scales[meal.id] for meal in meals)), **totals)
+
+    # When
+    plan = index.build_day_plan(targets)
+
+    # Then
+    assert plan is not None
+    assert [meal.meal_type for meal in plan] == targets.meal_types
+    for macro in ("calories", "protein", "carbs", "fat"):
+        planned = sum(getattr(meal, macro) * meal.scale for meal in plan)
+        assert planned == pytest.approx(getattr(targets, macro), rel=0.1)
+
+
+def test_build_day_plan_returns_none_when_targets_cannot_be_covered(index):
+    # When
+    plan = index.build_day_plan(make_targets(1800, 20, 20, 190))
+
+    # Then
+    assert plan is None
+
+
+def test_build_day_plan_falls_back_to_llm_when_meals_have_no_calories():
+    # Given
+    index = MealRetrievalIndex()
+    index.add_meals([make_meal(meal_type, 0, 0, 0, 0) for meal_type in MealType.daily_meals(3)])
+
+    # When
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        plan = index.build_day_plan(make_targets(1800, 120, 180, 60))
+
+    # Then
+    assert plan is None
+
+
+def test_build_day_plan_uses_only_meals_generated_for_the_restrictions(index):
+    # Given
+    safe_lunch = make_meal(MealType.LUNCH, 700, 50, 70, 23, name="lactose free lunch")
+    tagged_targets = make_targets(
+        1800, 100, 200, 60, dietary_restriction=[DietaryRestriction.LACTOSE], cooking_skills=CookingSkills.BEGINNER
+    )
+    index.add_meals([safe_lunch], tagged_targets)
+    targets = make_targets(1800, 100, 200, 60, dietary_restriction=[DietaryRestriction.LACTOSE])
+
+    # When
+    plan = index.build_day_plan(targets)
+
+    # Then
+    assert plan is None
+    assert index._candidates(targets).sum() == 1
+
+
+def test_build_day_plan_skips_previous_meals(index):
+    # Given
+    targets = make_targets(1800, 115, 190, 62, previous_meals=[BREAKFASTS[0].meal_name, BREAKFASTS[1].meal_name])
+
+    # When
+    plan = index.build_day_plan(targets)
+
+    # Then
+    assert plan is None
+
+
+@pytest.mark.asyncio
+async def test_index_is_saved_and_loaded_from_disk(index, tmp_path):
+    # Given
+    index.path = tmp_path / "index.npz"
+    index.remove_meals([LUNCHES[1].id])
+
+    # When
+    await index.save_if_needed(force=True)
+    loaded = MealRetrievalIndex.load(index.path)
+
+    # Then
+    assert len(loaded) == 5
+    assert loaded.meal_ids == index.meal_ids
+    assert loaded.macros.tolist() == index.macros.tolist()
+    assert index.unsaved_changes == 0
+    loaded.add_meals([LUNCHES[0], LUNCHES[1]])
+    assert len(loaded) == 6
+
+
+@pytest.mark.asyncio
+async def test_saving_merges_meals_indexed_by_other_processes(tmp_path):
+    # Given
+    path = tmp_path / "index.npz"
+    first = MealRetrievalIndex(path)
+    first.add_meals(BREAKFASTS + LUNCHES)
+    await first.save_if_needed(force=True)
+    second = MealRetrievalIndex.load(path)
+    extra_breakfast = make_meal(MealType.BREAKFAST, 400, 20, 50, 12)
+    first.add_meals([extra_breakfast])
+    second.add_meals(DINNERS, make_targets(1800, 100, 200, 60, dietary_restriction=[DietaryRestriction.LACTOSE]))
+    second.remove_meals([LUNCHES[0].id])
+
+    # When
+    await first.save_if_needed(force=True)
+    await second.save_if_needed(force=True)
+
+    # Then
+    loaded = MealRetrievalIndex.load(path)
+    expected_ids = {str(meal.id) for meal in BREAKFASTS + [extra_breakfast] + LUNCHES[1:] + DINNERS}
+    assert set(loaded.meal_ids) == expected_ids
+    assert set(second.meal_ids) == expected_ids
+    assert loaded.restrictions[loaded.meal_ids.index(str(DINNERS[0].id))] != 0
+
+
+@pytest.mark.asyncio
+async def test_generator_reuses_indexed_meals_without_calling_llm(index):
+    # Given
+    meal_gateway = AsyncMock()
+    daily_summary_gateway = AsyncMock()
+    service = DailyMealsGeneratorService(meal_gateway, daily_summary_gateway, AsyncMock(), index)
+    targets = make_targets(1800, 115, 190, 62)
+    plan = index.build_day_plan(targets)
+    meal_gateway.get_meal_recipes_by_meal_ids.return_value = [
+        SimpleNamespace(meal_id=meal.meal_id) for meal in reversed(plan)
+    ]
+    predictions = SimpleNamespace(
+        user_id=uuid.uuid4(),
+        target_calories=1800,
+        predicted_macros=SimpleNamespace(protein=115, carbs=190, fat=62),
+    )
+
+    # When
+    recipes = await service._reuse_indexed_meals(date.today(), targets, predictions)
+
+    # Then
+    assert [recipe.meal_id for recipe in recipes] == [meal.meal_id for meal in plan]
+    daily_meals = daily_summary_gateway.add_daily_meals.await_args.args[0]
+    lunch = daily_meals.meals[MealType.LUNCH.value][0]
+    assert lunch.planned_calories == round(lunch.calories * plan[1].scale)
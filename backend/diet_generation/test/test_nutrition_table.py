@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+
+from backend.diet_generation.schemas import AgentState, CompleteMeal, DietGenerationInput, IngredientCreate, StepCreate
+from backend.diet_generation.tools.macro_fitter import MacroFitterTool
+from backend.diet_generation.tools.nutrition_table import get_nutrition_table, parse_unit
+from backend.diet_generation.tools.validator import ValidatorTool
+from backend.meals.enums.meal_type import MealType
+from backend.meals.enums.unit import Unit
+from backend.users.enums.language import Language
+
+
+def make_meal(meal_type: MealType, ingredients) -> CompleteMeal:
+    return CompleteMeal(
+        meal_name=f"{meal_type.value} meal",
+        meal_type=meal_type.value,
+        meal_description="Description",
+        calories=0,
+        protein=0,
+        carbs=0,
+        fat=0,
+        weight=400,
+        ingredients_list=[IngredientCreate(volume=volume, unit=unit, name=name) for volume, unit, name in ingredients],
+        steps=[StepCreate(description="Cook")],
+    )
+
+
+BREAKFAST = make_meal(
+    MealType.BREAKFAST,
+    [(80, "g", "rolled oats"), (1, Unit.CUP.translate(Language.EN), "milk"), (1, "piece", "banana")],
+)
+LUNCH = make_meal(MealType.LUNCH, [(150, "g", "Chicken breast (grilled)"), (100, "", "rice"), (1, "tbsp", "olive oil")])
+DINNER = make_meal(MealType.DINNER, [(2, "pieces", "eggs"), (2, "slices", "whole wheat bread"), (50, "g", "avocado")])
+
+
+def test_parse_unit_accepts_codes_translations_and_plurals():
+    # Then
+    assert parse_unit("g") == Unit.GRAM
+    assert parse_unit("") == Unit.GRAM
+    assert parse_unit("Cups") == Unit.CUP
+    assert parse_unit("łyżka") == Unit.TABLESPOON
+    assert parse_unit("slices") == Unit.SLICE
+    assert parse_unit("bucket") is None
+
+
+def test_meal_nutrients_converts_units_to_grams():
+    # When
+    totals, covered = get_nutrition_table().meal_nutrients([BREAKFAST, LUNCH])
+
+    # Then
+    assert covered.tolist() == [True, True]
+    # 80 g oats + 240 ml milk (247.2 g) + 118 g banana
+    assert totals[0, 0] == pytest.approx(80 * 3.89 + 247.2 * 0.61 + 118 * 0.89)
+    # 150 g chicken + 100 g rice + 15 ml olive oil (13.65 g)
+    assert totals[1, 3] == pytest.approx(150 * 0.026 + 100 * 0.007 + 13.65 * 1.0)
+
+
+def test_meal_with_unknown_ingredient_is_not_covered():
+    # Given
+    ingredients = [(100, "g", "chicken breast"), (1, "bucket", "rice"), (50, "g", "dragon fruit jam")]
+    meal = make_meal(MealType.DINNER, ingredients)
+
+    # When
+    totals, covered = get_nutrition_table().meal_nutrients([meal])
+
+    # Then
+    assert not covered[0]
+    assert totals[0, 0] == pytest.approx(120)
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["butter beans", "rice vinegar", "egg noodles", "egg yolk", "banana bread", "tomato paste", "oat milk"],
+)
+def test_compound_ingredient_is_not_matched_by_its_part(name):
+    # Given
+    meal = make_meal(MealType.LUNCH, [(100, "g", "chicken breast"), (50, "g", name)])
+
+    # When
+    _, covered = get_nutrition_table().meal_nutrients([meal])
+
+    # Then
+    assert get_nutrition_table().lookup(name) == -1
+    assert not covered[0]
+    assert get_nutrition_table().ingredient_breakdown(meal) is None
+
+
+def test_lookup_matches_aliases_and_plurals():
+    # Given
+    table = get_nutrition_table()
+
+    # Then
+    assert table.lookup("Tomatoes") == table.lookup("tomato") >= 0
+    assert table.lookup("basmati rice") == table.lookup("rice") >= 0
+    assert table.lookup("Large eggs") == table.lookup("egg") >= 0
+
+
+def test_plans_nutrients_computes_whole_week_in_one_call():
+    # Given
+    table = get_nutrition_table()
+    week = [[BREAKFAST, LUNCH, DINNER] if day % 2 else [LUNCH, DINNER] for day in range(7)]
+
+    # When
+    results = table.plans_nutrients(week)
+
+    # Then
+    assert len(results) == 7
+    for plan, (totals, covered) in zip(week, results):
+        expected_totals, expected_covered = table.meal_nutrients(plan)
+        np.testing.assert_allclose(totals, expected_totals)
+        assert covered.tolist() == expected_covered.tolist()
+
+
+def test_validator_rejects_macros_that_do_not_match_ingredients():
+    # Given
+    totals, _ = get_nutrition_table().meal_nutrients([BREAKFAST, LUNCH, DINNER])
+    plan = [
+        meal.model_copy(update={"calories": int(round(c)), "protein": p, "carbs": cb, "fat": f})
+        for meal, (c, p, cb, f) in zip([BREAKFAST, LUNCH, DINNER], totals.round(1))
+    ]
+    targets = DietGenerationInput(
+        dietary_restriction=[],
+        meals_per_day=3,
+        meal_types=[meal_type.value for meal_type in MealType.daily_meals(3)],
+        calories=sum(meal.calories for meal in plan),
+        protein=sum(meal.protein for meal in plan),
+        carbs=sum(meal.carbs for meal in plan),
+        fat=sum(meal.fat for meal in plan),
+    )
+    wrong_plan = [plan[0].model_copy(update={"protein": plan[0].protein + 30, "carbs": plan[0].carbs - 30}), *plan[1:]]
+    validator = ValidatorTool(3, macro_tolerance=1, calorie_tolerance=5)
+
+    # When
+    valid_report = validator.validate_plan(AgentState(targets=targets, current_plan=plan))["validation_report"]
+    wrong_report = validator.validate_plan(AgentState(targets=targets, current_plan=wrong_plan))["validation_report"]
+
+    # Then
+    assert valid_report == "OK"
+    assert "breakfast meal: protein" in wrong_report
+    assert "do not match its ingredients" in wrong_report
+
+
+def test_fitter_scales_known_ingredients_and_recomputes_macros():
+    # Given
+    plan = [BREAKFAST, LUNCH, DINNER]
+    bigger_lunch = MacroFitterTool.scale_meal(LUNCH, 1.4)
+    totals, _ = get_nutrition_table().meal_nutrients([BREAKFAST, bigger_lunch, DINNER])
+    target = totals.sum(axis=0)
+    targets = DietGenerationInput(
+        dietary_restriction=[],
+        meals_per_day=3,
+        meal_types=[meal_type.value for meal_type in MealType.daily_meals(3)],
+        calories=int(round(target[0])),
+        protein=round(target[1], 1),
+        carbs=round(target[2], 1),
+        fat=round(target[3], 1),
+    )
+    state = AgentState(targets=targets, current_plan=plan)
+
+    # When
+    fitted = MacroFitterTool().fit_plan(state)
+
+    # Then
+    fitted_plan = fitted["current_plan"]
+    assert fitted_plan[1].ingredients_list[0].volume != LUNCH.ingredients_list[0].volume
+    assert ValidatorTool(3).validate_plan(state.model_copy(update=fitted))["validation_report"] == "OK"
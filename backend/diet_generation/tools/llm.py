@@ -0,0 +1,39 @@
+import asyncio
+from typing import Any, Dict
+
+import httpx
+from langchain_core.runnables import Runnable
+from langchain_ollama import OllamaLLM
+
+from backend.settings import config
+
+"""One Ollama client (and so one HTTP connection pool) shared by every LLM tool in the process"""
+
+_llm: OllamaLLM | None = None
+_llm_semaphore = asyncio.Semaphore(config.LLM_MAX_CONCURRENCY)
+
+
+def get_llm() -> OllamaLLM:
+    global _llm
+    if _llm is None:
+        client_kwargs = {}
+        if config.OLLAMA_API_KEY:
+            client_kwargs = {"headers": {"Authorization": f"Bearer {config.OLLAMA_API_KEY}"}}
+
+        _llm = OllamaLLM(
+            model=config.MODEL_NAME,
+            base_url=config.OLLAMA_API_BASE_URL,
+            client_kwargs=client_kwargs,
+            async_client_kwargs={
+                "limits": httpx.Limits(
+                    max_connections=config.LLM_MAX_CONCURRENCY,
+                    max_keepalive_connections=config.LLM_MAX_CONCURRENCY,
+                )
+            },
+        )
+    return _llm
+
+
+async def ainvoke_limited(chain: Runnable, inputs: Dict[str, Any]) -> Any:
+    async with _llm_semaphore:
+        return await chain.ainvoke(inputs)
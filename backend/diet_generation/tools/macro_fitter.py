@@ -0,0 +1,149 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from backend.diet_generation.schemas import AgentState, CompleteMeal, DietGenerationInput
+from backend.diet_generation.tools.nutrition_table import MACROS, NutritionTable, get_nutrition_table
+
+"""Tool used for fitting the plan to the targets without calling the LLM again"""
+
+
+def solve_bounded_least_squares(
+    matrix: np.ndarray, target: np.ndarray, lower: float, upper: float, max_iterations: int = 100
+) -> np.ndarray:
+    """Minimises ||matrix @ x - target|| subject to lower <= x <= upper (active set method, starts from x = 1).
+
+    When the minimum is not unique (more columns than rows) the one closest to the start is returned.
+    """
+    start = np.full(matrix.shape[1], np.clip(1.0, lower, upper))
+    x = start.copy()
+    free = np.ones(matrix.shape[1], dtype=bool)
+
+    for _ in range(max_iterations):
+        candidate = x.copy()
+        if free.any():
+            rhs = target - matrix[:, ~free] @ x[~free] - matrix[:, free] @ start[free]
+            candidate[free] = start[free] + np.linalg.lstsq(matrix[:, free], rhs, rcond=None)[0]
+
+        infeasible = free & ((candidate < lower) | (candidate > upper))
+        if infeasible.any():
+            # Move towards the candidate as far as the bounds allow and pin the blocking variables
+            direction = candidate - x
+            bound = np.where(direction < 0, lower, upper)
+            alpha = min(1.0, np.min((bound[infeasible] - x[infeasible]) / direction[infeasible]))
+            x = np.clip(x + alpha * direction, lower, upper)
+            free &= ~(np.isclose(x, lower) | np.isclose(x, upper))
+            continue
+
+        x = candidate
+        gradient = matrix.T @ (matrix @ x - target)
+        releasable = ~free & ((np.isclose(x, lower) & (gradient < 0)) | (np.isclose(x, upper) & (gradient > 0)))
+        if not releasable.any():
+            break
+        free[np.argmax(np.where(releasable, np.abs(gradient), -1.0))] = True
+    return x
+
+
+def fit_macro_scales(macros: np.ndarray, target: np.ndarray, lower: float, upper: float) -> np.ndarray:
+    """Scales of the (macros x portions) columns that bring their sum closest to the target macros"""
+    # Relative error per macro, otherwise calories would dominate the grams
+    weights = 1.0 / np.maximum(target, 1.0)
+    return solve_bounded_least_squares(macros * weights[:, None], target * weights, lower, upper)
+
+
+def round_preserving_sum(values: np.ndarray, decimals: int) -> np.ndarray:
+    """Rounds the values so they still add up to their rounded sum (largest remainder method)"""
+    factor = 10**decimals
+    scaled = values * factor
+    rounded = np.floor(scaled)
+    missing = int(round(scaled.sum() - rounded.sum()))
+    rounded[np.argsort(rounded - scaled, kind="stable")[:missing]] += 1
+    return np.round(rounded / factor, decimals)
+
+
+class MacroFitterTool:
+    def __init__(
+        self,
+        min_scale: float = 0.5,
+        max_scale: float = 2.0,
+        nutrition_table: NutritionTable | None = None,
+    ):
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.nutrition_table = nutrition_table or get_nutrition_table()
+
+    def fit_plan(self, state: AgentState) -> Dict[str, Any]:
+        if not state.current_plan:
+            return {}
+
+        plan_meals = [m if isinstance(m, CompleteMeal) else CompleteMeal(**m) for m in state.current_plan]
+        breakdowns = [self.nutrition_table.ingredient_breakdown(meal) for meal in plan_meals]
+        scales = self.fit_portions(plan_meals, state.targets, breakdowns)
+        macros = np.array(
+            [
+                scale[0] * self._reported_macros(meal) if breakdown is None else scale @ breakdown[1]
+                for meal, scale, breakdown in zip(plan_meals, scales, breakdowns)
+            ]
+        )
+        # Rounding every meal on its own could move the daily totals out of the validator tolerance
+        rounded_macros = np.column_stack(
+            [round_preserving_sum(macros[:, i], 0 if macro == "calories" else 1) for i, macro in enumerate(MACROS)]
+        )
+        fitted_meals = [
+            self._scale(meal, scale, meal_macros, None if breakdown is None else breakdown[0])
+            for meal, scale, meal_macros, breakdown in zip(plan_meals, scales, rounded_macros, breakdowns)
+        ]
+        return {"current_plan": fitted_meals}
+
+    def fit_portions(
+        self,
+        plan_meals: List[CompleteMeal],
+        targets: DietGenerationInput,
+        breakdowns: List[Tuple[np.ndarray, np.ndarray] | None] | None = None,
+    ) -> List[np.ndarray]:
+        """One scale per ingredient for meals known by the nutrition table, a single portion scale otherwise"""
+        breakdowns = breakdowns or [None] * len(plan_meals)
+        blocks = [
+            self._reported_macros(meal)[:, None] if breakdown is None else breakdown[1].T
+            for meal, breakdown in zip(plan_meals, breakdowns)
+        ]
+        target = np.array([getattr(targets, macro) for macro in MACROS], dtype=float)
+        scales = fit_macro_scales(np.hstack(blocks), target, self.min_scale, self.max_scale)
+        return np.split(scales, np.cumsum([block.shape[1] for block in blocks])[:-1])
+
+    @staticmethod
+    def _reported_macros(meal: CompleteMeal) -> np.ndarray:
+        return np.array([getattr(meal, macro) for macro in MACROS], dtype=float)
+
+    @classmethod
+    def scale_meal(cls, meal: CompleteMeal, scale: float) -> CompleteMeal:
+        if abs(scale - 1.0) < 1e-6:
+            return meal
+
+        macros = scale * cls._reported_macros(meal)
+        return cls._scale(meal, np.array([scale]), np.array([round(macros[0]), *np.round(macros[1:], 1)]))
+
+    @staticmethod
+    def _scale(meal: CompleteMeal, scales: np.ndarray, macros: np.ndarray, grams: np.ndarray | None = None):
+        """Without grams the whole portion has one scale, otherwise every ingredient has its own"""
+        if grams is None:
+            weight_scale = scales[0]
+            scales = np.full(len(meal.ingredients_list), weight_scale)
+        else:
+            # Macros of known ingredients come from the nutrition table, the LLM numbers are not used at all
+            weight_scale = (scales @ grams) / grams.sum() if grams.sum() > 0 else 1.0
+
+        calories, protein, carbs, fat = macros
+        return meal.model_copy(
+            update={
+                "calories": int(round(calories)),
+                "protein": round(float(protein), 1),
+                "carbs": round(float(carbs), 1),
+                "fat": round(float(fat), 1),
+                "weight": int(round(meal.weight * weight_scale)),
+                "ingredients_list": [
+                    ingredient.model_copy(update={"volume": round(ingredient.volume * float(scale), 1)})
+                    for ingredient, scale in zip(meal.ingredients_list, scales)
+                ],
+            }
+        )
@@ -0,0 +1,192 @@
+import csv
+import re
+from functools import cache
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from backend.diet_generation.schemas import CompleteMeal, IngredientCreate
+from backend.meals.enums.unit import Unit
+
+"""Local ingredient nutrition data used to compute meal macros without trusting the numbers returned by the LLM"""
+
+NUTRITION_DATA_PATH = Path(__file__).resolve().parent.parent / "data" / "ingredient_nutrition.csv"
+
+MACROS = ("calories", "protein", "carbs", "fat")
+
+_GRAMS_PER_UNIT = {
+    Unit.GRAM: 1.0,
+    Unit.KILOGRAM: 1000.0,
+    Unit.MILLIGRAM: 0.001,
+    Unit.PINCH: 0.4,
+    Unit.HANDFUL: 30.0,
+}
+_MILLILITERS_PER_UNIT = {
+    Unit.MILLILITER: 1.0,
+    Unit.LITER: 1000.0,
+    Unit.CUP: 240.0,
+    Unit.TABLESPOON: 15.0,
+    Unit.TEASPOON: 5.0,
+    Unit.DASH: 0.6,
+}
+_COUNTED_UNITS = {Unit.PIECE, Unit.SLICE, Unit.PACK, Unit.CAN, Unit.BOTTLE, Unit.STICK}
+
+_MASS, _VOLUME, _COUNT, _UNKNOWN = range(4)
+
+_UNIT_SYNONYMS = {
+    "gr": Unit.GRAM,
+    "grams": Unit.GRAM,
+    "kgs": Unit.KILOGRAM,
+    "litre": Unit.LITER,
+    "millilitre": Unit.MILLILITER,
+    "tbs": Unit.TABLESPOON,
+    "pc": Unit.PIECE,
+    "pcs": Unit.PIECE,
+}
+
+
+@cache
+def _unit_lookup() -> Dict[str, Unit]:
+    lookup = dict(_UNIT_SYNONYMS)
+    for unit in Unit:
+        lookup[unit.value] = unit
+        for translation in unit.translations.values():
+            lookup[translation.translation.lower()] = unit
+    return lookup
+
+
+@cache
+def parse_unit(text: str) -> Unit | None:
+    """Planner is asked for grams without units, so an empty unit means grams"""
+    normalized = text.strip().lower().rstrip(".")
+    if not normalized:
+        return Unit.GRAM
+
+    lookup = _unit_lookup()
+    for candidate in (normalized, normalized.removesuffix("s"), normalized.removesuffix("es")):
+        if candidate in lookup:
+            return lookup[candidate]
+    return None
+
+
+@cache
+def _unit_conversion(text: str) -> Tuple[int, float]:
+    unit = parse_unit(text)
+    if unit in _GRAMS_PER_UNIT:
+        return _MASS, _GRAMS_PER_UNIT[unit]
+    if unit in _MILLILITERS_PER_UNIT:
+        return _VOLUME, _MILLILITERS_PER_UNIT[unit]
+    if unit in _COUNTED_UNITS:
+        return _COUNT, 1.0
+    return _UNKNOWN, np.nan
+
+
+def normalize_ingredient_name(name: str) -> str:
+    name = re.sub(r"\(.*?\)", " ", name.lower())
+    name = re.sub(r"[^\w\s-]|\d|_", " ", name)
+    return " ".join(name.split())
+
+
+class NutritionTable:
+    """Per 100 g values held as one (ingredients x nutrients) matrix, so meals are computed with array operations"""
+
+    def __init__(
+        self,
+        names: List[str],
+        per_100g: np.ndarray,
+        density: np.ndarray,
+        grams_per_piece: np.ndarray,
+        aliases: Dict[str, int] | None = None,
+    ):
+        self.names = names
+        self.per_100g = per_100g
+        self.density = density
+        self.grams_per_piece = grams_per_piece
+        self.index = {normalize_ingredient_name(name): i for i, name in enumerate(names)}
+        for alias, i in (aliases or {}).items():
+            self.index.setdefault(normalize_ingredient_name(alias), i)
+        self._lookup_cache: Dict[str, int] = {}
+
+    @classmethod
+    def from_csv(cls, path: Path = NUTRITION_DATA_PATH) -> "NutritionTable":
+        with open(path, newline="", encoding="utf-8") as file:
+            rows = list(csv.DictReader(file))
+
+        def column(field: str, default: float) -> np.ndarray:
+            return np.array([float(row[field]) if row[field] else default for row in rows], dtype=float)
+
+        aliases = {alias: i for i, row in enumerate(rows) for alias in row["aliases"].split("|") if alias}
+        return cls(
+            names=[row["name"] for row in rows],
+            per_100g=np.column_stack([column(nutrient, 0.0) for nutrient in MACROS]),
+            density=column("density_g_per_ml", 1.0),
+            grams_per_piece=column("grams_per_piece", np.nan),
+            aliases=aliases,
+        )
+
+    def lookup(self, name: str) -> int:
+        """Returns the table row of the ingredient or -1
+
+        Only whole names (or their aliases and plurals) match, a known name inside a longer one is a different
+        ingredient (butter beans, rice vinegar, egg noodles), so that meal keeps the macros reported by the LLM.
+        """
+        if name not in self._lookup_cache:
+            self._lookup_cache[name] = self._find(normalize_ingredient_name(name))
+        return self._lookup_cache[name]
+
+    def _find(self, normalized: str) -> int:
+        for candidate in (normalized, normalized.removesuffix("s"), normalized.removesuffix("es")):
+            if candidate in self.index:
+                return self.index[candidate]
+        return -1
+
+    def ingredient_grams(self, ingredients: Sequence[IngredientCreate]) -> Tuple[np.ndarray, np.ndarray]:
+        """Table rows and weights in grams of the ingredients, weight is NaN when it cannot be determined"""
+        indices = np.array([self.lookup(ingredient.name) for ingredient in ingredients], dtype=int)
+        conversions = np.array([_unit_conversion(ingredient.unit) for ingredient in ingredients], dtype=float)
+        kinds, factors = conversions.reshape(-1, 2).T
+        volumes = np.array([ingredient.volume for ingredient in ingredients], dtype=float)
+
+        rows = np.where(indices >= 0, indices, 0)
+        grams_per_unit = np.select(
+            [kinds == _MASS, kinds == _VOLUME, kinds == _COUNT],
+            [factors, factors * self.density[rows], self.grams_per_piece[rows]],
+            default=np.nan,
+        )
+        grams = np.where(indices >= 0, volumes * grams_per_unit, np.nan)
+        return indices, grams
+
+    def ingredient_breakdown(self, meal: CompleteMeal) -> Tuple[np.ndarray, np.ndarray] | None:
+        """Grams and (ingredients x nutrients) contributions of the meal, None when any ingredient is not known"""
+        indices, grams = self.ingredient_grams(meal.ingredients_list)
+        if not len(indices) or np.isnan(grams).any():
+            return None
+        return grams, grams[:, None] / 100.0 * self.per_100g[indices]
+
+    def meal_nutrients(self, meals: Sequence[CompleteMeal]) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (meals x nutrients) totals and a mask of meals whose every ingredient is known"""
+        ingredients = [ingredient for meal in meals for ingredient in meal.ingredients_list]
+        meal_ids = np.repeat(np.arange(len(meals)), [len(meal.ingredients_list) for meal in meals])
+        indices, grams = self.ingredient_grams(ingredients)
+
+        known = ~np.isnan(grams)
+        totals = np.zeros((len(meals), len(MACROS)))
+        np.add.at(totals, meal_ids[known], grams[known, None] / 100.0 * self.per_100g[indices[known]])
+
+        ingredient_counts = np.bincount(meal_ids, minlength=len(meals))
+        known_counts = np.bincount(meal_ids[known], minlength=len(meals))
+        return totals, (ingredient_counts > 0) & (known_counts == ingredient_counts)
+
+    def plans_nutrients(self, plans: Sequence[Sequence[CompleteMeal]]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Computes several daily plans (e.g. a whole week) in one batched call and splits the result per plan"""
+        if not plans:
+            return []
+        totals, covered = self.meal_nutrients([meal for plan in plans for meal in plan])
+        offsets = np.cumsum([len(plan) for plan in plans])[:-1]
+        return list(zip(np.split(totals, offsets), np.split(covered, offsets)))
+
+
+@cache
+def get_nutrition_table() -> NutritionTable:
+    return NutritionTable.from_csv()
@@ -4,24 +4,17 @@ from typing import Any, Dict
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import Runnable
-from langchain_ollama import OllamaLLM
 
 from backend.core.logger import logger
 from backend.diet_generation.schemas import AgentState, CompleteMeal, DietGenerationOutput
-from backend.settings import config
+from backend.diet_generation.tools.llm import ainvoke_limited, get_llm
 
 """Tool used for generating and correcting output"""
 
 
 class PlannerTool:
     def __init__(self):
-        client_kwargs = {}
-        if config.OLLAMA_API_KEY:
-            client_kwargs = {"headers": {"Authorization": f"Bearer {config.OLLAMA_API_KEY}"}}
-
-        self.llm: Runnable = OllamaLLM(
-            model=config.MODEL_NAME, base_url=config.OLLAMA_API_BASE_URL, client_kwargs=client_kwargs
-        )
+        self.llm: Runnable = get_llm()
         self.parser = JsonOutputParser(pydantic_object=DietGenerationOutput)
 
         self.system_instruction = (
@@ -183,7 +176,7 @@ class PlannerTool:
         Respond ONLY with the final JSON object following the schema exactly.
         """
 
-    def generate_plan(self, state: AgentState) -> Dict[str, Any]:
+    async def generate_plan(self, state: AgentState) -> Dict[str, Any]:
         if state.correction_count == 0:
             prompt_content = self._build_initial_prompt(state.targets)
         else:
@@ -192,7 +185,7 @@ class PlannerTool:
         full_prompt = self.system_instruction + "\n\n" + prompt_content
 
         try:
-            response_dict = self.generation_chain.invoke({"prompt_content": full_prompt})
+            response_dict = await ainvoke_limited(self.generation_chain, {"prompt_content": full_prompt})
             response_plan = DietGenerationOutput.model_validate(response_dict)
 
             return {
@@ -1,24 +1,18 @@
 import json
+from functools import cache
 
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
 from langchain_core.runnables import Runnable
-from langchain_ollama import OllamaLLM
 
 from backend.core.logger import logger
 from backend.diet_generation.schemas import MealRecipeTranslation
-from backend.settings import config
+from backend.diet_generation.tools.llm import ainvoke_limited, get_llm
 
 
 class TranslatorTool:
     def __init__(self):
-        client_kwargs = {}
-        if config.OLLAMA_API_KEY:
-            client_kwargs = {"headers": {"Authorization": f"Bearer {config.OLLAMA_API_KEY}"}}
-
-        self.llm: Runnable = OllamaLLM(
-            model=config.MODEL_NAME, base_url=config.OLLAMA_API_BASE_URL, client_kwargs=client_kwargs
-        )
+        self.llm: Runnable = get_llm()
         self.parser = JsonOutputParser(pydantic_object=MealRecipeTranslation)
 
         self.system_instruction = (
@@ -59,12 +53,17 @@ class TranslatorTool:
                 - Output ONLY the translated JSON object, strictly matching TranslatedMealRecipe schema.\n
                 """
 
-    def translate_meal_recipe_to_polish(self, meal_recipe: MealRecipeTranslation) -> MealRecipeTranslation:
+    async def translate_meal_recipe_to_polish(self, meal_recipe: MealRecipeTranslation) -> MealRecipeTranslation:
         prompt = self.system_instruction + "\n\n" + self._build_prompt(meal_recipe)
         try:
-            result_dict = self.chain.invoke({"prompt_content": prompt})
+            result_dict = await ainvoke_limited(self.chain, {"prompt_content": prompt})
             return MealRecipeTranslation.model_validate(result_dict)
 
         except Exception as e:
             logger.error(f"Error while translating {meal_recipe.meal_name} recipe to polish")
             raise RuntimeError(f"Error while translating {meal_recipe.meal_name} recipe to polish") from e
+
+
+@cache
+def get_translator_tool() -> TranslatorTool:
+    return TranslatorTool()
@@ -2,6 +2,7 @@ import json
 from typing import Any, Dict, List
 
 from backend.diet_generation.schemas import AgentState, CompleteMeal
+from backend.diet_generation.tools.nutrition_table import MACROS, NutritionTable, get_nutrition_table
 from backend.meals.enums.meal_type import MealType
 
 """Tool used for validation in LangGraph"""
@@ -10,10 +11,19 @@ from backend.meals.enums.meal_type import MealType
 class ValidatorTool:
     """We can get rid of it or rethink if we want to adjust in case of failing"""
 
-    def __init__(self, meals_per_day: int, macro_tolerance: int = 1, calorie_tolerance: int = 1):
+    def __init__(
+        self,
+        meals_per_day: int,
+        macro_tolerance: int = 1,
+        calorie_tolerance: int = 1,
+        ingredients_tolerance: float = 0.05,
+        nutrition_table: NutritionTable | None = None,
+    ):
         self.meals_per_day = meals_per_day
         self.macro_tolerance = macro_tolerance
         self.calorie_tolerance = calorie_tolerance
+        self.ingredients_tolerance = ingredients_tolerance
+        self.nutrition_table = nutrition_table or get_nutrition_table()
 
     def validate_plan(self, state: AgentState) -> Dict[str, Any]:
         plan_meals = self._ensure_complete_meals(state.current_plan)
@@ -27,6 +37,10 @@ class ValidatorTool:
         errors.extend(meals_number_errors)
         suggestions.extend(meals_number_suggestions)
 
+        reported_macros_errors, reported_macros_suggestions = self._validate_reported_macros(plan_meals)
+        errors.extend(reported_macros_errors)
+        suggestions.extend(reported_macros_suggestions)
+
         actual, target, diffs = self._compute_totals(plan_meals, state.targets)
         macro_errors, macro_suggestions = self._compute_errors_and_suggestions(actual, target, diffs)
         errors.extend(macro_errors)
@@ -50,6 +64,22 @@ class ValidatorTool:
     def _ensure_complete_meals(plan_meals: List[CompleteMeal]) -> List[CompleteMeal]:
         return [m if isinstance(m, CompleteMeal) else CompleteMeal(**m) for m in plan_meals]
 
+    def _validate_reported_macros(self, plan_meals: List[CompleteMeal]):
+        """Macros of meals made only of known ingredients have to match what the ingredients add up to"""
+        errors = []
+        suggestions = []
+        computed, covered = self.nutrition_table.meal_nutrients(plan_meals)
+        for meal, meal_macros, is_covered in zip(plan_meals, computed, covered):
+            if not is_covered:
+                continue
+            for macro, expected in zip(MACROS, meal_macros):
+                min_tol = self.calorie_tolerance if macro == "calories" else self.macro_tolerance
+                reported = getattr(meal, macro)
+                if abs(reported - expected) > max(min_tol, expected * self.ingredients_tolerance):
+                    errors.append(f"{meal.meal_name}: {macro} {reported} do not match its ingredients ({expected:.1f})")
+                    suggestions.append(f"→ Recalculate {macro} of {meal.meal_name} from its ingredients.")
+        return errors, suggestions
+
     @staticmethod
     def _compute_totals(plan_meals: List[CompleteMeal], targets):
         actual = {
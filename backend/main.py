@@ -15,35 +15,62 @@ from starlette.staticfiles import StaticFiles
 from starlette.templating import Jinja2Templates
 
 from backend.barcode_scanning.barcode_scanning_router import barcode_scanning_router
-from backend.core.database import engine, redis_tokens
+from backend.barcode_scanning.barcode_scanning_service import shutdown_barcode_decoding, warm_up_barcode_decoding
+from backend.core.cache import get_cache_stats
+from backend.core.database import engine, redis_cache, redis_queue, redis_tokens
 from backend.core.health import check_db, check_redis
 from backend.core.limiter import limiter
 from backend.core.logger import logger
+from backend.core.metrics import get_latency_stats
 from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
 from backend.core.value_error_exception import ValueErrorException
 from backend.daily_summary.admin_daily_summary_router import admin_daily_summary_router
 from backend.daily_summary.daily_summary_router import daily_summary_router
+from backend.diet_generation.agent.graph_builder import warm_up_diet_agent_graphs
 from backend.diet_generation.diet_generation_router import diet_generation_router
+from backend.diet_generation.diet_generation_worker import (
+    start_diet_generation_workers,
+    stop_diet_generation_workers,
+)
+from backend.diet_generation.meal_retrieval_index import get_meal_retrieval_index, save_meal_retrieval_index
 from backend.meals.meal_router import meal_router
+from backend.open_food_facts.open_food_facts_client import close_open_food_facts_client, get_open_food_facts_client
 from backend.open_food_facts.open_food_facts_router import open_food_facts_router
 from backend.settings import config
 from backend.user_details.calories_prediction_router import calories_prediction_router
 from backend.user_details.user_details_router import user_details_router
 from backend.user_statistics.user_statistics_router import user_statistics_router
+from backend.users.mail import get_fast_mail
+from backend.users.mail_sender import start_mail_sender, stop_mail_sender
+from backend.users.service.password_service import shutdown_password_hashing
 from backend.users.user_router import user_router
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("App startup: DB and Redis ready")
+    warm_up_diet_agent_graphs()
+    get_meal_retrieval_index()
+    get_fast_mail()
+    get_open_food_facts_client()
+    warm_up_barcode_decoding()
+    diet_generation_workers = start_diet_generation_workers(config.DIET_GENERATION_WORKERS)
+    mail_sender = start_mail_sender()
 
     yield
 
     logger.info("App shutdown: disposing DB engine and closing Redis")
 
+    await stop_diet_generation_workers(diet_generation_workers)
+    await stop_mail_sender(mail_sender)
+    await save_meal_retrieval_index()
+    await close_open_food_facts_client()
+    shutdown_password_hashing()
+    shutdown_barcode_decoding()
     await engine.dispose()
     await redis_tokens.close()
-    await redis_tokens.close()
+    await redis_cache.close()
+    await redis_queue.close()
 
 
 app = FastAPI(lifespan=lifespan, docs_url="/docs", redoc_url=None)
@@ -219,6 +246,15 @@ async def health():
     )
 
 
+@app.get("/health/metrics", tags=["health"])
+async def metrics():
+    return {
+        "caches": get_cache_stats(),
+        "latency": get_latency_stats(),
+        "open_food_facts": get_open_food_facts_client().circuit_breaker.stats(),
+    }
+
+
 @app.get("/redoc", include_in_schema=False)
 async def redoc():
     return get_redoc_html(
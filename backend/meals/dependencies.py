@@ -2,6 +2,8 @@ from fastapi.params import Depends
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.core.database import get_db
+from backend.core.unit_of_work import UnitOfWork, get_unit_of_work
+from backend.meals.meal_cache import MealCache, get_meal_cache
 from backend.meals.meal_service import MealService
 from backend.meals.repositories.meal_icons_repository import MealIconsRepository
 from backend.meals.repositories.meal_recipes_repository import MealRecipesRepository
@@ -30,5 +32,7 @@ async def get_meal_service(
     meal_icons_repository: MealIconsRepository = Depends(get_meal_icons_repository),
     meal_recipes_repository: MealRecipesRepository = Depends(get_meal_recipes_repository),
     meal_repository: MealRepository = Depends(get_meal_repository),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
+    meal_cache: MealCache = Depends(get_meal_cache),
 ) -> MealService:
-    return MealService(meal_recipes_repository, meal_repository, meal_icons_repository)
+    return MealService(meal_recipes_repository, meal_repository, meal_icons_repository, unit_of_work, meal_cache)
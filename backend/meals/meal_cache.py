@@ -0,0 +1,81 @@
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from backend.core.cache import TwoTierCache
+from backend.core.database import redis_cache
+from backend.meals.enums.meal_type import MealType
+from backend.meals.schemas import MealRecipeResponse
+from backend.settings import config
+from backend.users.enums.language import Language
+
+
+def _to_str(raw: bytes | str) -> str:
+    return raw.decode() if isinstance(raw, bytes) else raw
+
+
+class MealCache:
+    def __init__(self, recipes: TwoTierCache[MealRecipeResponse], icons: TwoTierCache[str]):
+        self.recipes = recipes
+        self.icons = icons
+
+    @staticmethod
+    def _recipe_key(meal_id: UUID, language: Language) -> str:
+        return f"{meal_id}:{language.value}"
+
+    @staticmethod
+    def _resolved_recipe_key(meal_id: UUID, language: Language) -> str:
+        return f"{meal_id}:{language.value}:resolved"
+
+    async def get_recipe(
+        self, meal_id: UUID, language: Language, loader: Callable[[], Awaitable[Optional[MealRecipeResponse]]]
+    ) -> Optional[MealRecipeResponse]:
+        return await self.recipes.get_or_load(self._recipe_key(meal_id, language), loader)
+
+    async def get_resolved_recipe(
+        self, meal_id: UUID, language: Language, loader: Callable[[], Awaitable[Optional[MealRecipeResponse]]]
+    ) -> Optional[MealRecipeResponse]:
+        return await self.recipes.get_or_load(self._resolved_recipe_key(meal_id, language), loader)
+
+    async def get_icon_path(self, icon_id: UUID, loader: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        return await self.icons.get_or_load(f"path:{icon_id}", loader)
+
+    async def get_icon_id(self, meal_type: MealType, loader: Callable[[], Awaitable[Optional[UUID]]]) -> Optional[UUID]:
+        async def load_icon_id() -> Optional[str]:
+            icon_id = await loader()
+            return str(icon_id) if icon_id else None
+
+        icon_id = await self.icons.get_or_load(f"type:{meal_type.value}", load_icon_id)
+        return UUID(icon_id) if icon_id else None
+
+    async def invalidate_meal(self, meal_id: UUID):
+        keys = []
+        for language in Language:
+            keys.append(self._recipe_key(meal_id, language))
+            keys.append(self._resolved_recipe_key(meal_id, language))
+        await self.recipes.invalidate(*keys)
+
+
+meal_cache = MealCache(
+    recipes=TwoTierCache[MealRecipeResponse](
+        namespace="meal_recipes",
+        redis=redis_cache,
+        serialize=lambda recipe: recipe.model_dump_json(),
+        deserialize=MealRecipeResponse.model_validate_json,
+        local_max_size=config.MEAL_CACHE_LOCAL_MAX_SIZE,
+        local_ttl_seconds=config.MEAL_CACHE_LOCAL_TTL_SECONDS,
+        redis_ttl_seconds=config.MEAL_CACHE_REDIS_TTL_SECONDS,
+    ),
+    icons=TwoTierCache[str](
+        namespace="meal_icons",
+        redis=redis_cache,
+        serialize=str,
+        deserialize=_to_str,
+        local_max_size=config.MEAL_CACHE_LOCAL_MAX_SIZE,
+        local_ttl_seconds=config.MEAL_CACHE_LOCAL_TTL_SECONDS,
+        redis_ttl_seconds=config.MEAL_CACHE_REDIS_TTL_SECONDS,
+    ),
+)
+
+
+def get_meal_cache() -> MealCache:
+    return meal_cache
@@ -1,3 +1,4 @@
+from typing import Dict, List
 from uuid import UUID
 
 from fastapi import Depends
@@ -26,12 +27,21 @@ class MealGateway:
     async def add_meal_recipe(self, meal_recipe: MealRecipe) -> MealRecipe:
         return await self.meal_service.add_meal_recipe(meal_recipe)
 
+    async def add_meal_recipes(self, meal_recipes: List[MealRecipe]) -> List[MealRecipe]:
+        return await self.meal_service.add_meal_recipes(meal_recipes)
+
+    async def get_meal_recipes_by_meal_ids(self, meal_ids: List[UUID], language: Language) -> List[MealRecipe]:
+        return await self.meal_service.get_meal_recipes_by_meal_ids(meal_ids, language)
+
     async def get_meal_recipe_by_meal_and_language_safe(self, meal_id: UUID, language: Language) -> MealRecipeResponse:
         return await self.meal_service.get_meal_recipe_by_meal_and_language_safe(meal_id, language)
 
     async def get_meal_icon_id(self, meal_type: MealType) -> UUID:
         return await self.meal_service.get_meal_icon_id(meal_type)
 
+    async def get_meal_icon_ids(self, meal_types: List[MealType]) -> Dict[MealType, UUID]:
+        return await self.meal_service.get_meal_icon_ids(meal_types)
+
     async def get_meal_icon_path_by_id(self, meal_id: UUID) -> str:
         return await self.meal_service.get_meal_icon_path_by_id(meal_id)
 
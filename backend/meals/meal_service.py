@@ -1,9 +1,11 @@
-from typing import List
+from typing import Dict, List
 from uuid import UUID
 
 from backend.core.logger import logger
 from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
+from backend.core.unit_of_work import UnitOfWork
 from backend.meals.enums.meal_type import MealType
+from backend.meals.meal_cache import MealCache
 from backend.meals.repositories.meal_icons_repository import MealIconsRepository
 from backend.meals.repositories.meal_recipes_repository import MealRecipesRepository
 from backend.meals.repositories.meal_repository import MealRepository
@@ -18,35 +20,70 @@ class MealService:
         meal_recipes_repository: MealRecipesRepository,
         meal_repository: MealRepository,
         meal_icons_repository: MealIconsRepository,
+        unit_of_work: UnitOfWork,
+        meal_cache: MealCache | None = None,
     ):
         self.meal_recipes_repository = meal_recipes_repository
         self.meal_repository = meal_repository
         self.meal_icons_repository = meal_icons_repository
+        self.unit_of_work = unit_of_work
+        self.meal_cache = meal_cache
 
     async def get_meal_icon(self, meal_type: MealType) -> MealIcon:
         meal_icon = await self.meal_icons_repository.get_meal_icon_by_type(meal_type)
         return await self.validate_response(meal_icon, f"Meal icon for type: {meal_type} not found")
 
     async def get_meal_icon_id(self, meal_type: MealType) -> UUID:
+        if self.meal_cache:
+            return await self.meal_cache.get_icon_id(
+                meal_type, lambda: self.meal_icons_repository.get_meal_icon_id_by_type(meal_type)
+            )
         return await self.meal_icons_repository.get_meal_icon_id_by_type(meal_type)
 
+    async def get_meal_icon_ids(self, meal_types: List[MealType]) -> Dict[MealType, UUID]:
+        meal_icon_ids = await self.meal_icons_repository.get_meal_icon_ids_by_types(meal_types)
+        missing_meal_types = [meal_type for meal_type in meal_types if meal_type not in meal_icon_ids]
+        if missing_meal_types:
+            raise NotFoundInDatabaseException(f"Meal icons for types: {missing_meal_types} not found")
+        return meal_icon_ids
+
     async def get_meal_icon_path_by_id(self, icon_id: UUID) -> str:
+        if self.meal_cache:
+            return await self.meal_cache.get_icon_path(
+                icon_id, lambda: self.meal_icons_repository.get_meal_icon_path_by_id(icon_id)
+            )
         return await self.meal_icons_repository.get_meal_icon_path_by_id(icon_id)
 
     async def add_meal(self, meal: MealCreate) -> Meal:
-        return await self.meal_repository.add_meal(meal)
+        async with self.unit_of_work:
+            return await self.meal_repository.add_meal(meal)
 
     async def get_meal_by_id(self, meal_id: UUID) -> Meal:
         return await self.meal_repository.get_meal_by_id(meal_id)
 
     async def add_meal_recipe(self, meal_recipe: MealRecipe) -> MealRecipe:
-        return await self.meal_recipes_repository.add_meal_recipe(meal_recipe)
+        async with self.unit_of_work:
+            added_meal_recipe = await self.meal_recipes_repository.add_meal_recipe(meal_recipe)
+        if self.meal_cache:
+            await self.meal_cache.invalidate_meal(added_meal_recipe.meal_id)
+        return added_meal_recipe
+
+    async def add_meal_recipes(self, meal_recipes: List[MealRecipe]) -> List[MealRecipe]:
+        async with self.unit_of_work:
+            added_meal_recipes = await self.meal_recipes_repository.add_meal_recipes(meal_recipes)
+        if self.meal_cache:
+            for meal_id in {meal_recipe.meal_id for meal_recipe in added_meal_recipes}:
+                await self.meal_cache.invalidate_meal(meal_id)
+        return added_meal_recipes
 
     async def get_meal_recipes(self, meal_id: UUID, language: Language) -> List[MealRecipeResponse]:
         if language:
             return [await self.get_meal_recipe_by_meal_recipe_id_and_language(meal_id, language)]
         return await self.get_meal_recipes_by_meal_id(meal_id)
 
+    async def get_meal_recipes_by_meal_ids(self, meal_ids: List[UUID], language: Language) -> List[MealRecipe]:
+        return list(await self.meal_recipes_repository.get_meal_recipes_by_meal_ids(meal_ids, language))
+
     async def get_meal_recipes_by_meal_id(self, meal_id: UUID) -> List[MealRecipeResponse]:
         meal_recipes = await self.meal_recipes_repository.get_meal_recipes_by_meal_id(meal_id)
         meal_recipes = await self.validate_response(meal_recipes, f"Meal recipes for mealId: {meal_id} not found")
@@ -60,6 +97,13 @@ class MealService:
     async def get_meal_recipe_by_meal_recipe_id_and_language(
         self, meal_id: UUID, language: Language
     ) -> MealRecipeResponse:
+        if self.meal_cache:
+            return await self.meal_cache.get_recipe(
+                meal_id, language, lambda: self._load_meal_recipe_by_meal_id_and_language(meal_id, language)
+            )
+        return await self._load_meal_recipe_by_meal_id_and_language(meal_id, language)
+
+    async def _load_meal_recipe_by_meal_id_and_language(self, meal_id: UUID, language: Language) -> MealRecipeResponse:
         meal_recipe = await self.meal_recipes_repository.get_meal_recipe_by_meal_id_and_language(meal_id, language)
         meal_recipe = await self.validate_response(
             meal_recipe, f"Meal recipe for mealId: {meal_id} and language: {language} not found"
@@ -68,6 +112,13 @@ class MealService:
         return await self._enhance_meal_response_by_icon(meal_recipe)
 
     async def get_meal_recipe_by_meal_and_language_safe(self, meal_id: UUID, language: Language) -> MealRecipeResponse:
+        if self.meal_cache:
+            return await self.meal_cache.get_resolved_recipe(
+                meal_id, language, lambda: self._resolve_meal_recipe_by_language(meal_id, language)
+            )
+        return await self._resolve_meal_recipe_by_language(meal_id, language)
+
+    async def _resolve_meal_recipe_by_language(self, meal_id: UUID, language: Language) -> MealRecipeResponse:
         meal_recipes = await self.get_meal_recipes_by_meal_id(meal_id)
 
         meal_recipes_by_language = {mr.language: mr for mr in meal_recipes}
@@ -81,14 +132,18 @@ class MealService:
         return response
 
     async def delete_meal_by_id(self, meal_id: UUID) -> bool:
-        return await self.meal_repository.delete_meal_by_id(meal_id)
+        async with self.unit_of_work:
+            deleted = await self.meal_repository.delete_meal_by_id(meal_id)
+        if self.meal_cache:
+            await self.meal_cache.invalidate_meal(meal_id)
+        return deleted
 
     async def _enhance_meal_response_by_icon(self, meal_recipe: MealRecipe) -> MealRecipeResponse:
         meal = await self.meal_repository.get_meal_by_id(meal_recipe.meal_id)
         await self.validate_response(meal, f"Meal with id {meal_recipe.meal_id} not found")
 
-        icon = await self.meal_icons_repository.get_meal_icon_by_id(meal.icon_id)
-        await self.validate_response(icon, f"MealIcon with id {meal.icon_id} not found")
+        icon_path = await self._get_icon_path_by_icon_id(meal.icon_id)
+        await self.validate_response(icon_path, f"MealIcon with id {meal.icon_id} not found")
 
         return MealRecipeResponse(
             id=meal_recipe.id,
@@ -100,9 +155,18 @@ class MealService:
             ingredients=meal_recipe.ingredients,
             steps=meal_recipe.steps,
             meal_type=meal.meal_type,
-            icon_path=icon.icon_path,
+            icon_path=icon_path,
         )
 
+    async def _get_icon_path_by_icon_id(self, icon_id: UUID) -> str | None:
+        async def loader():
+            icon = await self.meal_icons_repository.get_meal_icon_by_id(icon_id)
+            return icon.icon_path if icon else None
+
+        if self.meal_cache:
+            return await self.meal_cache.get_icon_path(icon_id, loader)
+        return await loader()
+
     @classmethod
     async def validate_response(cls, response, message):
         if not response:
@@ -1,3 +1,4 @@
+from typing import Dict, List
 from uuid import UUID
 
 from sqlalchemy import select
@@ -26,6 +27,12 @@ class MealIconsRepository:
 
         return result.scalar_one_or_none()
 
+    async def get_meal_icon_ids_by_types(self, meal_types: List[MealType]) -> Dict[MealType, UUID]:
+        query = select(MealIcon.meal_type, MealIcon.id).where(MealIcon.meal_type.in_(meal_types))
+        result = await self.db.execute(query)
+
+        return {meal_type: icon_id for meal_type, icon_id in result.all()}
+
     async def get_meal_icon_path_by_id(self, meal_id: UUID) -> str | None:
         query = select(MealIcon.icon_path).where(MealIcon.id == meal_id)
         result = await self.db.execute(query)
@@ -1,4 +1,4 @@
-from typing import Any, Sequence
+from typing import Any, List, Sequence
 from uuid import UUID
 
 from sqlalchemy import Row, RowMapping, select
@@ -24,16 +24,25 @@ class MealRecipesRepository:
 
         return await self._map_meal_recipe(result.scalars().one_or_none())
 
+    async def get_meal_recipes_by_meal_ids(self, meal_ids: List[UUID], language: Language) -> Sequence[MealRecipe]:
+        query = select(MealRecipe).where(MealRecipe.meal_id.in_(meal_ids), MealRecipe.language == language)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
     async def get_meal_by_id(self, meal_id: UUID) -> Meal | None:
         result = await self.db.get(Meal, meal_id)
         return result
 
     async def add_meal_recipe(self, meal_recipe: MealRecipe) -> MealRecipe:
         self.db.add(meal_recipe)
-        await self.db.commit()
-        await self.db.refresh(meal_recipe)
+        await self.db.flush()
         return meal_recipe
 
+    async def add_meal_recipes(self, meal_recipes: List[MealRecipe]) -> List[MealRecipe]:
+        self.db.add_all(meal_recipes)
+        await self.db.flush()
+        return meal_recipes
+
     @classmethod
     async def _map_meal_recipe(cls, meal_recipe) -> MealRecipe:
         if meal_recipe:
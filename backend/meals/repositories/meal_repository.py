@@ -1,6 +1,7 @@
+from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from backend.meals.schemas import MealCreate
@@ -14,8 +15,7 @@ class MealRepository:
     async def add_meal(self, meal_data: MealCreate) -> Meal:
         meal = Meal(**meal_data.model_dump())
         self.db.add(meal)
-        await self.db.commit()
-        await self.db.refresh(meal)
+        await self.db.flush()
         return meal
 
     async def update_meal_by_id(self, meal_id: UUID, meal_data: MealCreate) -> Meal | None:
@@ -23,12 +23,9 @@ class MealRepository:
         if not meal:
             return None
 
-        update_data = meal_data.model_dump(exclude_unset=True)
-
-        await self.db.execute(update(Meal).where(Meal.id == meal_id).values(**update_data))
-        await self.db.commit()
-
-        await self.db.refresh(meal)
+        for key, value in meal_data.model_dump(exclude_unset=True).items():
+            setattr(meal, key, value)
+        await self.db.flush()
         return meal
 
     async def get_meal_by_id(self, meal_id: UUID) -> Meal | None:
@@ -41,6 +38,11 @@ class MealRepository:
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
+    async def get_generated_meals(self) -> Sequence[Meal]:
+        query = select(Meal).where(Meal.is_generated)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+
     async def get_meal_calories_by_id(self, meal_id: UUID) -> int | None:
         query = select(Meal.calories).where(Meal.id == meal_id)
         result = await self.db.execute(query)
@@ -64,6 +66,4 @@ class MealRepository:
     async def delete_meal_by_id(self, meal_id: UUID) -> bool:
         query = delete(Meal).where(Meal.id == meal_id)
         result = await self.db.execute(query)
-        await self.db.commit()
-
         return result.rowcount != 0
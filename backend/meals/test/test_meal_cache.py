@@ -0,0 +1,157 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from redis.exceptions import RedisError
+
+from backend.core.cache import LocalLRUCache, TwoTierCache
+from backend.meals.meal_cache import MealCache
+from backend.meals.meal_service import MealService
+from backend.meals.test.test_data import MEAL_ICON_ID, MEAL_RECIPES
+from backend.users.enums.language import Language
+
+
+class FakeRedis:
+    def __init__(self):
+        self.store = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None):
+        self.store[key] = value.encode()
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+
+def make_cache(redis, namespace="test"):
+    return TwoTierCache[str](
+        namespace=namespace,
+        redis=redis,
+        serialize=str,
+        deserialize=lambda raw: raw.decode(),
+        local_max_size=2,
+        local_ttl_seconds=60,
+        redis_ttl_seconds=60,
+    )
+
+
+def test_local_lru_evicts_least_recently_used():
+    # Given
+    cache = LocalLRUCache[int](max_size=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    # When
+    cache.set("c", 3)
+
+    # Then
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_local_lru_expires_entries():
+    # Given
+    cache = LocalLRUCache[int](max_size=2, ttl_seconds=-1)
+
+    # When
+    cache.set("a", 1)
+
+    # Then
+    assert cache.get("a") is None
+
+
+@pytest.mark.asyncio
+async def test_two_tier_cache_counts_hits_and_misses():
+    # Given
+    redis = FakeRedis()
+    cache = make_cache(redis)
+    loader = AsyncMock(return_value="value")
+
+    # When
+    first = await cache.get_or_load("key", loader)
+    second = await cache.get_or_load("key", loader)
+    cache.local.clear()
+    third = await cache.get_or_load("key", loader)
+
+    # Then
+    assert first == second == third == "value"
+    loader.assert_awaited_once()
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["local_hits"] == 1
+    assert stats["redis_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_two_tier_cache_get_many_reads_missing_keys_with_one_mget():
+    # Given
+    redis = FakeRedis()
+    cache = make_cache(redis)
+    await cache.set("local", "1")
+    await cache.set("remote", "2")
+    cache.local.delete("remote")
+    redis.mget = AsyncMock(wraps=redis.mget)
+
+    # When
+    values = await cache.get_many(["local", "remote", "missing"])
+
+    # Then
+    assert values == {"local": "1", "remote": "2"}
+    redis.mget.assert_awaited_once_with(["cache:test:remote", "cache:test:missing"])
+    stats = cache.stats()
+    assert (stats["local_hits"], stats["redis_hits"], stats["misses"]) == (1, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_two_tier_cache_falls_back_to_loader_when_redis_fails():
+    # Given
+    redis = MagicMock()
+    redis.get = AsyncMock(side_effect=RedisError("down"))
+    redis.set = AsyncMock(side_effect=RedisError("down"))
+    cache = make_cache(redis)
+
+    # When
+    value = await cache.get_or_load("key", AsyncMock(return_value="value"))
+
+    # Then
+    assert value == "value"
+    assert cache.stats()["redis_errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_meal_service_invalidates_recipes_after_adding_recipe():
+    # Given
+    redis = FakeRedis()
+    meal_cache = MealCache(recipes=make_cache(redis, "recipes"), icons=make_cache(redis, "icons"))
+    meal_recipes_repository = AsyncMock()
+    meal_repository = AsyncMock()
+    meal_icons_repository = AsyncMock()
+    service = MealService(meal_recipes_repository, meal_repository, meal_icons_repository, AsyncMock(), meal_cache)
+
+    meal = MagicMock()
+    meal.meal_type = "breakfast"
+    meal.icon_id = MEAL_ICON_ID
+    icon = MagicMock()
+    icon.icon_path = "path/to/icon.png"
+    meal_recipe = MEAL_RECIPES[0]
+    meal_recipes_repository.get_meal_recipes_by_meal_id.return_value = [meal_recipe]
+    meal_recipes_repository.add_meal_recipe.return_value = meal_recipe
+    meal_repository.get_meal_by_id.return_value = meal
+    meal_icons_repository.get_meal_icon_by_id.return_value = icon
+
+    # When
+    await service.get_meal_recipe_by_meal_and_language_safe(meal_recipe.meal_id, Language.PL)
+    await service.get_meal_recipe_by_meal_and_language_safe(meal_recipe.meal_id, Language.PL)
+    await service.add_meal_recipe(meal_recipe)
+    await service.get_meal_recipe_by_meal_and_language_safe(meal_recipe.meal_id, Language.PL)
+
+    # Then
+    assert meal_recipes_repository.get_meal_recipes_by_meal_id.await_count == 2
+    meal_icons_repository.get_meal_icon_by_id.assert_awaited_once_with(MEAL_ICON_ID)
@@ -0,0 +1,28 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.meals.enums.meal_type import MealType
+from backend.meals.repositories.meal_repository import MealRepository
+from backend.meals.schemas import MealCreate
+from backend.models import Meal
+
+
+@pytest.mark.asyncio
+async def test_updated_meal_has_the_new_values():
+    # Given
+    meal = Meal(id=uuid.uuid4(), meal_name="Porridge", meal_type=MealType.BREAKFAST, calories=300, protein=10)
+    db = AsyncMock()
+    db.execute.return_value = MagicMock()
+    db.execute.return_value.scalar_one_or_none.return_value = meal
+
+    # When
+    updated = await MealRepository(db).update_meal_by_id(
+        meal.id, MealCreate(meal_name="Porridge", meal_type=MealType.BREAKFAST, calories=450)
+    )
+
+    # Then
+    assert updated is meal
+    assert (updated.calories, updated.protein) == (450, 10)
+    db.flush.assert_awaited_once()
@@ -52,6 +52,7 @@ def diet_generation_service(mock_meal_icons_repository, mock_meal_repository, mo
         meal_icons_repository=mock_meal_icons_repository,
         meal_repository=mock_meal_repository,
         meal_recipes_repository=mock_meal_recipes_repository,
+        unit_of_work=AsyncMock(),
     )
 
 
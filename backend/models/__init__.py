@@ -3,6 +3,7 @@ from .daily_macros_summary_model import DailyMacrosSummary
 from .daily_summary_model import DailySummary
 from .meal_icon_model import MealIcon
 from .meal_recipe_model import Ingredient, Ingredients, Meal, MealRecipe, Step
+from .product_model import Product
 from .user_details_model import UserDetails
 from .user_diet_prediction_model import UserDietPredictions
 from .user_model import User
@@ -22,4 +23,5 @@ __all__ = [
     "Ingredient",
     "Ingredients",
     "Step",
+    "Product",
 ]
@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import UUID, CheckConstraint, DateTime, ForeignKey, func
+from sqlalchemy import UUID, CheckConstraint, DateTime, ForeignKey, Index, func, text
 from sqlmodel import Column, Field, Relationship, SQLModel
 
 from backend.models.types import FloatAsNumeric
@@ -20,7 +20,15 @@ class ComposedMealItem(SQLModel, table=True):
         CheckConstraint("planned_fat >= 0", name="ck_planned_fat_nonnegative"),
         CheckConstraint("planned_carbs >= 0", name="ck_planned_carbs_nonnegative"),
         CheckConstraint("planned_weight >= 0", name="ck_planned_weight_nonnegative"),
+        # Covers the eaten macros aggregate, it is answered from the index alone
+        Index(
+            "ix_composed_meal_items_active_macros",
+            "meal_type_daily_summary_id",
+            postgresql_include=["planned_calories", "planned_protein", "planned_carbs", "planned_fat"],
+            postgresql_where=text("is_active"),
+        ),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4, sa_column=Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False)
@@ -13,6 +13,8 @@ if TYPE_CHECKING:
 
 
 class DailyMacrosSummary(SQLModel, table=True):
+    """Snapshot of the eaten macros written only by macros_reconciliation, the app derives them from the meal items"""
+
     __tablename__ = "daily_macros_summaries"
     __table_args__ = (
         UniqueConstraint("day", "user_id", name="uq_daily_macros_user_day"),
@@ -22,6 +24,7 @@ class DailyMacrosSummary(SQLModel, table=True):
         CheckConstraint("carbs >= 0", name="ck_carbs_nonnegative"),
         CheckConstraint("fat >= 0", name="ck_fat_nonnegative"),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4, sa_column=Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False)
@@ -23,6 +23,7 @@ class DailySummary(SQLModel, table=True):
         CheckConstraint("target_carbs >= 0", name="ck_target_carbs_nonnegative"),
         CheckConstraint("target_fat >= 0", name="ck_target_fat_nonnegative"),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4, sa_column=Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False)
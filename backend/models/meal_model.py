@@ -24,6 +24,7 @@ class Meal(SQLModel, table=True):
         CheckConstraint("fat >= 0", name="ck_fat_nonnegative"),
         CheckConstraint("weight >= 0", name="ck_weight_nonnegative"),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4, sa_column=Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False)
@@ -34,6 +34,7 @@ class MealRecipe(SQLModel, table=True):
         UniqueConstraint("meal_id", "language", name="uq_recipe_meal_language"),
         Index("ix_meal_recipe_meal_id", "meal_id"),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4, sa_column=Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False)
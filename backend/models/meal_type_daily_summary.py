@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, List, Optional
 
-from sqlalchemy import UUID, DateTime, ForeignKey, func
+from sqlalchemy import UUID, DateTime, ForeignKey, Index, func
 from sqlmodel import Column, Field, Relationship, SQLModel
 
 from backend.daily_summary.enums.meal_status import MealStatus
@@ -15,6 +15,8 @@ if TYPE_CHECKING:
 
 class MealTypeDailySummary(SQLModel, table=True):
     __tablename__ = "meal_type_daily_summary"
+    __table_args__ = (Index("ix_meal_type_daily_summary_daily_summary_status", "daily_summary_id", "status"),)
+    __mapper_args__ = {"eager_defaults": True}
 
     id: uuid.UUID = Field(
         default_factory=uuid.uuid4, sa_column=Column(UUID(as_uuid=True), primary_key=True, unique=True, nullable=False)
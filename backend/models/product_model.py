@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, String, func
+from sqlmodel import Field, SQLModel
+
+from ..core.db_listeners import register_timestamp_listeners
+from .types import FloatAsNumeric
+
+
+class Product(SQLModel, table=True):
+    __tablename__ = "products"
+
+    barcode: str = Field(sa_column=Column(String(13), primary_key=True, nullable=False))
+    name: str = Field(default="", nullable=False)
+    calories: int = Field(default=0, nullable=False, ge=0)
+    protein: float = Field(sa_column=Column(FloatAsNumeric, default=0, nullable=False), ge=0)
+    fat: float = Field(sa_column=Column(FloatAsNumeric, default=0, nullable=False), ge=0)
+    carbs: float = Field(sa_column=Column(FloatAsNumeric, default=0, nullable=False), ge=0)
+    weight: int = Field(default=0, nullable=False, ge=0)
+    eaten_weight: int = Field(default=0, nullable=False, ge=0)
+    fetched_at: datetime = Field(sa_column=Column(DateTime(timezone=True), nullable=False))
+    created_at: datetime = Field(sa_column=Column(DateTime(timezone=True), server_default=func.now()))
+    updated_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    )
+
+
+register_timestamp_listeners([Product])
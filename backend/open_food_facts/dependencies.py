@@ -1,5 +1,22 @@
+from fastapi import Depends
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.core.database import get_db
+from backend.core.unit_of_work import UnitOfWork, get_unit_of_work
+from backend.open_food_facts.open_food_facts_client import OpenFoodFactsClient, get_open_food_facts_client
 from backend.open_food_facts.open_food_facts_service import OpenFoodFactsService
+from backend.open_food_facts.product_cache import ProductCache, get_product_cache
+from backend.open_food_facts.product_repository import ProductRepository
+
+
+async def get_product_repository(db: AsyncSession = Depends(get_db)) -> ProductRepository:
+    return ProductRepository(db)
 
 
-async def get_open_food_facts_service() -> OpenFoodFactsService:
-    return OpenFoodFactsService()
+async def get_open_food_facts_service(
+    client: OpenFoodFactsClient = Depends(get_open_food_facts_client),
+    product_repository: ProductRepository = Depends(get_product_repository),
+    product_cache: ProductCache = Depends(get_product_cache),
+    unit_of_work: UnitOfWork = Depends(get_unit_of_work),
+) -> OpenFoodFactsService:
+    return OpenFoodFactsService(client, product_repository, product_cache, unit_of_work)
@@ -0,0 +1,60 @@
+import re
+from datetime import datetime
+from typing import Any, Dict
+
+from backend.models import Product
+from backend.open_food_facts.schemas import CachedProduct, ProductDetails
+
+# Constant from the Open Food Facts docs
+KILOJOULES_TO_KILOCALORIES = 0.23900573614
+
+
+def parse_weight(weight_str: str) -> float:
+    if not weight_str:
+        return 0.0
+
+    weight_str = weight_str.replace(" ", "").lower()
+
+    match = re.match(r"([\d.,]+)(g|kg|ml|l)", weight_str)
+    if not match:
+        return 0.0
+
+    value, unit = match.groups()
+    value = float(value.replace(",", "."))
+
+    if unit == "kg":
+        return value * 1000
+    if unit == "l":
+        return value * 1000
+    if unit == "ml":
+        return value
+    return value
+
+
+def response_to_product_details(response: Dict[str, Any]) -> ProductDetails:
+    name = response.get("product_name", "")
+    brands = response.get("brands", "")
+    nutriments = response.get("nutriments", {})
+    weight = response.get("quantity") or response.get("serving_size") or "0"
+    eaten_weight = response.get("serving_size") or response.get("quantity") or "0"
+
+    return ProductDetails(
+        name=name if brands in name else f"{name} ({brands})",
+        calories=round(int(response.get("energy_100g", 0) * KILOJOULES_TO_KILOCALORIES)),
+        protein=round(float(nutriments.get("proteins_100g", 0)), 2),
+        fat=round(float(nutriments.get("fat_100g", 0)), 2),
+        carbs=round(float(nutriments.get("carbohydrates_100g", 0)), 2),
+        weight=round(parse_weight(weight)),
+        eaten_weight=round(parse_weight(eaten_weight)),
+    )
+
+
+def product_details_to_product(barcode: str, details: ProductDetails, fetched_at: datetime) -> Product:
+    return Product(barcode=barcode, fetched_at=fetched_at, **details.model_dump())
+
+
+def product_to_cached_product(product: Product) -> CachedProduct:
+    return CachedProduct(
+        details=ProductDetails.model_validate(product, from_attributes=True),
+        fetched_at=product.fetched_at,
+    )
@@ -0,0 +1,90 @@
+from functools import cache
+from typing import Any, Dict, Protocol
+
+import httpx
+from fastapi import HTTPException, status
+
+from backend.core.circuit_breaker import CircuitBreaker
+from backend.core.logger import logger
+from backend.settings import config
+
+PRODUCT_FIELDS = [
+    "code",
+    "product_name",
+    "brands",
+    "nutriments.carbohydrates_100g",
+    "energy_100g",
+    "nutriments.fat_100g",
+    "nutriments.proteins_100g",
+    "serving_size",
+    "quantity",
+]
+
+
+class OpenFoodFactsClient(Protocol):
+    async def get_product(self, barcode: str) -> Dict[str, Any] | None:
+        """Raw product fields or None when Open Food Facts does not know the barcode"""
+
+
+class HttpOpenFoodFactsClient:
+    def __init__(self, http_client: httpx.AsyncClient, circuit_breaker: CircuitBreaker):
+        self.http_client = http_client
+        self.circuit_breaker = circuit_breaker
+
+    async def get_product(self, barcode: str) -> Dict[str, Any] | None:
+        if not self.circuit_breaker.allow_request():
+            raise self._unavailable_exception()
+
+        try:
+            # Commas have to stay unescaped, Open Food Facts does not recognize escaped ones
+            response = await self.http_client.get(f"/api/v2/product/{barcode}?fields={','.join(PRODUCT_FIELDS)}")
+            if response.status_code == status.HTTP_404_NOT_FOUND:
+                self.circuit_breaker.record_success()
+                return None
+            response.raise_for_status()
+            body = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            self.circuit_breaker.record_failure()
+            logger.warning(f"Open Food Facts request for {barcode} failed: {e!r}")
+            raise self._unavailable_exception() from e
+        except BaseException:
+            # Cancelled requests and unexpected errors are failures too, so a trial call always leaves half open state
+            self.circuit_breaker.record_failure()
+            raise
+
+        self.circuit_breaker.record_success()
+        return body.get("product") if body.get("status") else None
+
+    def _unavailable_exception(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Product database is unavailable, try again later",
+            headers={"Retry-After": str(self.circuit_breaker.retry_after())},
+        )
+
+    async def close(self):
+        await self.http_client.aclose()
+
+
+@cache
+def get_open_food_facts_client() -> HttpOpenFoodFactsClient:
+    """One pooled client per worker, created in the lifespan and closed on shutdown"""
+    http_client = httpx.AsyncClient(
+        base_url=config.OPEN_FOOD_FACTS_URL,
+        headers={"User-Agent": "Foodini/1.0"},
+        # Waiting for a free connection is bounded too, so a slow API cannot pile up requests
+        timeout=httpx.Timeout(config.OPEN_FOOD_FACTS_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=config.OPEN_FOOD_FACTS_MAX_CONNECTIONS,
+            max_keepalive_connections=config.OPEN_FOOD_FACTS_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+    circuit_breaker = CircuitBreaker(
+        "open_food_facts", config.OPEN_FOOD_FACTS_FAILURE_THRESHOLD, config.OPEN_FOOD_FACTS_RESET_TIMEOUT_SECONDS
+    )
+    return HttpOpenFoodFactsClient(http_client, circuit_breaker)
+
+
+async def close_open_food_facts_client():
+    if get_open_food_facts_client.cache_info().currsize:
+        await get_open_food_facts_client().close()
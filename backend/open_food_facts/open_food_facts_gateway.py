@@ -1,8 +1,10 @@
+from typing import List
+
 from fastapi import Depends
 
 from backend.open_food_facts.dependencies import get_open_food_facts_service
 from backend.open_food_facts.open_food_facts_service import OpenFoodFactsService
-from backend.open_food_facts.schemas import ProductDetails
+from backend.open_food_facts.schemas import ProductDetails, ProductsLookup
 
 
 class OpenFoodFactsGateway:
@@ -12,6 +14,9 @@ class OpenFoodFactsGateway:
     async def get_product_details_by_barcode(self, barcode: str) -> ProductDetails:
         return await self.open_food_facts_service.get_product_details_by_barcode(barcode)
 
+    async def get_products_details_by_barcodes(self, barcodes: List[str]) -> ProductsLookup:
+        return await self.open_food_facts_service.get_products_details_by_barcodes(barcodes)
+
 
 def get_open_food_facts_gateway(
     open_food_facts_service: OpenFoodFactsService = Depends(get_open_food_facts_service),
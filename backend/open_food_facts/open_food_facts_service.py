@@ -1,88 +1,152 @@
-import re
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Set, Tuple
 
-import openfoodfacts
+from fastapi import HTTPException
 
+from backend.barcode_scanning.ean13 import is_valid_ean13
+from backend.core.database import SessionLocal
+from backend.core.logger import logger
 from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
+from backend.core.unit_of_work import UnitOfWork
 from backend.core.value_error_exception import ValueErrorException
-from backend.open_food_facts.schemas import ProductDetails
+from backend.open_food_facts.mappers import (
+    product_details_to_product,
+    product_to_cached_product,
+    response_to_product_details,
+)
+from backend.open_food_facts.open_food_facts_client import OpenFoodFactsClient, get_open_food_facts_client
+from backend.open_food_facts.product_cache import ProductCache, get_product_cache
+from backend.open_food_facts.product_repository import ProductRepository
+from backend.open_food_facts.schemas import CachedProduct, ProductDetails, ProductsLookup
+from backend.settings import config
 
+PRODUCT_NOT_FOUND_MESSAGE = "We couldn't find this product in our database. You can add it manually."
 
-def parse_weight(weight_str: str) -> float:
-    if not weight_str:
-        return 0.0
-
-    weight_str = weight_str.replace(" ", "").lower()
-
-    match = re.match(r"([\d.,]+)(g|kg|ml|l)", weight_str)
-    if not match:
-        return 0.0
-
-    value, unit = match.groups()
-    value = float(value.replace(",", "."))
-
-    if unit == "kg":
-        return value * 1000
-    if unit == "l":
-        return value * 1000
-    if unit == "ml":
-        return value
-    return value
+# Barcodes refreshed in the background, references are kept so the tasks are not garbage collected
+_refreshing_barcodes: Set[str] = set()
+_refresh_tasks: Set[asyncio.Task] = set()
 
 
 class OpenFoodFactsService:
-    def __init__(self):
-        self.api = openfoodfacts.API(user_agent="Foodini/1.0")
+    def __init__(
+        self,
+        client: OpenFoodFactsClient | None = None,
+        product_repository: ProductRepository | None = None,
+        product_cache: ProductCache | None = None,
+        unit_of_work: UnitOfWork | None = None,
+    ):
+        self.client = client or get_open_food_facts_client()
+        self.product_repository = product_repository
+        self.product_cache = product_cache or get_product_cache()
+        self.unit_of_work = unit_of_work
 
     async def get_product_details_by_barcode(self, barcode: str) -> ProductDetails:
-        if not await self._validate_check_sum(barcode):
+        if not is_valid_ean13(barcode):
             raise ValueErrorException("Invalid barcode checksum")
 
-        response = self.api.product.get(
-            barcode,
-            fields=[
-                "code",
-                "product_name",
-                "brands",
-                "nutriments.carbohydrates_100g",
-                "energy_100g",
-                "nutriments.fat_100g",
-                "nutriments.proteins_100g",
-                "serving_size",
-                "quantity",
-            ],
+        products, errors = await self._lookup([barcode])
+        if barcode in errors:
+            raise errors[barcode]
+        if barcode not in products:
+            raise NotFoundInDatabaseException(PRODUCT_NOT_FOUND_MESSAGE)
+        return products[barcode]
+
+    async def get_products_details_by_barcodes(self, barcodes: List[str]) -> ProductsLookup:
+        """Cache, then products table, then Open Food Facts; stale products are returned and refreshed in background
+
+        Each source is asked once for all barcodes still missing, unknown and invalid barcodes are left out.
+        Barcodes Open Food Facts could not be asked about (timeout, open circuit) are reported as unavailable.
+        """
+        products, errors = await self._lookup(barcodes)
+        return ProductsLookup(products=products, unavailable_barcodes=list(errors))
+
+    async def _lookup(self, barcodes: List[str]) -> Tuple[Dict[str, ProductDetails], Dict[str, HTTPException]]:
+        barcodes = [barcode for barcode in dict.fromkeys(barcodes) if is_valid_ean13(barcode)]
+        cached_products = await self.product_cache.get_many(barcodes)
+
+        remaining = [barcode for barcode in barcodes if barcode not in cached_products]
+        if remaining and self.product_repository is not None:
+            for product in await self.product_repository.get_products(remaining):
+                cached_products[product.barcode] = product_to_cached_product(product)
+                await self.product_cache.set_product(product.barcode, cached_products[product.barcode])
+
+        remaining = [barcode for barcode in barcodes if barcode not in cached_products]
+        errors = {}
+        if remaining:
+            fetched_products, errors = await self._fetch_products(remaining, self.product_repository, self.unit_of_work)
+            cached_products.update(fetched_products)
+
+        for barcode, cached_product in cached_products.items():
+            if barcode not in remaining and not cached_product.is_missing and self._is_stale(cached_product):
+                self._schedule_refresh(barcode)
+
+        products = {
+            barcode: cached_product.details
+            for barcode, cached_product in cached_products.items()
+            if not cached_product.is_missing
+        }
+        return products, errors
+
+    async def _fetch_products(
+        self, barcodes: List[str], product_repository: ProductRepository | None, unit_of_work: UnitOfWork | None
+    ) -> Tuple[Dict[str, CachedProduct], Dict[str, HTTPException]]:
+        """Requests run concurrently, their number is bounded by the connection pool of the client
+
+        A failed request only leaves its own barcode out, it is returned with the error instead.
+        """
+        responses = await asyncio.gather(
+            *(self.client.get_product(barcode) for barcode in barcodes), return_exceptions=True
         )
-
-        if not response:
-            raise NotFoundInDatabaseException("We couldn't find this product in our database. You can add it manually.")
-
-        name = response.get("product_name", "")
-        brands = response.get("brands", "")
-        nutriments = response.get("nutriments", {})
-        weight = response.get("quantity") or response.get("serving_size") or "0"
-        eaten_weight = response.get("serving_size") or response.get("quantity") or "0"
-
-        return ProductDetails(
-            name=name if brands in name else f"{name} ({brands})",
-            calories=round(
-                int(response.get("energy_100g", 0) * 0.23900573614)
-            ),  # this multiplication is const from open food facts docs
-            protein=round(float(nutriments.get("proteins_100g", 0)), 2),
-            fat=round(float(nutriments.get("fat_100g", 0)), 2),
-            carbs=round(float(nutriments.get("carbohydrates_100g", 0)), 2),
-            weight=round(parse_weight(weight)),
-            eaten_weight=round(parse_weight(eaten_weight)),
-        )
-
-    @classmethod
-    async def _validate_check_sum(cls, barcode: str) -> bool:
-        if (len(barcode) != 13) or (not barcode.isdigit()):
-            return False
-
-        def digits_of(n):
-            return [int(d) for d in str(n)]
-
-        digits = digits_of(barcode)
-        odd_digits = digits[-3::-2]
-        even_digits = digits[-2::-2]
-        checksum = sum(odd_digits + 3 * even_digits)
-        return checksum % 10 == 10 - digits[-1]
+        fetched_at = datetime.now().astimezone()
+
+        cached_products = {}
+        errors = {}
+        products = []
+        for barcode, response in zip(barcodes, responses):
+            if isinstance(response, HTTPException):
+                errors[barcode] = response
+                continue
+            if isinstance(response, BaseException):
+                raise response
+            if not response:
+                await self.product_cache.set_missing(barcode)
+                cached_products[barcode] = CachedProduct(fetched_at=fetched_at)
+                continue
+            product = product_details_to_product(barcode, response_to_product_details(response), fetched_at)
+            products.append(product)
+            cached_products[barcode] = product_to_cached_product(product)
+            await self.product_cache.set_product(barcode, cached_products[barcode])
+
+        if products and product_repository is not None:
+            async with unit_of_work:
+                await product_repository.upsert_products(products)
+        return cached_products, errors
+
+    @staticmethod
+    def _is_stale(cached_product: CachedProduct) -> bool:
+        refresh_after = timedelta(seconds=config.PRODUCT_REFRESH_AFTER_SECONDS)
+        return cached_product.fetched_at + refresh_after < datetime.now().astimezone()
+
+    def _schedule_refresh(self, barcode: str):
+        if barcode in _refreshing_barcodes:
+            return
+        _refreshing_barcodes.add(barcode)
+        task = asyncio.create_task(self._refresh_product(barcode))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_refresh_tasks.discard)
+
+    async def _refresh_product(self, barcode: str):
+        """Runs after the response was sent, so it uses its own session instead of the request one"""
+        try:
+            async with SessionLocal() as db:
+                cached_products, errors = await self._fetch_products([barcode], ProductRepository(db), UnitOfWork(db))
+            if barcode in errors:
+                raise errors[barcode]
+            if cached_products[barcode].is_missing:
+                # The stale details are still better than nothing, they are kept until Open Food Facts has them again
+                logger.info(f"Product {barcode} is no longer available in Open Food Facts")
+        except Exception as e:
+            logger.warning(f"Refreshing product {barcode} failed: {e}")
+        finally:
+            _refreshing_barcodes.discard(barcode)
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import Dict, List
+
+from backend.core.cache import TwoTierCache
+from backend.core.database import redis_cache
+from backend.open_food_facts.schemas import CachedProduct
+from backend.settings import config
+
+
+class ProductCache:
+    def __init__(self, products: TwoTierCache[CachedProduct], missing_products: TwoTierCache[CachedProduct]):
+        self.products = products
+        self.missing_products = missing_products
+
+    async def get(self, barcode: str) -> CachedProduct | None:
+        return await self.products.get(barcode) or await self.missing_products.get(barcode)
+
+    async def get_many(self, barcodes: List[str]) -> Dict[str, CachedProduct]:
+        products = await self.products.get_many(barcodes)
+        remaining = [barcode for barcode in barcodes if barcode not in products]
+        if remaining:
+            products.update(await self.missing_products.get_many(remaining))
+        return products
+
+    async def set_product(self, barcode: str, product: CachedProduct):
+        await self.products.set(barcode, product)
+        await self.missing_products.invalidate(barcode)
+
+    async def set_missing(self, barcode: str):
+        """Unknown barcodes are remembered for a shorter time, the product may be added to Open Food Facts later"""
+        await self.missing_products.set(barcode, CachedProduct(fetched_at=datetime.now().astimezone()))
+
+
+def _product_cache(namespace: str, redis_ttl_seconds: int) -> TwoTierCache[CachedProduct]:
+    return TwoTierCache[CachedProduct](
+        namespace=namespace,
+        redis=redis_cache,
+        serialize=lambda product: product.model_dump_json(),
+        deserialize=CachedProduct.model_validate_json,
+        local_max_size=config.PRODUCT_CACHE_LOCAL_MAX_SIZE,
+        local_ttl_seconds=config.PRODUCT_CACHE_LOCAL_TTL_SECONDS,
+        redis_ttl_seconds=redis_ttl_seconds,
+    )
+
+
+product_cache = ProductCache(
+    products=_product_cache("products", config.PRODUCT_CACHE_REDIS_TTL_SECONDS),
+    missing_products=_product_cache("missing_products", config.PRODUCT_MISSING_TTL_SECONDS),
+)
+
+
+def get_product_cache() -> ProductCache:
+    return product_cache
@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import csv
+import gzip
+import json
+import sys
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+
+from pydantic import ValidationError
+
+from backend.barcode_scanning.ean13 import is_valid_ean13
+from backend.core.database import engine
+from backend.core.logger import logger
+from backend.open_food_facts.mappers import response_to_product_details
+
+"""Bulk import of the public Open Food Facts dump (JSONL or tab separated CSV, optionally gzipped) into products"""
+
+ProductRow = Tuple[str, str, int, float, float, float, int, int, datetime, datetime]
+
+PRODUCT_COLUMNS = ["barcode", "name", "calories", "protein", "fat", "carbs", "weight", "eaten_weight", "fetched_at"]
+# Time of the last change in Open Food Facts, only used to decide which rows of the dump are newer than ours
+COLUMNS = [*PRODUCT_COLUMNS, "modified_at"]
+# Records without last_modified_t are only imported when the product is not stored yet
+UNKNOWN_MODIFIED_AT = datetime.fromtimestamp(0, tz=timezone.utc)
+NUTRIMENTS = ["proteins_100g", "fat_100g", "carbohydrates_100g"]
+STAGING_TABLE = "products_import"
+
+
+def _open_dump(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def _read_jsonl(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    for line in lines:
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+
+def _read_csv(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """CSV dump keeps nutriments in flat columns, they are nested like in the API response"""
+    csv.field_size_limit(sys.maxsize)
+    for row in csv.DictReader(lines, delimiter="\t", quoting=csv.QUOTE_NONE):
+        nutriments = {key: row[key] for key in NUTRIMENTS if row.get(key)}
+        yield {**row, "nutriments": nutriments}
+
+
+def read_dump(path: Path) -> Iterator[Dict[str, Any]]:
+    """Records are streamed line by line, so memory does not depend on the size of the dump"""
+    reader = _read_csv if ".csv" in path.suffixes else _read_jsonl
+    with _open_dump(path) as lines:
+        yield from reader(lines)
+
+
+def _number(value: Any) -> float:
+    return float(value) if value not in (None, "") else 0.0
+
+
+def to_product_row(record: Dict[str, Any], imported_at: datetime | None = None) -> ProductRow | None:
+    """fetched_at is the import time, so imported products are fresh for PRODUCT_REFRESH_AFTER_SECONDS"""
+    barcode = str(record.get("code") or "")
+    if not is_valid_ean13(barcode):
+        return None
+
+    nutriments = record.get("nutriments") or {}
+    try:
+        response = {
+            "product_name": str(record.get("product_name") or ""),
+            "brands": str(record.get("brands") or ""),
+            "energy_100g": _number(record.get("energy_100g") or nutriments.get("energy_100g")),
+            "nutriments": {key: _number(nutriments.get(key)) for key in NUTRIMENTS},
+            "quantity": str(record.get("quantity") or ""),
+            "serving_size": str(record.get("serving_size") or ""),
+        }
+        details = response_to_product_details(response)
+        last_modified = record.get("last_modified_t")
+        modified_at = (
+            datetime.fromtimestamp(int(last_modified), tz=timezone.utc) if last_modified else UNKNOWN_MODIFIED_AT
+        )
+    except (TypeError, ValueError, OverflowError, ValidationError):
+        return None
+
+    return barcode, *details.model_dump().values(), imported_at or datetime.now(timezone.utc), modified_at
+
+
+def batched(rows: Iterable[ProductRow], batch_size: int) -> Iterator[List[ProductRow]]:
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
+
+
+async def import_products(path: Path, batch_size: int = 10_000) -> int:
+    """Every batch is copied to a staging table and merged into products, newer rows win"""
+    imported_at = datetime.now(timezone.utc)
+    rows = (row for row in (to_product_row(record, imported_at) for record in read_dump(path)) if row is not None)
+    imported = 0
+    async with engine.connect() as connection:
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        await driver_connection.execute(
+            f"CREATE TEMP TABLE {STAGING_TABLE} (LIKE products INCLUDING DEFAULTS, modified_at timestamptz NOT NULL) "
+            f"ON COMMIT DELETE ROWS"
+        )
+        for batch in batched(rows, batch_size):
+            async with driver_connection.transaction():
+                await driver_connection.copy_records_to_table(STAGING_TABLE, records=batch, columns=COLUMNS)
+                await driver_connection.execute(_skip_outdated_statement())
+                await driver_connection.execute(_merge_statement())
+            imported += len(batch)
+            logger.info(f"Imported {imported} products")
+    return imported
+
+
+def _skip_outdated_statement() -> str:
+    """Products fetched (or imported) after their last change in the dump are already up to date"""
+    return (
+        f"DELETE FROM {STAGING_TABLE} USING products "
+        f"WHERE products.barcode = {STAGING_TABLE}.barcode AND products.fetched_at >= {STAGING_TABLE}.modified_at"
+    )
+
+
+def _merge_statement() -> str:
+    columns = ", ".join(PRODUCT_COLUMNS)
+    updates = ", ".join(f"{column} = EXCLUDED.{column}" for column in PRODUCT_COLUMNS[1:])
+    return (
+        f"INSERT INTO products ({columns}) "
+        f"SELECT DISTINCT ON (barcode) {columns} FROM {STAGING_TABLE} ORDER BY barcode, modified_at DESC "
+        f"ON CONFLICT (barcode) DO UPDATE SET {updates}, updated_at = now()"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import the Open Food Facts dump into the products table")
+    parser.add_argument("path", type=Path, help="openfoodfacts-products.jsonl[.gz] or a products .csv[.gz] dump")
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    args = parser.parse_args()
+    imported = asyncio.run(import_products(args.path, args.batch_size))
+    logger.info(f"Open Food Facts import finished, {imported} products")
+
+
+if __name__ == "__main__":
+    main()
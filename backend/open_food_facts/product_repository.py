@@ -0,0 +1,26 @@
+from typing import List, Sequence
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.models import Product
+
+
+class ProductRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_products(self, barcodes: List[str]) -> Sequence[Product]:
+        result = await self.db.execute(select(Product).where(Product.barcode.in_(barcodes)))
+        return result.scalars().all()
+
+    async def upsert_products(self, products: List[Product]):
+        values = [product.model_dump(exclude={"created_at", "updated_at"}) for product in products]
+        statement = insert(Product).values(values)
+        statement = statement.on_conflict_do_update(
+            index_elements=[Product.barcode],
+            set_={**{key: statement.excluded[key] for key in values[0] if key != "barcode"}, "updated_at": func.now()},
+        )
+        await self.db.execute(statement)
+        await self.db.flush()
@@ -1,3 +1,6 @@
+from datetime import datetime
+from typing import Dict, List
+
 from pydantic import BaseModel, Field
 
 
@@ -9,3 +12,17 @@ class ProductDetails(BaseModel):
     carbs: float = Field(default=0, ge=0)
     weight: int = Field(default=0, ge=0)
     eaten_weight: int = Field(default=0, ge=0)
+
+
+class CachedProduct(BaseModel):
+    details: ProductDetails | None = None
+    fetched_at: datetime
+
+    @property
+    def is_missing(self) -> bool:
+        return self.details is None
+
+
+class ProductsLookup(BaseModel):
+    products: Dict[str, ProductDetails] = Field(default_factory=dict)
+    unavailable_barcodes: List[str] = Field(default_factory=list)
@@ -0,0 +1,131 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from backend.core.circuit_breaker import CircuitBreaker, CircuitState
+from backend.open_food_facts.open_food_facts_client import HttpOpenFoodFactsClient
+
+BARCODE = "5901234123457"
+
+
+def make_client(handler, failure_threshold=2, reset_timeout_seconds=60):
+    http_client = httpx.AsyncClient(base_url="https://off.test", transport=httpx.MockTransport(handler))
+    return HttpOpenFoodFactsClient(http_client, CircuitBreaker("test", failure_threshold, reset_timeout_seconds))
+
+
+@pytest.mark.asyncio
+async def test_get_product_returns_product_fields():
+    # Given
+    requests = []
+
+    def handler(request: httpx.Request):
+        requests.append(request)
+        return httpx.Response(200, json={"status": 1, "product": {"product_name": "Oat flakes"}})
+
+    client = make_client(handler)
+
+    # When
+    product = await client.get_product(BARCODE)
+
+    # Then
+    assert product == {"product_name": "Oat flakes"}
+    assert requests[0].url.path == f"/api/v2/product/{BARCODE}"
+    assert "fields=code,product_name" in str(requests[0].url)
+
+
+@pytest.mark.asyncio
+async def test_unknown_product_returns_none():
+    # Given
+    client = make_client(lambda request: httpx.Response(404, json={"status": 0}))
+
+    # When
+    product = await client.get_product(BARCODE)
+
+    # Then
+    assert product is None
+    assert client.circuit_breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_circuit_opens_after_failures_and_stops_calling_api():
+    # Given
+    calls = []
+
+    def handler(request: httpx.Request):
+        calls.append(request)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    client = make_client(handler, failure_threshold=2)
+
+    # When
+    for _ in range(3):
+        with pytest.raises(HTTPException) as exc_info:
+            await client.get_product(BARCODE)
+
+    # Then
+    assert exc_info.value.status_code == 503
+    assert len(calls) == 2
+    assert client.circuit_breaker.state == CircuitState.OPEN
+    assert client.circuit_breaker.rejected == 1
+
+
+@pytest.mark.asyncio
+async def test_half_open_circuit_closes_after_successful_trial():
+    # Given
+    responses = [httpx.Response(500), httpx.Response(200, json={"status": 1, "product": {}})]
+    client = make_client(lambda request: responses.pop(0), failure_threshold=1, reset_timeout_seconds=0)
+
+    # When
+    with pytest.raises(HTTPException):
+        await client.get_product(BARCODE)
+    product = await client.get_product(BARCODE)
+
+    # Then
+    assert product == {}
+    assert client.circuit_breaker.state == CircuitState.CLOSED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_trial_does_not_keep_circuit_half_open():
+    # Given
+    responses = [httpx.Response(500), asyncio.CancelledError(), httpx.Response(200, json={"status": 1, "product": {}})]
+
+    def handler(request: httpx.Request):
+        response = responses.pop(0)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    client = make_client(handler, failure_threshold=1, reset_timeout_seconds=0)
+    with pytest.raises(HTTPException):
+        await client.get_product(BARCODE)
+
+    # When
+    with pytest.raises(asyncio.CancelledError):
+        await client.get_product(BARCODE)
+    product = await client.get_product(BARCODE)
+
+    # Then
+    assert product == {}
+    assert client.circuit_breaker.state == CircuitState.CLOSED
+
+
+def test_half_open_circuit_allows_new_trial_after_reset_timeout():
+    # Given
+    circuit_breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=30)
+    with patch("backend.core.circuit_breaker.time.monotonic", return_value=100.0):
+        circuit_breaker.record_failure()
+
+    # When
+    with patch("backend.core.circuit_breaker.time.monotonic", return_value=130.0):
+        first_trial = circuit_breaker.allow_request()
+        during_trial = circuit_breaker.allow_request()
+    with patch("backend.core.circuit_breaker.time.monotonic", return_value=160.0):
+        after_lost_trial = circuit_breaker.allow_request()
+
+    # Then
+    assert (first_trial, during_trial, after_lost_trial) == (True, False, True)
+    assert circuit_breaker.state == CircuitState.HALF_OPEN
@@ -0,0 +1,228 @@
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
+from backend.core.unit_of_work import UnitOfWork
+from backend.meals.test.test_meal_cache import FakeRedis
+from backend.open_food_facts import open_food_facts_service
+from backend.open_food_facts.mappers import product_details_to_product, product_to_cached_product
+from backend.open_food_facts.open_food_facts_service import OpenFoodFactsService
+from backend.open_food_facts.product_cache import ProductCache, _product_cache
+from backend.open_food_facts.schemas import ProductDetails
+
+BARCODE = "5901234123457"
+RESPONSE = {
+    "code": BARCODE,
+    "product_name": "Oat flakes",
+    "brands": "Foodini",
+    "energy_100g": 1548,
+    "nutriments": {"proteins_100g": 13.5, "fat_100g": 7, "carbohydrates_100g": 58.7},
+    "quantity": "500 g",
+    "serving_size": "50 g",
+}
+
+
+class FakeOpenFoodFactsClient:
+    def __init__(self, products):
+        self.products = products
+        self.calls = []
+
+    async def get_product(self, barcode):
+        self.calls.append(barcode)
+        product = self.products.get(barcode)
+        if isinstance(product, Exception):
+            raise product
+        return product
+
+
+@pytest.fixture
+def redis():
+    return FakeRedis()
+
+
+@pytest.fixture
+def product_cache(redis):
+    cache = ProductCache(_product_cache("test_products", 60), _product_cache("test_missing_products", 60))
+    cache.products.redis = redis
+    cache.missing_products.redis = redis
+    return cache
+
+
+@pytest.fixture
+def product_repository():
+    repository = MagicMock()
+    repository.get_products = AsyncMock(return_value=[])
+    repository.upsert_products = AsyncMock()
+    return repository
+
+
+@pytest.fixture
+def unit_of_work():
+    return UnitOfWork(AsyncMock())
+
+
+@pytest.mark.asyncio
+async def test_second_lookup_does_not_call_open_food_facts(product_cache, product_repository, unit_of_work):
+    # Given
+    client = FakeOpenFoodFactsClient({BARCODE: RESPONSE})
+    service = OpenFoodFactsService(client, product_repository, product_cache, unit_of_work)
+
+    # When
+    first = await service.get_product_details_by_barcode(BARCODE)
+    product_cache.products.local.clear()
+    second = await service.get_product_details_by_barcode(BARCODE)
+
+    # Then
+    assert client.calls == [BARCODE]
+    assert first == second
+    assert first.name == "Oat flakes (Foodini)"
+    assert first.calories == 369
+    assert first.eaten_weight == 50
+    assert product_repository.upsert_products.await_args.args[0][0].barcode == BARCODE
+    unit_of_work.db.commit.assert_awaited_once()
+    assert product_cache.products.redis_hits == 1
+
+
+@pytest.mark.asyncio
+async def test_barcode_with_check_digit_zero_is_looked_up(product_cache, product_repository, unit_of_work):
+    # Given
+    barcode = "8710000000000"
+    client = FakeOpenFoodFactsClient({barcode: {**RESPONSE, "code": barcode}})
+    service = OpenFoodFactsService(client, product_repository, product_cache, unit_of_work)
+
+    # When
+    products = (await service.get_products_details_by_barcodes([barcode])).products
+
+    # Then
+    assert client.calls == [barcode]
+    assert products[barcode].name == "Oat flakes (Foodini)"
+
+
+@pytest.mark.asyncio
+async def test_product_stored_in_database_is_cached_without_network(product_cache, product_repository, unit_of_work):
+    # Given
+    details = ProductDetails(name="Milk", calories=64, protein=3.2, fat=3.5, carbs=4.8, weight=1000, eaten_weight=250)
+    product_repository.get_products.return_value = [
+        product_details_to_product(BARCODE, details, datetime.now().astimezone())
+    ]
+    client = FakeOpenFoodFactsClient({})
+    service = OpenFoodFactsService(client, product_repository, product_cache, unit_of_work)
+
+    # When
+    result = await service.get_product_details_by_barcode(BARCODE)
+    await service.get_product_details_by_barcode(BARCODE)
+
+    # Then
+    assert result == details
+    assert client.calls == []
+    product_repository.get_products.assert_awaited_once_with([BARCODE])
+
+
+@pytest.mark.asyncio
+async def test_missing_product_is_negatively_cached(product_cache, product_repository, unit_of_work):
+    # Given
+    client = FakeOpenFoodFactsClient({})
+    service = OpenFoodFactsService(client, product_repository, product_cache, unit_of_work)
+
+    # When
+    for _ in range(3):
+        with pytest.raises(NotFoundInDatabaseException):
+            await service.get_product_details_by_barcode(BARCODE)
+
+    # Then
+    assert client.calls == [BARCODE]
+    product_repository.upsert_products.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_stale_product_is_returned_and_refreshed_in_background(product_cache, product_repository, unit_of_work):
+    # Given
+    stale = ProductDetails(name="Old name", calories=100)
+    fetched_at = datetime.now().astimezone() - timedelta(days=30)
+    product_repository.get_products.return_value = [product_details_to_product(BARCODE, stale, fetched_at)]
+    client = FakeOpenFoodFactsClient({BARCODE: RESPONSE})
+    service = OpenFoodFactsService(client, product_repository, product_cache, unit_of_work)
+    refresh_db = AsyncMock()
+    session = MagicMock()
+    session.return_value.__aenter__ = AsyncMock(return_value=refresh_db)
+    session.return_value.__aexit__ = AsyncMock(return_value=None)
+
+    with (
+        patch.object(open_food_facts_service, "SessionLocal", session),
+        patch.object(open_food_facts_service, "ProductRepository", return_value=product_repository),
+    ):
+        # When
+        first = await service.get_product_details_by_barcode(BARCODE)
+        await service.get_product_details_by_barcode(BARCODE)
+        for task in list(open_food_facts_service._refresh_tasks):
+            await task
+        refreshed = await service.get_product_details_by_barcode(BARCODE)
+
+    # Then
+    assert first == stale
+    assert client.calls == [BARCODE]
+    assert refreshed.name == "Oat flakes (Foodini)"
+    product_repository.upsert_products.assert_awaited_once()
+    refresh_db.commit.assert_awaited_once()
+    unit_of_work.db.commit.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_batch_lookup_asks_every_source_once(product_cache, product_repository, unit_of_work):
+    # Given
+    cached_barcode, stored_barcode, new_barcode, unknown_barcode = (
+        "4006381333931",
+        "0012345678905",
+        BARCODE,
+        "9780201379624",
+    )
+    fetched_at = datetime.now().astimezone()
+    await product_cache.set_product(
+        cached_barcode,
+        product_to_cached_product(
+            product_details_to_product(cached_barcode, ProductDetails(name="Cached"), fetched_at)
+        ),
+    )
+    product_repository.get_products.return_value = [
+        product_details_to_product(stored_barcode, ProductDetails(name="Stored"), fetched_at)
+    ]
+    client = FakeOpenFoodFactsClient({new_barcode: RESPONSE})
+    service = OpenFoodFactsService(client, product_repository, product_cache, unit_of_work)
+    barcodes = [cached_barcode, stored_barcode, new_barcode, unknown_barcode, "123", new_barcode]
+
+    # When
+    products = (await service.get_products_details_by_barcodes(barcodes)).products
+
+    # Then
+    assert {barcode: product.name for barcode, product in products.items()} == {
+        cached_barcode: "Cached",
+        stored_barcode: "Stored",
+        new_barcode: "Oat flakes (Foodini)",
+    }
+    product_repository.get_products.assert_awaited_once_with([stored_barcode, new_barcode, unknown_barcode])
+    assert sorted(client.calls) == sorted([new_barcode, unknown_barcode])
+    saved_products = product_repository.upsert_products.await_args.args[0]
+    assert [product.barcode for product in saved_products] == [new_barcode]
+
+
+@pytest.mark.asyncio
+async def test_unavailable_product_does_not_fail_batch_lookup(product_cache, product_repository, unit_of_work):
+    # Given
+    other_barcode = "4006381333931"
+    unavailable = HTTPException(status_code=503, detail="Open Food Facts is unavailable")
+    client = FakeOpenFoodFactsClient({BARCODE: RESPONSE, other_barcode: unavailable})
+    service = OpenFoodFactsService(client, product_repository, product_cache, unit_of_work)
+
+    # When
+    lookup = await service.get_products_details_by_barcodes([BARCODE, other_barcode])
+    with pytest.raises(HTTPException) as exc_info:
+        await service.get_product_details_by_barcode(other_barcode)
+
+    # Then
+    assert list(lookup.products) == [BARCODE]
+    assert lookup.unavailable_barcodes == [other_barcode]
+    assert exc_info.value is unavailable
+    assert await product_cache.get_many([other_barcode]) == {}
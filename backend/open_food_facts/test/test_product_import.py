@@ -0,0 +1,84 @@
+import gzip
+import json
+from datetime import datetime, timezone
+
+from backend.open_food_facts.product_import import UNKNOWN_MODIFIED_AT, batched, read_dump, to_product_row
+
+BARCODE = "5901234123457"
+RECORD = {
+    "code": BARCODE,
+    "product_name": "Oat flakes",
+    "brands": "Foodini",
+    "nutriments": {"energy_100g": 1548, "proteins_100g": 13.5, "fat_100g": 7, "carbohydrates_100g": 58.7},
+    "quantity": "500 g",
+    "serving_size": "50 g",
+    "last_modified_t": 1700000000,
+    "ingredients_text": "oats",
+}
+
+
+def test_jsonl_dump_is_streamed_and_mapped(tmp_path):
+    # Given
+    path = tmp_path / "products.jsonl.gz"
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        file.write(json.dumps(RECORD) + "\n")
+        file.write("{broken\n")
+        file.write(json.dumps({**RECORD, "code": "5901234123458"}) + "\n")
+
+    imported_at = datetime.now(timezone.utc)
+
+    # When
+    rows = [row for row in (to_product_row(record, imported_at) for record in read_dump(path)) if row is not None]
+
+    # Then
+    assert len(rows) == 1
+    barcode, name, calories, protein, fat, carbs, weight, eaten_weight, fetched_at, modified_at = rows[0]
+    assert (barcode, name, calories) == (BARCODE, "Oat flakes (Foodini)", 369)
+    assert (protein, fat, carbs, weight, eaten_weight) == (13.5, 7, 58.7, 500, 50)
+    assert fetched_at == imported_at
+    assert modified_at.timestamp() == 1700000000
+
+
+def test_csv_dump_is_mapped_like_jsonl(tmp_path):
+    # Given
+    path = tmp_path / "products.csv"
+    columns = ["code", "product_name", "brands", "energy_100g", "proteins_100g", "fat_100g", "carbohydrates_100g"]
+    values = [BARCODE, "Oat flakes", "Foodini", "1548", "13.5", "7", "58.7"]
+    columns += ["quantity", "serving_size", "last_modified_t"]
+    values += ["500 g", "50 g", "1700000000"]
+    path.write_text("\t".join(columns) + "\n" + "\t".join(values) + "\n", encoding="utf-8")
+    jsonl_path = tmp_path / "products.jsonl"
+    jsonl_path.write_text(json.dumps(RECORD) + "\n", encoding="utf-8")
+
+    imported_at = datetime.now(timezone.utc)
+
+    # When
+    csv_rows = [to_product_row(record, imported_at) for record in read_dump(path)]
+    jsonl_rows = [to_product_row(record, imported_at) for record in read_dump(jsonl_path)]
+
+    # Then
+    assert csv_rows == jsonl_rows
+
+
+def test_barcode_with_check_digit_zero_is_imported():
+    # When
+    row = to_product_row({**RECORD, "code": "8710000000000", "last_modified_t": None})
+
+    # Then
+    assert row[0] == "8710000000000"
+    assert row[-1] == UNKNOWN_MODIFIED_AT
+
+
+def test_invalid_values_are_skipped():
+    # Then
+    assert to_product_row({**RECORD, "code": "123"}) is None
+    assert to_product_row({**RECORD, "nutriments": {"fat_100g": -1}}) is None
+    assert to_product_row({**RECORD, "nutriments": {"fat_100g": "unknown"}}) is None
+
+
+def test_batched_keeps_bounded_batches():
+    # When
+    batches = list(batched(iter(range(5)), 2))
+
+    # Then
+    assert batches == [[0, 1], [2, 3], [4]]
@@ -22,6 +22,8 @@ class Settings(BaseSettings):
     NEW_PASSWORD_SALT: str
     REDIS_HOST: str
     REDIS_PORT: int
+    REDIS_CACHE_DB: int = 1
+    REDIS_QUEUE_DB: int = 2
     TIMEZONE: timezone = timezone.utc
     MACROS_CHANGE_TOLERANCE: int = 30
     FAT_CONVERSION_FACTOR: int = 9
@@ -32,6 +34,57 @@ class Settings(BaseSettings):
     MODEL_NAME: str = "qwen3-coder:480b-cloud"
     OLLAMA_API_BASE_URL: str = "https://ollama.com"
     OLLAMA_API_KEY: str
+    LLM_MAX_CONCURRENCY: int = 8
+    MEAL_CACHE_LOCAL_MAX_SIZE: int = 2048
+    MEAL_CACHE_LOCAL_TTL_SECONDS: int = 300
+    MEAL_CACHE_REDIS_TTL_SECONDS: int = 7 * 24 * 3600
+    USER_CACHE_LOCAL_MAX_SIZE: int = 1024
+    USER_CACHE_LOCAL_TTL_SECONDS: int = 30
+    USER_CACHE_REDIS_TTL_SECONDS: int = 300
+    REVOKED_TOKENS_LOCAL_MAX_SIZE: int = 10000
+    PASSWORD_HASHING_WORKERS: int = 4
+    PASSWORD_HASHING_MAX_PENDING: int = 64
+    PASSWORD_REHASH_ON_LOGIN: bool = False
+    BARCODE_DECODING_WORKERS: int = 2
+    BARCODE_DECODING_MAX_PENDING: int = 16
+    BARCODE_DECODING_MAX_WIDTH: int = 1600
+    BARCODE_DECODING_MAX_PIXELS: int = 24_000_000
+    BARCODE_IMAGE_MAX_BYTES: int = 10 * 1024 * 1024
+    BARCODE_BATCH_MAX_ITEMS: int = 20
+    MAIL_OUTBOX_ENABLED: bool = True
+    MAIL_TRANSPORT: str = "smtp"
+    MAIL_FILE_SINK_DIR: str = "db/mail_outbox"
+    MAIL_BATCH_SIZE: int = 20
+    MAIL_MAX_ATTEMPTS: int = 5
+    MAIL_RETRY_BASE_DELAY_SECONDS: int = 30
+    MAIL_DEDUP_TTL_SECONDS: int = 60
+    MAIL_OUTBOX_MESSAGE_TTL_SECONDS: int = 7 * 24 * 3600
+    MAIL_OUTBOX_POLL_TIMEOUT_SECONDS: int = 5
+    MAIL_OUTBOX_LEASE_SECONDS: int = 120
+    PRODUCT_CACHE_LOCAL_MAX_SIZE: int = 4096
+    PRODUCT_CACHE_LOCAL_TTL_SECONDS: int = 300
+    PRODUCT_CACHE_REDIS_TTL_SECONDS: int = 30 * 24 * 3600
+    PRODUCT_REFRESH_AFTER_SECONDS: int = 7 * 24 * 3600
+    PRODUCT_MISSING_TTL_SECONDS: int = 6 * 3600
+    OPEN_FOOD_FACTS_URL: str = "https://world.openfoodfacts.org"
+    OPEN_FOOD_FACTS_TIMEOUT_SECONDS: float = 3.0
+    OPEN_FOOD_FACTS_MAX_CONNECTIONS: int = 10
+    OPEN_FOOD_FACTS_MAX_KEEPALIVE_CONNECTIONS: int = 5
+    OPEN_FOOD_FACTS_FAILURE_THRESHOLD: int = 5
+    OPEN_FOOD_FACTS_RESET_TIMEOUT_SECONDS: int = 30
+    DIET_GENERATION_WORKERS: int = 1
+    DIET_TRANSLATION_CONCURRENCY: int = 4
+    DIET_GENERATION_JOB_TTL_SECONDS: int = 24 * 3600
+    DIET_GENERATION_QUEUE_POLL_TIMEOUT_SECONDS: int = 5
+    DIET_GENERATION_JOB_LEASE_SECONDS: int = 60
+    DIET_WEEK_MAX_DAYS: int = 7
+    DIET_WEEK_GENERATION_CONCURRENCY: int = 3
+    DIET_WEEK_MAX_REPLANS: int = 2
+    MEAL_RETRIEVAL_ENABLED: bool = True
+    MEAL_RETRIEVAL_INDEX_PATH: str = "db/meal_retrieval_index.npz"
+    MEAL_RETRIEVAL_SAVE_EVERY: int = 20
+    MEAL_RETRIEVAL_CALORIE_TOLERANCE: float = 0.05
+    MEAL_RETRIEVAL_MACRO_TOLERANCE: float = 0.1
 
     model_config = SettingsConfigDict(env_file=f"{env}", extra="ignore")
 
@@ -24,19 +24,26 @@ class AuthDependency:
         self.token = token
         self.user_validators = user_validators
         self.authorization_service = authorization_service
+        # FastAPI creates one instance per request, so the token is verified and the user loaded only once
+        self._token_payload: TokenPayload | None = None
+        self._current_user: Type[User] | None = None
 
     async def get_token_payload(self) -> TokenPayload:
-        return await self.authorization_service.verify_access_token(self.token)
+        if self._token_payload is None:
+            self._token_payload = await self.authorization_service.verify_access_token(self.token)
+        return self._token_payload
 
     async def get_current_user(self) -> tuple[Type[User], TokenPayload]:
         token_payload = await self.get_token_payload()
-        user_id_from_token = token_payload.id
+        if self._current_user is None:
+            user_id_from_token = token_payload.id
 
-        self.user_validators.check_user_permission(user_id_from_token, self.user_id)
-        user = await self.user_validators.ensure_user_exists_by_id(user_id_from_token)
-        self.user_validators.ensure_verified_user(user)
+            self.user_validators.check_user_permission(user_id_from_token, self.user_id)
+            user = await self.user_validators.ensure_user_exists_by_id(user_id_from_token)
+            self.user_validators.ensure_verified_user(user)
+            self._current_user = user
 
-        return user, token_payload
+        return self._current_user, token_payload
 
     async def require_roles(self, allowed_roles: List[Role]) -> TokenPayload:
         payload = await self.get_token_payload()
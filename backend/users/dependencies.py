@@ -2,19 +2,20 @@ from uuid import UUID
 
 import redis.asyncio as aioredis
 from fastapi import Depends, Query
-from fastapi_mail import ConnectionConfig, FastMail
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from backend.core.database import get_db, get_redis
+from backend.core.database import get_db, get_redis, get_redis_queue
 from backend.core.security import oauth2_scheme
 from backend.core.user_authorisation_service import AuthorizationService
-from backend.settings import MailSettings
+from backend.settings import config
 from backend.users.auth_dependencies import AuthDependency
 from backend.users.enums.role import Role
 from backend.users.mail import MailService
+from backend.users.mail_outbox_repository import MailOutboxRepository
 from backend.users.service.email_verification_service import EmailVerificationService
 from backend.users.service.user_service import UserService
 from backend.users.service.user_validation_service import UserValidationService
+from backend.users.user_cache import UserCache, get_user_cache
 from backend.users.user_repository import UserRepository
 from backend.users.user_role_repository import UserRoleRepository
 
@@ -27,16 +28,16 @@ async def get_user_role_repository(db: AsyncSession = Depends(get_db)) -> UserRo
     return UserRoleRepository(db)
 
 
-async def get_mail_config() -> FastMail:
-    settings = MailSettings()
-    mail_config = ConnectionConfig(**settings.model_dump())
-    return FastMail(config=mail_config)
+async def get_mail_outbox_repository(
+    redis: aioredis.Redis = Depends(get_redis_queue),
+) -> MailOutboxRepository | None:
+    return MailOutboxRepository(redis) if config.MAIL_OUTBOX_ENABLED else None
 
 
 async def get_mail_service(
-    mail_config: FastMail = Depends(get_mail_config),
+    outbox: MailOutboxRepository | None = Depends(get_mail_outbox_repository),
 ) -> MailService:
-    return MailService(mail_config)
+    return MailService(outbox=outbox)
 
 
 async def get_authorization_service(redis: aioredis = Depends(get_redis)):
@@ -45,8 +46,9 @@ async def get_authorization_service(redis: aioredis = Depends(get_redis)):
 
 async def get_user_validators(
     user_repository: UserRepository = Depends(get_user_repository),
+    user_cache: UserCache = Depends(get_user_cache),
 ) -> UserValidationService:
-    return UserValidationService(user_repository)
+    return UserValidationService(user_repository, user_cache)
 
 
 async def get_email_verification_service(
@@ -64,6 +66,7 @@ async def get_user_service(
     email_verification_service: EmailVerificationService = Depends(get_email_verification_service),
     user_validators: UserValidationService = Depends(get_user_validators),
     authorization_service: AuthorizationService = Depends(get_authorization_service),
+    user_cache: UserCache = Depends(get_user_cache),
 ) -> UserService:
     return UserService(
         user_repository,
@@ -71,6 +74,7 @@ async def get_user_service(
         email_verification_service,
         user_validators,
         authorization_service,
+        user_cache,
     )
 
 
@@ -1,17 +1,42 @@
 import logging
+from functools import cache
 from typing import List
+from uuid import uuid4
 
 from fastapi import HTTPException, status
-from fastapi_mail import FastMail, MessageSchema, MessageType
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
 from fastapi_mail.errors import ConnectionErrors
 from pydantic import EmailStr
+from redis.exceptions import RedisError
+
+from backend.settings import MailSettings
+from backend.users.mail_outbox_repository import MailOutboxRepository
+from backend.users.schemas import OutboxMessage
 
 logger = logging.getLogger(__name__)
 
 
+@cache
+def get_mail_settings() -> MailSettings:
+    return MailSettings()
+
+
+@cache
+def get_fast_mail() -> FastMail:
+    return FastMail(config=ConnectionConfig(**get_mail_settings().model_dump()))
+
+
 class MailService:
-    def __init__(self, mail: FastMail):
-        self.mail = mail
+    def __init__(self, mail: FastMail | None = None, outbox: MailOutboxRepository | None = None):
+        self._mail = mail
+        self.outbox = outbox
+
+    @property
+    def mail(self) -> FastMail:
+        # Resolved on first send, requests which never send mail do not touch the mail configuration
+        if self._mail is None:
+            self._mail = get_fast_mail()
+        return self._mail
 
     async def build_message(
         self,
@@ -36,3 +61,24 @@ class MailService:
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Email service temporarily unavailable",
             ) from e
+
+    async def enqueue_message(self, message: MessageSchema, template: str) -> None:
+        """Message is delivered by the mail sender, it is sent directly only when the outbox is unavailable"""
+        if not self.outbox:
+            await self.send_message(message)
+            return
+
+        outbox_message = OutboxMessage(
+            message_id=uuid4(),
+            template=template,
+            recipients=message.recipients,
+            subject=message.subject,
+            body=message.body,
+            subtype=message.subtype,
+        )
+        try:
+            if not await self.outbox.enqueue(outbox_message):
+                logger.debug(f"Mail {template} was queued recently for the recipients, skipping")
+        except RedisError as e:
+            logger.error(f"Mail outbox unavailable, sending directly: {e}")
+            await self.send_message(message)
@@ -0,0 +1,143 @@
+import time
+from typing import List
+
+import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
+
+from backend.core import reliable_queue
+from backend.settings import config
+from backend.users.schemas import OutboxMessage
+
+
+class MailOutboxRepository:
+    QUEUE_KEY = "mail_outbox:queue"
+    RETRY_KEY = "mail_outbox:retry"
+    DEAD_LETTER_KEY = "mail_outbox:dead"
+    # Ids taken by a sender stay here until they are sent, retried or dead lettered, so a crash does not lose them
+    PROCESSING_KEY = "mail_outbox:processing"
+    LEASE_KEY_PREFIX = "mail_outbox:lease:"
+
+    def __init__(self, redis: aioredis.Redis):
+        self.redis = redis
+
+    @staticmethod
+    def _message_key(message_id: str) -> str:
+        return f"mail_outbox:message:{message_id}"
+
+    @staticmethod
+    def _dedup_key(dedup_key: str) -> str:
+        return f"mail_outbox:dedup:{dedup_key}"
+
+    @classmethod
+    def _lease_key(cls, message_id: str) -> str:
+        return f"{cls.LEASE_KEY_PREFIX}{message_id}"
+
+    async def enqueue(self, message: OutboxMessage) -> bool:
+        """False when the same template was already queued for the recipients within the dedup window"""
+        is_new = await self.redis.set(
+            self._dedup_key(message.dedup_key), str(message.message_id), ex=config.MAIL_DEDUP_TTL_SECONDS, nx=True
+        )
+        if not is_new:
+            return False
+
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(
+                self._message_key(str(message.message_id)),
+                message.model_dump_json(),
+                ex=config.MAIL_OUTBOX_MESSAGE_TTL_SECONDS,
+            )
+            pipe.lpush(self.QUEUE_KEY, str(message.message_id))
+            await pipe.execute()
+        return True
+
+    async def dequeue_batch(self, size: int, timeout: int) -> List[OutboxMessage]:
+        """Ids are moved to the processing list together with their leases, so they are never taken as abandoned"""
+        message_ids = await reliable_queue.claim(
+            self.redis,
+            self.QUEUE_KEY,
+            self.PROCESSING_KEY,
+            self.LEASE_KEY_PREFIX,
+            config.MAIL_OUTBOX_LEASE_SECONDS,
+            count=size,
+            timeout=timeout,
+        )
+        if not message_ids:
+            return []
+
+        raw_messages = await self.redis.mget([self._message_key(message_id) for message_id in message_ids])
+        expired_ids = [message_id for message_id, raw_message in zip(message_ids, raw_messages) if not raw_message]
+        if expired_ids:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                self._release(pipe, expired_ids)
+                await pipe.execute()
+        return [OutboxMessage.model_validate_json(raw_message) for raw_message in raw_messages if raw_message]
+
+    async def renew_leases(self, message_ids: List[str]):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for message_id in message_ids:
+                pipe.set(self._lease_key(message_id), 1, ex=config.MAIL_OUTBOX_LEASE_SECONDS)
+            await pipe.execute()
+
+    def _release(self, pipe: Pipeline, message_ids: List[str]):
+        """Adds removal of the taken ids from the processing list to the transaction"""
+        for message_id in message_ids:
+            pipe.lrem(self.PROCESSING_KEY, 1, message_id)
+        pipe.delete(*(self._lease_key(message_id) for message_id in message_ids))
+
+    async def requeue(self, messages: List[OutboxMessage]):
+        """Puts taken messages back at the head of the queue, e.g. when the sender stops in the middle of a batch"""
+        message_ids = [str(message.message_id) for message in messages]
+        await reliable_queue.requeue(
+            self.redis, self.PROCESSING_KEY, self.QUEUE_KEY, self.LEASE_KEY_PREFIX, list(reversed(message_ids))
+        )
+
+    async def requeue_abandoned(self) -> int:
+        """Queues again taken messages whose sender stopped renewing their leases"""
+        message_ids = [message_id.decode() for message_id in await self.redis.lrange(self.PROCESSING_KEY, 0, -1)]
+        requeued = await reliable_queue.requeue(
+            self.redis, self.PROCESSING_KEY, self.QUEUE_KEY, self.LEASE_KEY_PREFIX, message_ids, only_abandoned=True
+        )
+        return len(requeued)
+
+    async def schedule_retry(self, message: OutboxMessage, delay_seconds: float):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(
+                self._message_key(str(message.message_id)),
+                message.model_dump_json(),
+                ex=config.MAIL_OUTBOX_MESSAGE_TTL_SECONDS,
+            )
+            pipe.zadd(self.RETRY_KEY, {str(message.message_id): time.time() + delay_seconds})
+            self._release(pipe, [str(message.message_id)])
+            await pipe.execute()
+
+    async def requeue_due_retries(self) -> int:
+        due_ids = await self.redis.zrangebyscore(self.RETRY_KEY, 0, time.time())
+        if not due_ids:
+            return 0
+
+        # Only ids removed by this call are requeued, so concurrent senders do not send a message twice
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for message_id in due_ids:
+                pipe.zrem(self.RETRY_KEY, message_id)
+            removed = await pipe.execute()
+
+        requeued_ids = [message_id for message_id, was_removed in zip(due_ids, removed) if was_removed]
+        if requeued_ids:
+            await self.redis.lpush(self.QUEUE_KEY, *requeued_ids)
+        return len(requeued_ids)
+
+    async def mark_sent(self, messages: List[OutboxMessage]):
+        if not messages:
+            return
+        message_ids = [str(message.message_id) for message in messages]
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(*(self._message_key(message_id) for message_id in message_ids))
+            self._release(pipe, message_ids)
+            await pipe.execute()
+
+    async def dead_letter(self, message: OutboxMessage):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.set(self._message_key(str(message.message_id)), message.model_dump_json())
+            pipe.lpush(self.DEAD_LETTER_KEY, str(message.message_id))
+            self._release(pipe, [str(message.message_id)])
+            await pipe.execute()
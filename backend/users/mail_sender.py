@@ -0,0 +1,175 @@
+import asyncio
+from email.message import EmailMessage
+from email.utils import formataddr
+from pathlib import Path
+from typing import List
+
+import aiosmtplib
+from redis.exceptions import RedisError
+
+from backend.core.database import redis_queue
+from backend.core.logger import logger
+from backend.settings import MailSettings, config
+from backend.users.mail import get_mail_settings
+from backend.users.mail_outbox_repository import MailOutboxRepository
+from backend.users.schemas import OutboxMessage
+
+"""Background delivery of the mail outbox, messages are sent in batches over one kept-alive connection"""
+
+
+def to_email_message(message: OutboxMessage, sender: str) -> EmailMessage:
+    email_message = EmailMessage()
+    email_message["From"] = sender
+    email_message["To"] = ", ".join(message.recipients)
+    email_message["Subject"] = message.subject
+    email_message.set_content(message.body, subtype=message.subtype.value)
+    return email_message
+
+
+class SmtpMailTransport:
+    def __init__(self, settings: MailSettings):
+        self.settings = settings
+        self.sender = formataddr((settings.MAIL_FROM_NAME, settings.MAIL_FROM))
+        self._client: aiosmtplib.SMTP | None = None
+
+    async def _get_client(self) -> aiosmtplib.SMTP:
+        if self._client is None or not self._client.is_connected:
+            client = aiosmtplib.SMTP(
+                hostname=self.settings.MAIL_SERVER,
+                port=self.settings.MAIL_PORT,
+                use_tls=self.settings.MAIL_SSL_TLS,
+                start_tls=self.settings.MAIL_STARTTLS,
+                validate_certs=self.settings.VALIDATE_CERTS,
+            )
+            await client.connect()
+            if self.settings.USE_CREDENTIALS:
+                await client.login(self.settings.MAIL_USERNAME, self.settings.MAIL_PASSWORD)
+            self._client = client
+        return self._client
+
+    async def send(self, message: OutboxMessage):
+        client = await self._get_client()
+        try:
+            await client.send_message(to_email_message(message, self.sender))
+        except aiosmtplib.SMTPServerDisconnected:
+            self._client = None
+            raise
+
+    async def close(self):
+        if self._client is not None and self._client.is_connected:
+            await self._client.quit()
+        self._client = None
+
+
+class FileMailTransport:
+    """Writes messages as .eml files instead of sending them, for local development and tests"""
+
+    def __init__(self, directory: Path, sender: str = "FoodiniApp <noreply@localhost>"):
+        self.directory = directory
+        self.sender = sender
+
+    async def send(self, message: OutboxMessage):
+        email_message = to_email_message(message, self.sender)
+        await asyncio.to_thread(self._write, self.directory / f"{message.message_id}.eml", email_message.as_bytes())
+
+    @staticmethod
+    def _write(path: Path, content: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+
+    async def close(self):
+        pass
+
+
+MailTransport = SmtpMailTransport | FileMailTransport
+
+
+class MailSender:
+    def __init__(self, outbox: MailOutboxRepository, transport: MailTransport):
+        self.outbox = outbox
+        self.transport = transport
+
+    async def run(self):
+        try:
+            while True:
+                try:
+                    await self.outbox.requeue_abandoned()
+                    await self.outbox.requeue_due_retries()
+                    messages = await self.outbox.dequeue_batch(
+                        config.MAIL_BATCH_SIZE, config.MAIL_OUTBOX_POLL_TIMEOUT_SECONDS
+                    )
+                except RedisError as e:
+                    logger.error(f"Mail sender cannot reach the outbox: {str(e)}")
+                    await asyncio.sleep(config.MAIL_OUTBOX_POLL_TIMEOUT_SECONDS)
+                    continue
+
+                if not messages:
+                    continue
+                try:
+                    await self.send_batch(messages)
+                except RedisError as e:
+                    # Messages not acknowledged stay taken and are queued again once their leases expire
+                    logger.error(f"Mail sender cannot update the outbox after a batch: {str(e)}")
+                    await asyncio.sleep(config.MAIL_OUTBOX_POLL_TIMEOUT_SECONDS)
+        finally:
+            await self.transport.close()
+
+    async def send_batch(self, messages: List[OutboxMessage]):
+        sent_messages = []
+        handled = 0
+        heartbeat = asyncio.create_task(self._renew_leases(messages))
+        try:
+            for message in messages:
+                try:
+                    await self.transport.send(message)
+                except Exception as e:
+                    await self._handle_failure(message, e)
+                else:
+                    sent_messages.append(message)
+                handled += 1
+        except asyncio.CancelledError:
+            # Sender stopped in the middle of the batch, the rest is sent by the next one
+            await self.outbox.requeue(messages[handled:])
+            raise
+        finally:
+            heartbeat.cancel()
+            await self.outbox.mark_sent(sent_messages)
+
+    async def _renew_leases(self, messages: List[OutboxMessage]):
+        while True:
+            await asyncio.sleep(config.MAIL_OUTBOX_LEASE_SECONDS / 3)
+            try:
+                await self.outbox.renew_leases([str(message.message_id) for message in messages])
+            except RedisError as e:
+                logger.warning(f"Leases of the mail batch not renewed: {str(e)}")
+
+    async def _handle_failure(self, message: OutboxMessage, error: Exception):
+        message.attempts += 1
+        if message.attempts >= config.MAIL_MAX_ATTEMPTS:
+            logger.error(f"Mail {message.message_id} moved to dead letters after {message.attempts} attempts: {error}")
+            await self.outbox.dead_letter(message)
+            return
+
+        delay = config.MAIL_RETRY_BASE_DELAY_SECONDS * 2 ** (message.attempts - 1)
+        logger.warning(f"Mail {message.message_id} sending failed, retrying in {delay} s: {error}")
+        await self.outbox.schedule_retry(message, delay)
+
+
+def build_mail_transport() -> MailTransport:
+    if config.MAIL_TRANSPORT == "file":
+        return FileMailTransport(Path(config.MAIL_FILE_SINK_DIR))
+    return SmtpMailTransport(get_mail_settings())
+
+
+def start_mail_sender() -> asyncio.Task | None:
+    if not config.MAIL_OUTBOX_ENABLED:
+        return None
+    sender = MailSender(MailOutboxRepository(redis_queue), build_mail_transport())
+    return asyncio.create_task(sender.run(), name="mail-sender")
+
+
+async def stop_mail_sender(task: asyncio.Task | None):
+    if task is None:
+        return
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
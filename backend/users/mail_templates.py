@@ -0,0 +1,36 @@
+from functools import cache
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader
+from markupsafe import escape
+
+TEMPLATES_DIRECTORY = Path(__file__).parent / "templates"
+CONFIRMATION_TEMPLATE = "confirmation_template.html"
+# Has no characters changed by escaping, so it can be replaced after rendering
+_LINK_PLACEHOLDER = "__message_link__"
+
+
+class MailTemplateRenderer:
+    def __init__(self, environment: Environment):
+        self.environment = environment
+        self._prerendered: dict[tuple[str, str, str], str] = {}
+
+    def render_confirmation(self, header: str, message: str, message_link: str) -> str:
+        """Texts of a mail (one set per mail kind and language) are rendered once, only the link changes per call"""
+        key = (CONFIRMATION_TEMPLATE, header, message)
+        if key not in self._prerendered:
+            self._prerendered[key] = self.environment.get_template(CONFIRMATION_TEMPLATE).render(
+                header=header, message=message, message_link=_LINK_PLACEHOLDER
+            )
+        return self._prerendered[key].replace(_LINK_PLACEHOLDER, str(escape(message_link)))
+
+
+@cache
+def get_mail_template_renderer() -> MailTemplateRenderer:
+    environment = Environment(
+        loader=FileSystemLoader(TEMPLATES_DIRECTORY),
+        autoescape=True,
+        auto_reload=False,
+        bytecode_cache=FileSystemBytecodeCache(),
+    )
+    return MailTemplateRenderer(environment)
@@ -1,13 +1,22 @@
 from uuid import UUID
 
 from backend.models import User
-from backend.users.schemas import TokenPayload, UserCreate
+from backend.users.schemas import CachedUser, TokenPayload, UserCreate
 
 
 def user_create_to_entity(user_data: UserCreate, role_id: UUID) -> User:
     return User(**user_data.model_dump(), role_id=role_id)
 
 
+def user_to_cached_user(user: User) -> CachedUser:
+    return CachedUser(**user.model_dump(exclude={"password"}))
+
+
+def cached_user_to_entity(cached_user: CachedUser) -> User:
+    # Password hash is never cached, flows which need it load the user from the database
+    return User(**cached_user.model_dump(), password="")
+
+
 def decoded_token_to_payload(token_data: dict) -> TokenPayload:
     payload_dict = token_data.copy()
     payload_dict["email"] = payload_dict.pop("sub", None)
@@ -2,6 +2,7 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
+from fastapi_mail import MessageType
 from pydantic import BaseModel, EmailStr, Field
 
 from ..models.user_model import Language
@@ -77,6 +78,34 @@ class EmailSchema(BaseModel):
     addresses: List[EmailStr]
 
 
+class CachedUser(BaseModel):
+    id: UUID
+    role_id: UUID
+    name: str
+    last_name: str
+    country: str
+    email: EmailStr
+    language: Language
+    is_verified: bool
+    last_password_update: datetime
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class OutboxMessage(BaseModel):
+    message_id: UUID
+    template: str
+    recipients: List[EmailStr]
+    subject: str
+    body: str
+    subtype: MessageType = MessageType.plain
+    attempts: int = 0
+
+    @property
+    def dedup_key(self) -> str:
+        return f"{','.join(sorted(self.recipients))}:{self.template}"
+
+
 class TokenPayload(DefaultResponse):
     jti: str
     linked_jti: str
@@ -1,12 +1,12 @@
 from fastapi import HTTPException, status
 from fastapi_mail import MessageType
 from pydantic import EmailStr
-from starlette.templating import Jinja2Templates
 
 from backend.core.logger import logger
 from backend.core.user_authorisation_service import AuthorizationService
 from backend.settings import config
 from backend.users.mail import MailService
+from backend.users.mail_templates import get_mail_template_renderer
 from backend.users.service.user_validation_service import (
     UserValidationService,
 )
@@ -25,12 +25,12 @@ class EmailVerificationService:
         self.user_validators = user_validators
         self.mail_service = mail_service
         self.authorization_service = authorization_service
-        self.templates = Jinja2Templates(directory="backend/users/templates")
+        self.templates = get_mail_template_renderer()
 
     async def send_password_reset_verification(self, email: EmailStr, form_url: str, token: str):
         message_link = f"{form_url}/?token={token}"
         message_subject = "FoodiniApp new password request"
-        message_body = self.templates.get_template("confirmation_template.html").render(
+        message_body = self.templates.render_confirmation(
             header="Welcome to FoodiniApp!",
             message="To change the password please click this link:",
             message_link=message_link,
@@ -43,7 +43,7 @@ class EmailVerificationService:
             subtype=MessageType.html,
         )
 
-        await self.mail_service.send_message(message)
+        await self.mail_service.enqueue_message(message, "password_reset")
 
     async def process_new_account_verification(self, email: EmailStr, token: str):
         user = await self.user_repository.get_user_by_email(email)
@@ -75,7 +75,7 @@ class EmailVerificationService:
     async def _send_new_account_verification(self, email: EmailStr, token: str):
         message_link = f"{config.API_URL}/v1/users/confirm/new-account?url_token={token}"
         message_subject = "FoodiniApp email verification"
-        message_body = self.templates.get_template("confirmation_template.html").render(
+        message_body = self.templates.render_confirmation(
             header="Welcome to FoodiniApp!",
             message="Please click the button below to verify your email address:",
             message_link=message_link,
@@ -87,4 +87,4 @@ class EmailVerificationService:
             body=message_body,
             subtype=MessageType.html,
         )
-        await self.mail_service.send_message(message)
+        await self.mail_service.enqueue_message(message, "new_account_verification")
@@ -1,16 +1,60 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Tuple, TypeVar
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
+from backend.core.logger import logger
+from backend.core.metrics import LatencyStats
 from backend.settings import config
 
+T = TypeVar("T")
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt releases the GIL, so hashing in threads keeps the event loop free without process start-up costs
+_hashing_executor = ThreadPoolExecutor(
+    max_workers=config.PASSWORD_HASHING_WORKERS, thread_name_prefix="password-hashing"
+)
+_pending_hashes = 0
+hashing_latency = LatencyStats("password_hashing")
+
+
+async def _run_hashing(function: Callable[..., T], *args) -> T:
+    global _pending_hashes
+    if _pending_hashes >= config.PASSWORD_HASHING_MAX_PENDING:
+        hashing_latency.rejected += 1
+        logger.warning("Password hashing queue is full")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, try again later",
+            headers={"Retry-After": "1"},
+        )
+
+    _pending_hashes += 1
+    try:
+        with hashing_latency.measure():
+            return await asyncio.get_running_loop().run_in_executor(_hashing_executor, function, *args)
+    finally:
+        _pending_hashes -= 1
+
+
+def shutdown_password_hashing():
+    _hashing_executor.shutdown(wait=False, cancel_futures=True)
+
 
 class PasswordService:
     @staticmethod
     async def hash_password(password: str) -> str:
         password_with_pepper = password + config.PEPPER_KEY
-        return pwd_context.hash(password_with_pepper)
+        return await _run_hashing(pwd_context.hash, password_with_pepper)
 
     @staticmethod
     async def verify_password(plain_password: str, hashed_password: str) -> bool:
-        return pwd_context.verify(plain_password + config.PEPPER_KEY, hashed_password)
+        return await _run_hashing(pwd_context.verify, plain_password + config.PEPPER_KEY, hashed_password)
+
+    @staticmethod
+    async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, str | None]:
+        """New hash is returned when the stored one uses deprecated scheme or settings"""
+        return await _run_hashing(pwd_context.verify_and_update, plain_password + config.PEPPER_KEY, hashed_password)
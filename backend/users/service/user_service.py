@@ -1,5 +1,6 @@
 from datetime import datetime
 from typing import Type
+from uuid import UUID
 
 from fastapi import HTTPException, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
@@ -27,6 +28,7 @@ from backend.users.service.password_service import PasswordService
 from backend.users.service.user_validation_service import (
     UserValidationService,
 )
+from backend.users.user_cache import UserCache
 from backend.users.user_repository import UserRepository
 from backend.users.user_role_repository import UserRoleRepository
 
@@ -39,12 +41,14 @@ class UserService:
         email_verification_service: EmailVerificationService,
         user_validators: UserValidationService,
         authorization_service: AuthorizationService,
+        user_cache: UserCache | None = None,
     ):
         self.user_repository = user_repository
         self.user_role_repository = user_role_repository
         self.email_verification_service = email_verification_service
         self.user_validators = user_validators
         self.authorization_service = authorization_service
+        self.user_cache = user_cache
 
     async def register(self, user: UserCreate):
         existing_user = await self.user_repository.get_user_by_email(user.email)
@@ -71,7 +75,7 @@ class UserService:
         user_ = await self.user_validators.ensure_user_exists_by_email(user_login.email)
         self.user_validators.ensure_verified_user(user_)
 
-        if not await PasswordService.verify_password(user_login.password, user_.password):
+        if not await self._verify_login_password(user_, user_login.password):
             logger.debug("Incorrect password provided for user login")
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -91,6 +95,16 @@ class UserService:
             refresh_token=refresh_token,
         )
 
+    async def _verify_login_password(self, user: User, password: str) -> bool:
+        if not config.PASSWORD_REHASH_ON_LOGIN:
+            return await PasswordService.verify_password(password, user.password)
+
+        is_valid, new_hash = await PasswordService.verify_and_update_password(password, user.password)
+        if is_valid and new_hash:
+            logger.debug("Password hash uses outdated settings, rehashing")
+            await self.user_repository.update_password_hash(user.id, new_hash)
+        return is_valid
+
     async def logout(self, token: TokenPayload):
         await self.authorization_service.revoke_tokens(token.jti, token.linked_jti)
         return Response(status_code=204)
@@ -109,18 +123,24 @@ class UserService:
         )
 
     async def update(self, user: Type[User], new_user_data: UserUpdate):
-        return await self.user_repository.update_user(user.id, new_user_data)
+        updated_user = await self.user_repository.update_user(user.id, new_user_data)
+        await self._invalidate_cached_user(user.id)
+        return updated_user
 
     async def change_language(
         self,
         user: Type[User],
         change_language_request: ChangeLanguageRequest,
     ):
-        return await self.user_repository.change_language(user.id, change_language_request.language)
+        updated_user = await self.user_repository.change_language(user.id, change_language_request.language)
+        await self._invalidate_cached_user(user.id)
+        return updated_user
 
     async def delete(self, user: Type[User], token: TokenPayload):
         await self.authorization_service.revoke_tokens(token.jti, token.linked_jti)
-        return await self.user_repository.delete_user(user.id)
+        deleted_user = await self.user_repository.delete_user(user.id)
+        await self._invalidate_cached_user(user.id)
+        return deleted_user
 
     async def decode_url_token(self, token: str, salt: str = config.NEW_ACCOUNT_SALT):
         token_data = await self.authorization_service.decode_url_safe_token(token, salt)
@@ -139,14 +159,20 @@ class UserService:
 
         hashed_password = await PasswordService.hash_password(new_password_confirm.password)
 
-        return await self.user_repository.update_password(user_.id, hashed_password, datetime.now(config.TIMEZONE))
+        updated_user = await self.user_repository.update_password(
+            user_.id, hashed_password, datetime.now(config.TIMEZONE)
+        )
+        await self._invalidate_cached_user(user_.id)
+        return updated_user
 
     async def confirm_new_account(self, token: str):
         email = await self.authorization_service.extract_email_from_base64(token)
         language = await self.authorization_service.extract_language_from_base64(token)
         try:
             user_email = await self.decode_url_token(token)
-            await self.user_repository.verify_user(user_email)
+            verified_user = await self.user_repository.verify_user(user_email)
+            if verified_user:
+                await self._invalidate_cached_user(verified_user.id)
             redirect_url = f"{config.FRONTEND_URL}/#/login?status=success"
         except (HTTPException, TypeError):
             logger.debug("User verification failed. Redirecting to error page.")
@@ -158,3 +184,7 @@ class UserService:
             redirect_url += f"&language={language}"
 
         return RedirectResponse(url=redirect_url, status_code=status.HTTP_302_FOUND)
+
+    async def _invalidate_cached_user(self, user_id: UUID):
+        if self.user_cache:
+            await self.user_cache.invalidate_user(user_id)
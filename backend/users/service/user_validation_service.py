@@ -8,12 +8,14 @@ from backend.core.logger import logger
 from backend.core.not_found_in_database_exception import NotFoundInDatabaseException
 from backend.models import User
 from backend.settings import config
+from backend.users.user_cache import UserCache
 from backend.users.user_repository import UserRepository
 
 
 class UserValidationService:
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepository, user_cache: UserCache | None = None):
         self.user_repository = user_repository
+        self.user_cache = user_cache
 
     def ensure_verified_user(self, user) -> User:
         if not user.is_verified:
@@ -52,7 +54,10 @@ class UserValidationService:
         return user
 
     async def ensure_user_exists_by_id(self, user_id: UUID) -> User:
-        user = await self.user_repository.get_user_by_id(user_id)
+        if self.user_cache:
+            user = await self.user_cache.get_user(user_id, lambda: self.user_repository.get_user_by_id(user_id))
+        else:
+            user = await self.user_repository.get_user_by_id(user_id)
         if not user:
             logger.debug("User not found by id")
             raise NotFoundInDatabaseException("User not found")
@@ -97,3 +97,17 @@ async def test_get_refreshed_tokens(auth_dependency, mock_authorization_service)
     assert tokens.access_token == "new_access"
     assert tokens.refresh_token == "new_refresh"
     mock_authorization_service.refresh_tokens.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_token_and_user_are_resolved_once_per_request(
+    auth_dependency, mock_user_validators, mock_authorization_service
+):
+    # When
+    await auth_dependency.require_roles([Role.USER])
+    await auth_dependency.get_current_user()
+    await auth_dependency.get_current_user()
+
+    # Then
+    mock_authorization_service.verify_access_token.assert_awaited_once_with("mock-token")
+    mock_user_validators.ensure_user_exists_by_id.assert_awaited_once()
@@ -42,7 +42,7 @@ def mock_user_validators():
 def mock_mail_service():
     mail_service = MagicMock()
     mail_service.build_message = AsyncMock()
-    mail_service.send_message = AsyncMock()
+    mail_service.enqueue_message = AsyncMock()
     return mail_service
 
 
@@ -67,7 +67,7 @@ test_token = "test_token"
 @pytest.mark.asyncio
 async def test_send_new_account_verification(email_verification_service, mock_mail_service):
     email_verification_service.templates = MagicMock()
-    email_verification_service.templates.get_template.return_value.render.return_value = (
+    email_verification_service.templates.render_confirmation.return_value = (
         "Please click this link: http://localhost:8000/v1/users/confirm/new-account?url_token=test_token"
         " to verify your email."
     )
@@ -81,7 +81,7 @@ async def test_send_new_account_verification(email_verification_service, mock_ma
         f"to verify your email.",
         subtype=MessageType.html,
     )
-    mock_mail_service.send_message.assert_called_once()
+    mock_mail_service.enqueue_message.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -90,7 +90,7 @@ async def test_send_password_reset_verification(email_verification_service, mock
     expected_link = f"{test_form_url}/?token={test_token}"
     expected_body = f"To change the password please click this link: {expected_link}."
     email_verification_service.templates = MagicMock()
-    email_verification_service.templates.get_template.return_value.render.return_value = expected_body
+    email_verification_service.templates.render_confirmation.return_value = expected_body
 
     await email_verification_service.send_password_reset_verification(test_email, test_form_url, test_token)
 
@@ -100,7 +100,7 @@ async def test_send_password_reset_verification(email_verification_service, mock
         body=expected_body,
         subtype=MessageType.html,
     )
-    mock_mail_service.send_message.assert_called_once()
+    mock_mail_service.enqueue_message.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -119,12 +119,12 @@ async def test_process_new_account_verification_new_user(
     )
     mock_user_repository.get_user_by_email = AsyncMock(return_value=None)
     email_verification_service.templates = MagicMock()
-    email_verification_service.templates.get_template.return_value.render.return_value = expected_body
+    email_verification_service.templates.render_confirmation.return_value = expected_body
     mock_mail_service.build_message.return_value = message_to_send
 
     await email_verification_service.process_new_account_verification(test_email, test_token)
 
-    mock_mail_service.send_message.assert_called_once_with(message_to_send)
+    mock_mail_service.enqueue_message.assert_called_once_with(message_to_send, "new_account_verification")
 
 
 @pytest.mark.asyncio
@@ -152,13 +152,13 @@ async def test_process_password_reset_verification(email_verification_service, m
         subtype=MessageType.html,
     )
     email_verification_service.templates = MagicMock()
-    email_verification_service.templates.get_template.return_value.render.return_value = expected_body
+    email_verification_service.templates.render_confirmation.return_value = expected_body
     mock_mail_service.build_message.return_value = message_to_send
 
     await email_verification_service.process_password_reset_verification(test_email, test_form_url, test_token)
 
     mock_user_validators.ensure_user_exists_by_email.assert_called_once_with(test_email)
-    mock_mail_service.send_message.assert_called_once_with(message_to_send)
+    mock_mail_service.enqueue_message.assert_called_once_with(message_to_send, "password_reset")
 
 
 @pytest.mark.asyncio
@@ -174,10 +174,10 @@ async def test_resend_verification(email_verification_service, mock_user_validat
         subtype=MessageType.html,
     )
     email_verification_service.templates = MagicMock()
-    email_verification_service.templates.get_template.return_value.render.return_value = expected_body
+    email_verification_service.templates.render_confirmation.return_value = expected_body
     mock_mail_service.build_message.return_value = message_to_send
 
     await email_verification_service.process_password_reset_verification(test_email, form_url, test_token)
 
     mock_user_validators.ensure_user_exists_by_email.assert_called_once_with(test_email)
-    mock_mail_service.send_message.assert_called_once_with(message_to_send)
+    mock_mail_service.enqueue_message.assert_called_once_with(message_to_send, "password_reset")
@@ -0,0 +1,206 @@
+import asyncio
+import uuid
+from email import message_from_bytes
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi_mail import MessageSchema, MessageType
+from redis.exceptions import RedisError
+
+from backend.settings import config
+from backend.users.mail import MailService
+from backend.users.mail_outbox_repository import MailOutboxRepository
+from backend.users.mail_sender import FileMailTransport, MailSender
+from backend.users.schemas import OutboxMessage
+
+
+def make_outbox_message(**kwargs) -> OutboxMessage:
+    return OutboxMessage(
+        message_id=uuid.uuid4(),
+        template="new_account_verification",
+        recipients=["test@example.com"],
+        subject="FoodiniApp email verification",
+        body="<a href='link'>Verify</a>",
+        subtype=MessageType.html,
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def outbox():
+    return AsyncMock()
+
+
+@pytest.mark.asyncio
+async def test_send_batch_writes_messages_to_file_sink(outbox, tmp_path):
+    # Given
+    messages = [make_outbox_message(), make_outbox_message()]
+    sender = MailSender(outbox, FileMailTransport(tmp_path))
+
+    # When
+    await sender.send_batch(messages)
+
+    # Then
+    written = message_from_bytes((tmp_path / f"{messages[0].message_id}.eml").read_bytes())
+    assert written["To"] == "test@example.com"
+    assert written["Subject"] == "FoodiniApp email verification"
+    assert written.get_content_type() == "text/html"
+    outbox.mark_sent.assert_awaited_once_with(messages)
+
+
+@pytest.mark.asyncio
+async def test_failed_message_is_retried_with_backoff_and_others_are_sent(outbox):
+    # Given
+    failing, working = make_outbox_message(attempts=1), make_outbox_message()
+    transport = MagicMock()
+    transport.send = AsyncMock(side_effect=[ConnectionError("SMTP down"), None])
+    sender = MailSender(outbox, transport)
+
+    # When
+    await sender.send_batch([failing, working])
+
+    # Then
+    outbox.schedule_retry.assert_awaited_once_with(failing, config.MAIL_RETRY_BASE_DELAY_SECONDS * 2)
+    assert failing.attempts == 2
+    outbox.mark_sent.assert_awaited_once_with([working])
+
+
+@pytest.mark.asyncio
+async def test_message_is_dead_lettered_after_last_attempt(outbox):
+    # Given
+    message = make_outbox_message(attempts=config.MAIL_MAX_ATTEMPTS - 1)
+    transport = MagicMock()
+    transport.send = AsyncMock(side_effect=ConnectionError("SMTP down"))
+
+    # When
+    await MailSender(outbox, transport).send_batch([message])
+
+    # Then
+    outbox.dead_letter.assert_awaited_once_with(message)
+    outbox.schedule_retry.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_sender_keeps_running_when_outbox_fails_after_a_batch(outbox):
+    # Given
+    first, second = make_outbox_message(), make_outbox_message()
+    outbox.dequeue_batch.side_effect = [[first], [second], asyncio.CancelledError]
+    outbox.mark_sent.side_effect = [RedisError("connection reset"), None]
+    transport = AsyncMock()
+
+    # When
+    with (
+        patch("backend.users.mail_sender.config.MAIL_OUTBOX_POLL_TIMEOUT_SECONDS", 0),
+        pytest.raises(asyncio.CancelledError),
+    ):
+        await MailSender(outbox, transport).run()
+
+    # Then
+    assert [call.args[0] for call in transport.send.await_args_list] == [first, second]
+    outbox.mark_sent.assert_awaited_with([second])
+    transport.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stopped_sender_puts_rest_of_batch_back_to_queue(outbox):
+    # Given
+    messages = [make_outbox_message() for _ in range(3)]
+    transport = MagicMock()
+    transport.send = AsyncMock(side_effect=[None, asyncio.CancelledError])
+
+    # When
+    with pytest.raises(asyncio.CancelledError):
+        await MailSender(outbox, transport).send_batch(messages)
+
+    # Then
+    outbox.requeue.assert_awaited_once_with(messages[1:])
+    outbox.mark_sent.assert_awaited_once_with(messages[:1])
+
+
+@pytest.mark.asyncio
+async def test_batch_is_moved_to_processing_list_together_with_leases():
+    # Given
+    messages = [make_outbox_message() for _ in range(2)]
+    message_ids = [str(message.message_id) for message in messages]
+    claim_script = AsyncMock(return_value=[message_id.encode() for message_id in message_ids])
+    redis = MagicMock()
+    redis.blmove = AsyncMock(return_value=message_ids[0].encode())
+    redis.register_script.return_value = claim_script
+    redis.mget = AsyncMock(return_value=[message.model_dump_json().encode() for message in messages])
+    outbox = MailOutboxRepository(redis)
+
+    # When
+    dequeued = await outbox.dequeue_batch(size=20, timeout=5)
+
+    # Then
+    assert dequeued == messages
+    redis.blmove.assert_awaited_once_with(outbox.QUEUE_KEY, outbox.QUEUE_KEY, 5, "RIGHT", "RIGHT")
+    claim_script.assert_awaited_once_with(
+        keys=[outbox.QUEUE_KEY, outbox.PROCESSING_KEY],
+        args=[outbox.LEASE_KEY_PREFIX, config.MAIL_OUTBOX_LEASE_SECONDS, 20],
+    )
+    redis.pipeline.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_only_messages_without_lease_are_queued_again_by_one_script():
+    # Given
+    leased_id, abandoned_id = str(uuid.uuid4()), str(uuid.uuid4())
+    requeue_script = AsyncMock(return_value=[abandoned_id.encode()])
+    redis = MagicMock()
+    redis.lrange = AsyncMock(return_value=[leased_id.encode(), abandoned_id.encode()])
+    redis.register_script.return_value = requeue_script
+
+    # When
+    requeued = await MailOutboxRepository(redis).requeue_abandoned()
+
+    # Then
+    assert requeued == 1
+    requeue_script.assert_awaited_once_with(
+        keys=[MailOutboxRepository.PROCESSING_KEY, MailOutboxRepository.QUEUE_KEY],
+        args=[MailOutboxRepository.LEASE_KEY_PREFIX, 1, leased_id, abandoned_id],
+    )
+
+
+@pytest.mark.asyncio
+async def test_mail_service_enqueues_message_instead_of_sending(outbox):
+    # Given
+    mail = MagicMock()
+    mail.send_message = AsyncMock()
+    message = MessageSchema(recipients=["test@example.com"], subject="Subject", body="Body", subtype=MessageType.plain)
+
+    # When
+    await MailService(mail, outbox).enqueue_message(message, "password_reset")
+
+    # Then
+    queued = outbox.enqueue.await_args.args[0]
+    assert queued.template == "password_reset"
+    assert queued.dedup_key == "test@example.com:password_reset"
+    mail.send_message.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_mail_service_sends_directly_when_outbox_is_unavailable(outbox):
+    # Given
+    mail = MagicMock()
+    mail.send_message = AsyncMock()
+    outbox.enqueue.side_effect = RedisError("connection refused")
+    message = MessageSchema(recipients=["test@example.com"], subject="Subject", body="Body", subtype=MessageType.plain)
+
+    # When
+    with patch("backend.users.mail.logger"):
+        await MailService(mail, outbox).enqueue_message(message, "password_reset")
+
+    # Then
+    mail.send_message.assert_awaited_once_with(message)
+
+
+def test_mail_configuration_is_resolved_once_and_only_when_sending():
+    # Given
+    with patch("backend.users.mail.get_fast_mail") as get_fast_mail:
+        mail_service = MailService(outbox=None)
+
+        # Then
+        get_fast_mail.assert_not_called()
+        assert mail_service.mail is mail_service.mail
+        get_fast_mail.assert_called_once()
@@ -0,0 +1,22 @@
+from backend.users.mail_templates import CONFIRMATION_TEMPLATE, get_mail_template_renderer
+
+
+def test_prerendered_confirmation_matches_full_render():
+    # Given
+    renderer = get_mail_template_renderer()
+    link = "https://foodini.com.pl/reset/?token=a<b>&language=PL"
+
+    # When
+    rendered = renderer.render_confirmation("Header", "Message", link)
+
+    # Then
+    expected = renderer.environment.get_template(CONFIRMATION_TEMPLATE).render(
+        header="Header", message="Message", message_link=link
+    )
+    assert rendered == expected
+    assert "token=a&lt;b&gt;&amp;language=PL" in rendered
+
+
+def test_template_environment_is_shared():
+    # Then
+    assert get_mail_template_renderer() is get_mail_template_renderer()
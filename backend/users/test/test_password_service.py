@@ -1,5 +1,13 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
 import pytest
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
 
+from backend.settings import config
+from backend.users.service import password_service
 from backend.users.service.password_service import PasswordService
 
 
@@ -82,3 +90,63 @@ async def test_hash_password_long_password():
 
     # Then
     assert await PasswordService.verify_password(password, hashed)
+
+
+@pytest.mark.asyncio
+async def test_hashing_runs_outside_of_event_loop_thread():
+    # Given
+    threads = []
+
+    def hash_password(password):
+        threads.append(threading.current_thread())
+        return password
+
+    # When
+    with patch.object(password_service.pwd_context, "hash", hash_password):
+        await PasswordService.hash_password("password")
+
+    # Then
+    assert threads[0] is not threading.current_thread()
+    assert password_service.hashing_latency.count > 0
+
+
+@pytest.mark.asyncio
+async def test_hashing_is_rejected_when_too_many_hashes_are_pending():
+    # Given
+    release = threading.Event()
+
+    def slow_hash(password):
+        release.wait(timeout=5)
+        return password
+
+    with (
+        patch.object(config, "PASSWORD_HASHING_MAX_PENDING", 1),
+        patch.object(password_service.pwd_context, "hash", slow_hash),
+    ):
+        pending = asyncio.create_task(PasswordService.hash_password("first"))
+        await asyncio.sleep(0.01)
+
+        # When
+        with pytest.raises(HTTPException) as exc:
+            await PasswordService.hash_password("second")
+        release.set()
+        await pending
+
+    # Then
+    assert exc.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+@pytest.mark.asyncio
+async def test_verify_and_update_returns_new_hash_for_outdated_rounds():
+    # Given
+    outdated_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("password" + config.PEPPER_KEY)
+
+    # When
+    with patch.object(
+        password_service, "pwd_context", CryptContext(schemes=["bcrypt"], bcrypt__min_rounds=5, deprecated="auto")
+    ):
+        is_valid, new_hash = await PasswordService.verify_and_update_password("password", outdated_hash)
+
+    # Then
+    assert is_valid
+    assert new_hash is not None and new_hash != outdated_hash
@@ -27,6 +27,7 @@ def mock_redis():
 
     pipe_mock = AsyncMock()
     pipe_mock.setex = AsyncMock()
+    pipe_mock.get = Mock()
     pipe_mock.exists = Mock()
     pipe_mock.execute = AsyncMock()
 
@@ -118,15 +119,40 @@ async def test_verify_token_success(authorization_service, mock_redis, credentia
             return_value=valid_payload,
         ),
     ):
-        mock_redis.get.side_effect = [b"token_data", None]
-        mock_redis.pipeline.return_value.exists.return_value = False
-        mock_redis.pipeline.return_value.execute.return_value = [0, 0]
+        pipe = mock_redis.pipeline.return_value.__aenter__.return_value
+        pipe.execute.return_value = [b"token_data", 0, 0]
 
         # when
         result = await authorization_service.verify_access_token(credentials)
 
         # then
         assert result == valid_payload
+        pipe.get.assert_called_once_with("linked_token_id")
+        pipe.exists.assert_any_call("blacklist:token_id")
+        pipe.exists.assert_any_call("blacklist:linked_token_id")
+        pipe.execute.assert_awaited_once()
+        mock_redis.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_verify_token_rejects_locally_known_revoked_token(
+    authorization_service, mock_redis, credentials, valid_payload
+):
+    # given
+    revoked_payload = valid_payload.model_copy(update={"jti": "locally_revoked_id"})
+    pipe = mock_redis.pipeline.return_value.__aenter__.return_value
+    pipe.execute.return_value = [b"token_data", 1, 0]
+
+    with patch.object(AuthorizationService, "get_payload_from_token", return_value=revoked_payload):
+        # when
+        with pytest.raises(HTTPException) as first:
+            await authorization_service.verify_access_token(credentials)
+        with pytest.raises(HTTPException) as second:
+            await authorization_service.verify_access_token(credentials)
+
+    # then
+    assert first.value.detail == second.value.detail == "Revoked token"
+    pipe.execute.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -160,7 +186,7 @@ async def test_refresh_token_success(authorization_service, mock_redis, credenti
         patch("jwt.decode", return_value=payload_dict) as mock_decode,
         patch("jwt.encode", side_effect=[b"new_access", b"new_refresh"]) as mock_encode,
     ):
-        mock_redis.get.return_value = b"valid_token"
+        mock_redis.pipeline.return_value.__aenter__.return_value.execute.return_value = [b"valid_token", 0, 0]
 
         # when
         result = await authorization_service.refresh_tokens(credentials)
@@ -0,0 +1,77 @@
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from backend.core.cache import TwoTierCache
+from backend.meals.test.test_meal_cache import FakeRedis
+from backend.models import User
+from backend.users.schemas import CachedUser, UserUpdate
+from backend.users.service.user_service import UserService
+from backend.users.service.user_validation_service import UserValidationService
+from backend.users.user_cache import UserCache
+
+
+def make_user_cache(redis) -> UserCache:
+    return UserCache(
+        TwoTierCache[CachedUser](
+            namespace="users_test",
+            redis=redis,
+            serialize=lambda user: user.model_dump_json(),
+            deserialize=CachedUser.model_validate_json,
+            local_max_size=4,
+            local_ttl_seconds=60,
+            redis_ttl_seconds=60,
+        )
+    )
+
+
+def make_user() -> User:
+    return User(
+        id=uuid.uuid4(),
+        role_id=uuid.uuid4(),
+        name="John",
+        last_name="Doe",
+        country="Poland",
+        email="john@example.com",
+        is_verified=True,
+        password="hashed-password",
+    )
+
+
+@pytest.mark.asyncio
+async def test_user_is_loaded_once_and_password_is_not_cached():
+    # Given
+    redis = FakeRedis()
+    user = make_user()
+    user_repository = MagicMock()
+    user_repository.get_user_by_id = AsyncMock(return_value=user)
+    validators = UserValidationService(user_repository, make_user_cache(redis))
+
+    # When
+    first = await validators.ensure_user_exists_by_id(user.id)
+    second = await validators.ensure_user_exists_by_id(user.id)
+
+    # Then
+    user_repository.get_user_by_id.assert_awaited_once_with(user.id)
+    assert first.id == second.id == user.id
+    assert second.email == user.email
+    assert first.password == second.password == ""
+    assert b"hashed-password" not in redis.store[f"cache:users_test:{user.id}"]
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates_cached_user():
+    # Given
+    user = make_user()
+    user_cache = make_user_cache(FakeRedis())
+    await user_cache.get_user(user.id, AsyncMock(return_value=user))
+    user_repository = MagicMock()
+    user_repository.update_user = AsyncMock(return_value=user)
+    service = UserService(user_repository, MagicMock(), MagicMock(), MagicMock(), MagicMock(), user_cache)
+
+    # When
+    await service.update(user, UserUpdate(name="Jack"))
+
+    # Then
+    assert await user_cache.users.get(str(user.id)) is None
@@ -518,3 +518,27 @@ async def test_confirm_new_password_missing_token(user_service, mock_user_valida
     # Then
     assert exc_info.value.status_code == status.HTTP_400_BAD_REQUEST
     assert exc_info.value.detail == "Token verification failed"
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_outdated_password_when_enabled(
+    mock_authorization_service, mock_user_validators, mock_user_repository, user_service
+):
+    # Given
+    mock_user = User(
+        id=uuid.UUID("6ea7ae4d-fc73-4db0-987d-84e8e2bc2a6a"), email="test@example.com", password="old_hash"
+    )
+    mock_user_validators.ensure_user_exists_by_email.return_value = mock_user
+    mock_user_repository.update_password_hash = AsyncMock()
+    mock_authorization_service.create_tokens.return_value = (b"access_token", b"refresh_token")
+    form = OAuth2PasswordRequestForm(username="test@example.com", password="Password123")
+
+    # When
+    with (
+        patch.object(config, "PASSWORD_REHASH_ON_LOGIN", True),
+        patch.object(PasswordService, "verify_and_update_password", AsyncMock(return_value=(True, "new_hash"))),
+    ):
+        await user_service.login(form)
+
+    # Then
+    mock_user_repository.update_password_hash.assert_awaited_once_with(mock_user.id, "new_hash")
@@ -0,0 +1,42 @@
+from typing import Awaitable, Callable, Optional
+from uuid import UUID
+
+from backend.core.cache import TwoTierCache
+from backend.core.database import redis_cache
+from backend.models import User
+from backend.settings import config
+from backend.users.mappers import cached_user_to_entity, user_to_cached_user
+from backend.users.schemas import CachedUser
+
+
+class UserCache:
+    def __init__(self, users: TwoTierCache[CachedUser]):
+        self.users = users
+
+    async def get_user(self, user_id: UUID, loader: Callable[[], Awaitable[Optional[User]]]) -> Optional[User]:
+        async def load_user() -> Optional[CachedUser]:
+            user = await loader()
+            return user_to_cached_user(user) if user else None
+
+        cached_user = await self.users.get_or_load(str(user_id), load_user)
+        return cached_user_to_entity(cached_user) if cached_user else None
+
+    async def invalidate_user(self, user_id: UUID):
+        await self.users.invalidate(str(user_id))
+
+
+user_cache = UserCache(
+    users=TwoTierCache[CachedUser](
+        namespace="users",
+        redis=redis_cache,
+        serialize=lambda user: user.model_dump_json(),
+        deserialize=CachedUser.model_validate_json,
+        local_max_size=config.USER_CACHE_LOCAL_MAX_SIZE,
+        local_ttl_seconds=config.USER_CACHE_LOCAL_TTL_SECONDS,
+        redis_ttl_seconds=config.USER_CACHE_REDIS_TTL_SECONDS,
+    )
+)
+
+
+def get_user_cache() -> UserCache:
+    return user_cache
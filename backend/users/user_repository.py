@@ -59,6 +59,15 @@ class UserRepository:
             return user
         return None
 
+    async def update_password_hash(self, user_id: UUID, new_password: str) -> User | None:
+        """Same password stored with a new hash, so the last password change date is kept"""
+        user = await self.get_user_by_id(user_id)
+        if user:
+            user.password = new_password
+            await self.db.commit()
+            return user
+        return None
+
     async def delete_user(self, user_id: UUID) -> User | None:
         user = await self.get_user_by_id(user_id)
         if user: